@@ -1,16 +1,36 @@
 """Dependency injection for API routes."""
 
+import hashlib
 import logging
+import time
+from dataclasses import dataclass
+from typing import Optional
+
 import jwt
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Response, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from config import settings
 from services.ai_service import AIService, get_ai_service
+from utils.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 security = HTTPBearer()
 
+# Verified JWT payloads keyed by a digest of the token, so repeat requests
+# with the same access token skip signature verification and claim parsing.
+# Entries are also dropped as soon as the token's own exp has passed.
+_verified_token_cache = TTLCache(ttl=settings.JWT_CACHE_TTL_SECONDS, maxsize=8192)
+
+
+@dataclass(frozen=True, slots=True)
+class User:
+    """Authenticated user taken from the Supabase JWT."""
+
+    user_id: str
+    email: Optional[str] = None
+    aud: Optional[str] = None
+
 
 def verify_supabase_token(
     credentials: HTTPAuthorizationCredentials = Depends(security),
@@ -18,6 +38,10 @@ def verify_supabase_token(
     """
     Verify Supabase JWT access token and return decoded payload.
     
+    Payloads are cached per token for up to JWT_CACHE_TTL_SECONDS (never past
+    the token's exp), so only the first request with a token pays for the
+    signature check.
+    
     Args:
         credentials: HTTP Bearer token from Authorization header.
         
@@ -35,8 +59,12 @@ def verify_supabase_token(
         )
     
     token = credentials.credentials
-    logger.info(f"Attempting to verify JWT token (first 20 chars): {token[:20]}...")
-    logger.info(f"JWT secret length: {len(settings.SUPABASE_JWT_SECRET)} characters")
+    cache_key = hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+    cached = _verified_token_cache.get(cache_key)
+    if cached is not None:
+        if cached.get("exp", 0) > time.time():
+            return cached
+        _verified_token_cache.invalidate(cache_key)
     
     try:
         # Verify and decode the JWT token
@@ -47,28 +75,30 @@ def verify_supabase_token(
             algorithms=["HS256"],
             options={"verify_signature": True, "verify_exp": True, "verify_aud": False},
         )
-        logger.info(f"JWT verified successfully. User ID: {payload.get('sub')}")
+        logger.debug("JWT verified successfully. User ID: %s", payload.get("sub"))
+        if "exp" in payload:
+            _verified_token_cache.set(cache_key, payload)
         return payload
     except jwt.ExpiredSignatureError as e:
-        logger.warning(f"Token has expired: {e}")
+        logger.warning("Token has expired: %s", e)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token has expired.",
         )
     except jwt.InvalidSignatureError as e:
-        logger.error(f"Invalid token signature (secret mismatch?): {e}")
+        logger.error("Invalid token signature (secret mismatch?): %s", e)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token signature.",
         )
     except jwt.InvalidTokenError as e:
-        logger.error(f"Invalid token format: {e}")
+        logger.error("Invalid token format: %s", e)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"Invalid token: {str(e)}",
         )
     except Exception as e:
-        logger.error(f"Unexpected error during JWT verification: {type(e).__name__}: {e}")
+        logger.error("Unexpected error during JWT verification: %s: %s", type(e).__name__, e)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"Token verification failed: {str(e)}",
@@ -77,7 +107,7 @@ def verify_supabase_token(
 
 def get_current_user(
     token_payload: dict = Depends(verify_supabase_token),
-) -> dict:
+) -> User:
     """
     Get current authenticated user from verified token.
     
@@ -85,7 +115,7 @@ def get_current_user(
         token_payload: Decoded JWT payload from verify_supabase_token.
         
     Returns:
-        User information dictionary with required user_id.
+        User with the required user_id.
         
     Raises:
         HTTPException: If user_id is missing from token (401 Unauthorized).
@@ -94,20 +124,58 @@ def get_current_user(
     
     # Validate that user_id is present and not empty
     if not user_id or not isinstance(user_id, str) or not user_id.strip():
-        logger.error(f"user_id is required but missing or invalid in token. Token payload keys: {list(token_payload.keys())}")
+        logger.error("user_id is required but missing or invalid in token. Token payload keys: %s", list(token_payload.keys()))
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="認証トークンにユーザーIDが含まれていません。再度ログインしてください。",
         )
     
-    return {
-        "user_id": user_id.strip(),
-        "email": token_payload.get("email"),
-        "aud": token_payload.get("aud"),
-    }
+    return User(
+        user_id=user_id.strip(),
+        email=token_payload.get("email"),
+        aud=token_payload.get("aud"),
+    )
+
+
+async def get_current_user_id(
+    current_user: User = Depends(get_current_user),
+) -> str:
+    """
+    Get just the authenticated user's ID, for handlers that need nothing else.
+    
+    Declared async so FastAPI resolves it on the event loop instead of
+    dispatching another threadpool call for a field access.
+    """
+    return current_user.user_id
+
+
+def set_cache_headers(response: Response) -> None:
+    """
+    Let the browser reuse a GET response for HTTP_CACHE_MAX_AGE_SECONDS.
+
+    The response is per user, so it is marked private (no shared caches) and
+    varies on the Authorization header. Once it is stale the browser
+    revalidates with If-None-Match and gets a bodiless 304 if nothing changed.
+    """
+    max_age = settings.HTTP_CACHE_MAX_AGE_SECONDS
+    response.headers["Cache-Control"] = f"private, max-age={max_age}" if max_age > 0 else "private, no-cache"
+    response.headers["Vary"] = "Authorization"
+
+
+def set_revalidate_headers(response: Response) -> None:
+    """
+    Make the browser revalidate a GET response on every use.
+
+    For data that changes behind the user's back (records saved after
+    generation finishes), where serving a stale copy for max-age is not OK.
+    The revalidation is a conditional request answered with a bodiless 304
+    when the ETag still matches.
+    """
+    response.headers["Cache-Control"] = "private, no-cache"
+    response.headers["Vary"] = "Authorization"
 
 
-def get_ai_service_dependency() -> AIService:
-    """Dependency to get AI service instance."""
+async def get_ai_service_dependency() -> AIService:
+    """Dependency to get AI service instance, resolved on the event loop."""
     return get_ai_service()
 
@@ -0,0 +1,71 @@
+"""Decorator translating service exceptions into HTTP errors per endpoint."""
+
+import functools
+import inspect
+import logging
+from typing import Any, Callable, Mapping, Optional, TypeVar
+
+from fastapi import HTTPException
+
+logger = logging.getLogger(__name__)
+
+# Exception class -> (status code, detail). A detail of None uses str(exc).
+ErrorMapping = Mapping[type[Exception], tuple[int, Optional[str]]]
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def _to_http_exception(fn: Callable[..., Any], mapping: ErrorMapping, exc: Exception) -> HTTPException:
+    """Build the HTTPException for the most specific class of exc in mapping."""
+    status_code, detail = next(mapping[cls] for cls in type(exc).__mro__ if cls in mapping)
+    if status_code >= 500:
+        logger.error("%s failed: %s", fn.__qualname__, exc)
+    else:
+        logger.warning("%s failed: %s", fn.__qualname__, exc)
+    return HTTPException(status_code=status_code, detail=str(exc) if detail is None else detail)
+
+
+def translate_errors(mapping: ErrorMapping) -> Callable[[F], F]:
+    """
+    Turn exceptions raised by an endpoint into HTTPExceptions.
+
+    The most specific class in ``mapping`` wins, so ``{NotFoundError: (404, ...),
+    Exception: (500, ...)}`` maps a missing row to 404 and anything else to 500.
+    HTTPExceptions raised by the endpoint itself pass through unchanged. Works
+    for both ``def`` and ``async def`` endpoints and keeps their signature, so
+    FastAPI still sees the original parameters.
+
+    Args:
+        mapping: Exception class -> (status code, detail); a detail of None
+            sends the exception message.
+
+    Returns:
+        Decorator to apply below the router decorator.
+    """
+    handled = tuple(mapping)
+
+    def decorator(fn: F) -> F:
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                try:
+                    return await fn(*args, **kwargs)
+                except HTTPException:
+                    raise
+                except handled as exc:
+                    raise _to_http_exception(fn, mapping, exc) from exc
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            try:
+                return fn(*args, **kwargs)
+            except HTTPException:
+                raise
+            except handled as exc:
+                raise _to_http_exception(fn, mapping, exc) from exc
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
@@ -0,0 +1,64 @@
+"""ETag helpers for conditional GET requests."""
+
+import hashlib
+from typing import Any, Iterable, Mapping, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+
+def compute_etag(*parts: Any) -> str:
+    """
+    Build a weak ETag from row version markers (ids, updated_at values).
+
+    Args:
+        parts: Values that change whenever the payload changes.
+
+    Returns:
+        Weak ETag string like W/"3f2a...".
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\x1f")
+    return f'W/"{digest.hexdigest()}"'
+
+
+def row_etag(row: Mapping[str, Any], nested: Iterable[Mapping[str, Any]] = ()) -> str:
+    """Build an ETag for a row (and optional child rows) from id/updated_at."""
+    parts = [row.get("id"), row.get("updated_at") or row.get("created_at")]
+    for child in nested:
+        parts.append(child.get("id"))
+        parts.append(child.get("updated_at") or child.get("created_at"))
+    return compute_etag(*parts)
+
+
+def rows_etag(rows: Iterable[Mapping[str, Any]], *extra: Any) -> str:
+    """Build an ETag for a list of rows from their id/updated_at plus extra query parts."""
+    parts = list(extra)
+    for row in rows:
+        parts.append(row.get("id"))
+        parts.append(row.get("updated_at") or row.get("created_at"))
+    return compute_etag(*parts)
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """
+    Return a 304 response when the client's If-None-Match matches the ETag.
+
+    Args:
+        request: Incoming request.
+        etag: Current ETag of the resource.
+
+    Returns:
+        A 304 Response to return as-is, or None if the payload must be sent.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return None
+
+    candidates = {tag.strip() for tag in if_none_match.split(",")}
+    # Weak comparison: ignore the W/ prefix on either side
+    if "*" in candidates or etag.removeprefix("W/") in {tag.removeprefix("W/") for tag in candidates}:
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
@@ -0,0 +1,35 @@
+"""
+App-level exception handlers.
+
+Service errors are translated per endpoint by ``api.error_mapping.translate_errors``.
+"""
+
+import logging
+
+from fastapi import FastAPI, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse
+
+logger = logging.getLogger(__name__)
+
+
+def _validation_message(error: dict) -> str:
+    """Render one pydantic error as text (validator messages are used as-is)."""
+    if error.get("type") == "value_error" and "error" in error.get("ctx", {}):
+        return str(error["ctx"]["error"])
+    # Drop the leading "body"/"query"/"path" part of the location
+    location = ".".join(str(part) for part in error.get("loc", ())[1:])
+    return f"{location}: {error['msg']}" if location else error["msg"]
+
+
+async def request_validation_handler(request: Request, exc: RequestValidationError) -> JSONResponse:
+    """Return 422 with the validation messages joined into one string detail."""
+    # Log the messages only: the errors also carry the submitted (clinical) input
+    detail = " ".join(_validation_message(error) for error in exc.errors())
+    logger.warning("%s %s: %s", request.method, request.url.path, detail)
+    return JSONResponse(status_code=422, content={"detail": detail})
+
+
+def register_exception_handlers(app: FastAPI) -> None:
+    """Register the request-validation handler on the FastAPI application."""
+    app.add_exception_handler(RequestValidationError, request_validation_handler)
@@ -0,0 +1,20 @@
+"""Helpers for building response headers."""
+
+from urllib.parse import quote
+
+# RFC 6266 attachment header with an ASCII fallback and an RFC 5987 UTF-8 name
+_CONTENT_DISPOSITION_TEMPLATE = "attachment; filename=\"{fallback}\"; filename*=UTF-8''{quoted}".format
+
+
+def content_disposition(filename: str) -> str:
+    """
+    Build a Content-Disposition header value for a file download.
+
+    Args:
+        filename: Download filename; may contain non-ASCII characters.
+
+    Returns:
+        Header value with a quoted ASCII fallback and a percent-encoded UTF-8 name.
+    """
+    fallback = filename.encode("ascii", "replace").decode("ascii").replace("\\", "_").replace('"', "_")
+    return _CONTENT_DISPOSITION_TEMPLATE(fallback=fallback, quoted=quote(filename, safe=""))
@@ -0,0 +1,13 @@
+"""Shared path parameter types."""
+
+from typing import Annotated
+
+from fastapi import Path
+
+# Canonical 8-4-4-4-12 hex form of a Postgres uuid
+_UUID_PATTERN = r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$"
+
+# uuid primary keys in the path. Malformed ids are rejected with 422 during
+# request validation, before any database query. The value stays a str, which
+# is what the service layer and its cache keys use.
+UUIDPath = Annotated[str, Path(pattern=_UUID_PATTERN)]
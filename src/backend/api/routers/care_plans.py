@@ -1,17 +1,52 @@
-"""Care plan CRUD routes."""
+"""Care plan CRUD routes.
+
+As in ``api.routers.patients``, rows are returned as plain dicts and
+validated/serialized by ``response_model`` in pydantic-core rather than being
+turned into ``CarePlanResponse`` objects (or ``model_construct`` copies) in Python.
+"""
 
 import logging
+from typing import Any, Dict
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 
-from api.dependencies import get_current_user
-from models import CarePlanCreateRequest, CarePlanResponse, CarePlansListResponse, ErrorResponse
-from services.database_service import DatabaseServiceError, create_care_plan, get_care_plans_by_patient
+from api.dependencies import get_current_user_id, set_cache_headers
+from api.error_mapping import translate_errors
+from api.etag import not_modified, rows_etag
+from api.streaming import stream_batches
+from models import (
+    CarePlanCreateRequest,
+    CarePlanResponse,
+    CarePlansBatchRequest,
+    CarePlansBatchResponse,
+    CarePlansListResponse,
+    ErrorResponse,
+)
+from services.database_service import (
+    create_care_plan,
+    get_care_plans_by_patient,
+    get_care_plans_by_patients,
+    iter_care_plans_by_patient,
+)
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Error details shared by every endpoint in this module
+CREATE_ERROR_DETAIL = "看護計画の作成中にエラーが発生しました。"
+FETCH_ERROR_DETAIL = "看護計画の取得中にエラーが発生しました。"
+
+# Exception -> HTTP error mappings for translate_errors
+CREATE_ERRORS = {Exception: (500, CREATE_ERROR_DETAIL)}
+FETCH_ERRORS = {Exception: (500, FETCH_ERROR_DETAIL)}
+
+# Validates a batch of rows in one call and encodes them one line at a time
+_CARE_PLANS_ADAPTER = TypeAdapter(list[CarePlanResponse])
+_CARE_PLAN_ADAPTER = TypeAdapter(CarePlanResponse)
+
 
 @router.post(
     "/care-plans",
@@ -25,10 +60,11 @@ router = APIRouter()
     summary="Create a new care plan",
     description="Create a new care plan for a patient.",
 )
-async def create_care_plan_endpoint(
+@translate_errors(CREATE_ERRORS)
+def create_care_plan_endpoint(
     request: CarePlanCreateRequest,
-    current_user: dict = Depends(get_current_user),
-) -> CarePlanResponse:
+    user_id: str = Depends(get_current_user_id),
+) -> dict[str, Any]:
     """
     Create a new care plan for a patient.
     
@@ -36,41 +72,17 @@ async def create_care_plan_endpoint(
     
     Returns the created care plan data.
     """
-    try:
-        care_plan_data = create_care_plan(
-            user_id=current_user["user_id"],
-            patient_id=request.patient_id,
-            plan_output=request.plan_output,
-            start_date=request.start_date,
-            end_date=request.end_date,
-            status=request.status,
-            notes=request.notes,
-        )
-        
-        return CarePlanResponse(
-            id=str(care_plan_data["id"]),
-            patient_id=str(care_plan_data["patient_id"]),
-            plan_output=care_plan_data["plan_output"],
-            start_date=str(care_plan_data["start_date"]) if care_plan_data.get("start_date") else None,
-            end_date=str(care_plan_data["end_date"]) if care_plan_data.get("end_date") else None,
-            status=care_plan_data["status"],
-            notes=care_plan_data.get("notes"),
-            created_at=str(care_plan_data["created_at"]),
-            updated_at=str(care_plan_data["updated_at"]),
-        )
-        
-    except DatabaseServiceError as db_exc:
-        logger.error(f"Database error creating care plan: {db_exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="看護計画の作成中にエラーが発生しました。",
-        ) from db_exc
-    except Exception as exc:  # pragma: no cover - defensive
-        logger.error(f"Unexpected error creating care plan: {exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="看護計画の作成中にエラーが発生しました。",
-        ) from exc
+    care_plan_data = create_care_plan(
+        user_id=user_id,
+        patient_id=request.patient_id,
+        plan_output=request.plan_output,
+        start_date=request.start_date,
+        end_date=request.end_date,
+        status=request.status,
+        notes=request.notes,
+    )
+    
+    return care_plan_data
 
 
 @router.get(
@@ -83,12 +95,16 @@ async def create_care_plan_endpoint(
     tags=["care-plans"],
     summary="Get care plans for a patient",
     description="Fetch all care plans for a specific patient.",
+    dependencies=[Depends(set_cache_headers)],
 )
-async def get_care_plans_endpoint(
+@translate_errors(FETCH_ERRORS)
+def get_care_plans_endpoint(
     patient_id: str,
-    current_user: dict = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    user_id: str = Depends(get_current_user_id),
     status: str | None = Query(None, description="Filter by status (active/inactive/completed)"),
-) -> CarePlansListResponse:
+) -> Any:
     """
     Fetch all care plans for a specific patient.
     
@@ -98,41 +114,101 @@ async def get_care_plans_endpoint(
     - status: Filter care plans by status (active/inactive/completed)
     
     Returns list of care plans ordered by start_date DESC.
+    Responds with 304 Not Modified when If-None-Match matches the list's ETag.
     """
-    try:
-        care_plans_data = get_care_plans_by_patient(
-            user_id=current_user["user_id"],
-            patient_id=patient_id,
-            status=status,
-        )
-        
-        care_plans = [
-            CarePlanResponse(
-                id=str(cp["id"]),
-                patient_id=str(cp["patient_id"]),
-                plan_output=cp["plan_output"],
-                start_date=str(cp["start_date"]) if cp.get("start_date") else None,
-                end_date=str(cp["end_date"]) if cp.get("end_date") else None,
-                status=cp["status"],
-                notes=cp.get("notes"),
-                created_at=str(cp["created_at"]),
-                updated_at=str(cp["updated_at"]),
-            )
-            for cp in care_plans_data
-        ]
-        
-        return CarePlansListResponse(care_plans=care_plans)
-        
-    except DatabaseServiceError as db_exc:
-        logger.error(f"Database error fetching care plans: {db_exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="看護計画の取得中にエラーが発生しました。",
-        ) from db_exc
-    except Exception as exc:  # pragma: no cover - defensive
-        logger.error(f"Unexpected error fetching care plans: {exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="看護計画の取得中にエラーが発生しました。",
-        ) from exc
+    care_plans_data = get_care_plans_by_patient(
+        user_id=user_id,
+        patient_id=patient_id,
+        status=status,
+    )
+    
+    # Checked before the list is validated and serialized
+    etag = rows_etag(care_plans_data, patient_id, status)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    response.headers["ETag"] = etag
+    
+    return {"care_plans": care_plans_data}
 
+
+@router.get(
+    "/patients/{patient_id}/care-plans/stream",
+    responses={
+        200: {
+            "content": {"application/x-ndjson": {}},
+            "description": "One CarePlanResponse JSON object per line",
+        },
+        401: {"model": ErrorResponse, "description": "Authentication error"},
+        500: {"model": ErrorResponse, "description": "Internal server error"},
+    },
+    tags=["care-plans"],
+    summary="Stream care plans for a patient",
+    description="Stream all care plans for a specific patient as newline-delimited JSON.",
+)
+@translate_errors(FETCH_ERRORS)
+def stream_care_plans_endpoint(
+    patient_id: str,
+    user_id: str = Depends(get_current_user_id),
+    status: str | None = Query(None, description="Filter by status (active/inactive/completed)"),
+) -> StreamingResponse:
+    """
+    Stream all care plans for a specific patient as NDJSON.
+    
+    Requires authentication via Supabase JWT token.
+    
+    Same rows and order as GET /patients/{patient_id}/care-plans, but fetched
+    and written in batches, so memory stays flat and the first lines go out
+    before the whole list has been loaded. Use it for patients with a long
+    care-plan history; the JSON endpoint stays the default for small lists.
+    """
+    batches = iter_care_plans_by_patient(
+        user_id=user_id,
+        patient_id=patient_id,
+        status=status,
+    )
+    return stream_batches(
+        batches,
+        _encode_care_plans,
+        "application/x-ndjson",
+        what="care plans",
+    )
+
+
+def _encode_care_plans(batch: list[Dict[str, Any]]) -> bytes:
+    """Validate a batch of care plan rows and encode them as NDJSON lines."""
+    care_plans = _CARE_PLANS_ADAPTER.validate_python(batch)
+    return b"".join(_CARE_PLAN_ADAPTER.dump_json(care_plan) + b"\n" for care_plan in care_plans)
+
+
+@router.post(
+    "/care-plans/batch",
+    response_model=CarePlansBatchResponse,
+    responses={
+        401: {"model": ErrorResponse, "description": "Authentication error"},
+        500: {"model": ErrorResponse, "description": "Internal server error"},
+    },
+    tags=["care-plans"],
+    summary="Get care plans for several patients",
+    description="Fetch the care plans of several patients in one request.",
+)
+@translate_errors(FETCH_ERRORS)
+def get_care_plans_batch_endpoint(
+    request: CarePlansBatchRequest,
+    user_id: str = Depends(get_current_user_id),
+) -> dict[str, Any]:
+    """
+    Fetch the care plans of several patients for the authenticated user.
+    
+    Requires authentication via Supabase JWT token.
+    
+    Returns care plans keyed by patient ID, each list ordered by start_date
+    DESC. Loaded with a single query instead of one request per patient.
+    """
+    care_plans_data = get_care_plans_by_patients(
+        user_id=user_id,
+        patient_ids=request.patient_ids,
+        status=request.status,
+    )
+    
+    return {"care_plans": care_plans_data}
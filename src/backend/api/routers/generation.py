@@ -1,13 +1,14 @@
 """SOAP note generation routes."""
 
+import asyncio
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import PlainTextResponse
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from fastapi.responses import PlainTextResponse, StreamingResponse
 
-from api.dependencies import get_ai_service_dependency, get_current_user
+from api.dependencies import get_ai_service_dependency, get_current_user_id
 from models import ErrorResponse, GenerateRequest
-from prompt_builder import build_prompt
+from prompt_builder import SYSTEM_PROMPT, build_prompt, build_visit_info
 from services.ai_service import AIService, AIServiceError
 from services.database_service import DatabaseServiceError, get_patient_by_id, save_soap_record
 from utils.response_parser import parse_soap_response
@@ -21,7 +22,8 @@ router = APIRouter()
     "/generate",
     response_class=PlainTextResponse,
     responses={
-        400: {"model": ErrorResponse, "description": "Validation error"},
+        404: {"model": ErrorResponse, "description": "Patient not found"},
+        422: {"model": ErrorResponse, "description": "Missing or invalid input"},
         500: {"model": ErrorResponse, "description": "Internal server error"},
         502: {"model": ErrorResponse, "description": "AI service error"},
     },
@@ -31,25 +33,32 @@ router = APIRouter()
 )
 async def generate_note(
     request: GenerateRequest,
-    current_user: dict = Depends(get_current_user),
+    background_tasks: BackgroundTasks,
+    user_id: str = Depends(get_current_user_id),
     ai_service: AIService = Depends(get_ai_service_dependency),
-) -> str:
+) -> StreamingResponse:
     """
     Generate SOAP note and care plan from input data.
     
     Requires authentication via Supabase JWT token.
     
-    Returns plain text response with SOAP format and nursing care plan.
+    Streams a plain text response with SOAP format and nursing care plan as
+    the AI generates it. The record is saved in a background task once the
+    whole response has been sent, so the database write is not on the
+    client's critical path.
     """
     # Determine patient information
     patient_id = request.patient_id
-    patient_name = request.userName.strip()
-    diagnosis = request.diagnosis.strip()
+    patient_name = request.userName
+    diagnosis = request.diagnosis
     
     # If patient_id is provided, fetch patient data
+    # (required fields are checked and text stripped by GenerateRequest itself)
     if patient_id:
         try:
-            patient_data = get_patient_by_id(patient_id=patient_id, user_id=current_user["user_id"])
+            patient_data = await asyncio.to_thread(
+                get_patient_by_id, patient_id=patient_id, user_id=user_id
+            )
             patient_name = patient_data["name"]
             diagnosis = patient_data.get("primary_diagnosis") or diagnosis
         except DatabaseServiceError as db_exc:
@@ -57,97 +66,112 @@ async def generate_note(
                 status_code=404,
                 detail=f"指定された利用者（ID: {patient_id}）が見つかりませんでした。",
             ) from db_exc
-    else:
-        # Backward compatibility: validate userName and diagnosis if patient_id not provided
-        if not patient_name:
-            raise HTTPException(
-                status_code=400,
-                detail="利用者名は必須です（patient_idが指定されていない場合）。",
-            )
-        if not diagnosis:
-            raise HTTPException(
-                status_code=400,
-                detail="主疾患は必須です（patient_idが指定されていない場合）。",
-            )
-    
-    # Validate required fields
-    if not request.visitDate.strip():
-        raise HTTPException(
-            status_code=400,
-            detail="訪問日は必須です。",
-        )
-    if not request.startTime.strip() or not request.endTime.strip():
-        raise HTTPException(
-            status_code=400,
-            detail="訪問時間（開始・終了）は必須です。",
-        )
-    if not request.sText.strip() and not request.oText.strip():
-        raise HTTPException(
-            status_code=400,
-            detail="SまたはOのいずれか一方は必須です。",
-        )
 
-    # Build prompt with all fields
-    try:
-        prompt = build_prompt(
-            user_name=patient_name,
-            diagnosis=diagnosis,
-            nurses=request.nurses,
-            visit_date=request.visitDate,
-            start_time=request.startTime,
-            end_time=request.endTime,
-            chief_complaint=request.chiefComplaint,
-            s_text=request.sText,
-            o_text=request.oText,
-        )
-    except ValueError as exc:
-        raise HTTPException(
-            status_code=400,
-            detail=f"日付形式が不正です: {exc}",
-        ) from exc
+    # Build the per-visit input (dates/times are already parsed by GenerateRequest);
+    # the static SYSTEM_PROMPT goes first as instructions so it can be cached
+    prompt = build_prompt(
+        user_name=patient_name,
+        diagnosis=diagnosis,
+        nurses=request.nurses,
+        visit_date=request.visitDate,
+        start_time=request.startTime,
+        end_time=request.endTime,
+        chief_complaint=request.chiefComplaint,
+        s_text=request.sText,
+        o_text=request.oText,
+    )
 
-    # Generate output
+    # Start generation; wait for the first chunk so AI errors still map to 502
+    chunks = ai_service.stream_output(prompt, instructions=SYSTEM_PROMPT)
     try:
-        output = ai_service.generate_output(prompt)
-        
-        # Parse the output to structured format
-        parsed_data = parse_soap_response(output)
-        # Save to database after successful generation
-        try:
-            # user_id is already validated in get_current_user dependency, so it's guaranteed to be present
-            # Handle visit_date - use empty string if not provided, save() will default to today
-            visit_date = request.visitDate.strip() if request.visitDate else ""
-            
-            save_soap_record(
-                user_id=current_user["user_id"],
-                patient_id=patient_id,
-                patient_name=patient_name if not patient_id else None,  # Only include for backward compatibility
-                diagnosis=diagnosis if not patient_id else None,  # Only include for backward compatibility
-                visit_date=visit_date,
-                start_time=request.startTime.strip() if request.startTime else "",
-                end_time=request.endTime.strip() if request.endTime else "",
-                nurses=request.nurses,
-                chief_complaint=request.chiefComplaint.strip() if request.chiefComplaint else "",
-                s_text=request.sText,
-                o_text=request.oText,
-                soap_output=parsed_data["soap"],
-                plan_output=parsed_data["plan"],
-            )
-            logger.info(f"Successfully saved SOAP record for user {current_user['user_id']}, patient_id={patient_id}")
-        except DatabaseServiceError as db_exc:
-            # Log error but don't fail the request - generation was successful
-            logger.error(f"Failed to save to database: {db_exc}")
-            # Continue - user still gets the generated output
-        
-        return output
-    except AIServiceError as exc:
+        first_chunk = await anext(chunks)
+    except StopAsyncIteration as exc:
         raise HTTPException(
             status_code=502,
             detail="AI生成中にエラーが発生しました。",
         ) from exc
-    except Exception as exc:  # pragma: no cover - defensive
+    except AIServiceError as exc:
         raise HTTPException(
-            status_code=500,
+            status_code=502,
             detail="AI生成中にエラーが発生しました。",
         ) from exc
 
+    parts = [first_chunk]
+    generation_finished = False
+
+    async def body():
+        nonlocal generation_finished
+        yield first_chunk
+        try:
+            async for chunk in chunks:
+                parts.append(chunk)
+                yield chunk
+        except AIServiceError as exc:
+            # Headers are already sent; end the body and skip saving a partial note
+            logger.error("AI generation failed mid-stream: %s", exc)
+            return
+        generation_finished = True
+        # Visit date/time, nurses and diagnosis come from the request, not the model
+        yield build_visit_info(
+            diagnosis,
+            request.nurses,
+            request.visitDate,
+            request.startTime,
+            request.endTime,
+        )
+
+    def save_record() -> None:
+        # Runs on the threadpool after the response; also after a client
+        # disconnect, which leaves generation_finished False
+        if generation_finished:
+            _save_generated_record(
+                request,
+                user_id,
+                patient_id,
+                patient_name,
+                diagnosis,
+                "".join(parts).strip(),
+            )
+
+    # FastAPI attaches the request's background tasks to the returned response
+    background_tasks.add_task(save_record)
+
+    # Ask reverse proxies not to buffer the body, so tokens reach the client as generated
+    return StreamingResponse(
+        body(),
+        media_type="text/plain; charset=utf-8",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _save_generated_record(
+    request: GenerateRequest,
+    user_id: str,
+    patient_id: str | None,
+    patient_name: str,
+    diagnosis: str,
+    output: str,
+) -> None:
+    """Parse the generated text and save it as a SOAP record."""
+    # Parse the output to structured format
+    parsed_data = parse_soap_response(output)
+    try:
+        save_soap_record(
+            user_id=user_id,
+            patient_id=patient_id,
+            patient_name=patient_name if not patient_id else None,  # Only include for backward compatibility
+            diagnosis=diagnosis if not patient_id else None,  # Only include for backward compatibility
+            visit_date=request.visitDate.isoformat(),
+            start_time=request.startTime.isoformat(),
+            end_time=request.endTime.isoformat(),
+            nurses=request.nurses,
+            chief_complaint=request.chiefComplaint,
+            s_text=request.sText,
+            o_text=request.oText,
+            soap_output=parsed_data["soap"],
+            plan_output=parsed_data["plan"],
+        )
+        logger.info("Successfully saved SOAP record for user %s, patient_id=%s", user_id, patient_id)
+    except DatabaseServiceError as db_exc:
+        # Log error but don't fail the request - the user already has the generated output
+        logger.error("Failed to save to database: %s", db_exc)
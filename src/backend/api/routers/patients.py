@@ -1,14 +1,40 @@
-"""Patient CRUD routes."""
+"""Patient CRUD routes.
+
+The endpoints are plain ``def`` functions on purpose: the Supabase client is
+synchronous, so FastAPI runs them on its worker threadpool instead of letting
+each HTTP round-trip block the event loop.
+
+Rows are returned as the plain dicts Supabase gives us. FastAPI validates them
+against ``response_model`` and dumps them straight to JSON bytes in
+pydantic-core, so no per-row ``PatientResponse`` objects are built in Python.
+Building them with ``model_construct`` instead is slower, not faster: it is a
+Python loop per row, where validating the dicts stays in pydantic-core.
+
+Service errors (not found, invalid status, database failures) are turned into
+HTTP responses by ``translate_errors``, as in the other routers.
+"""
 
 import logging
+from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Query, Request
 from fastapi.responses import Response
 
-from api.dependencies import get_current_user
-from models import ErrorResponse, PatientCreateRequest, PatientResponse, PatientUpdateRequest, PatientsListResponse
+from api.dependencies import get_current_user_id, set_cache_headers
+from api.error_mapping import translate_errors
+from api.etag import not_modified, row_etag, rows_etag
+from models import (
+    ErrorResponse,
+    PatientBulkCreateRequest,
+    PatientCreateRequest,
+    PatientResponse,
+    PatientUpdateRequest,
+    PatientsListResponse,
+)
 from services.database_service import (
-    DatabaseServiceError,
+    InvalidStatusError,
+    NotFoundError,
+    bulk_create_patients,
     create_patient,
     delete_patient,
     get_patient_by_id,
@@ -18,6 +44,26 @@ from services.database_service import (
 
 logger = logging.getLogger(__name__)
 
+# Error details shared by every endpoint in this module
+NOT_FOUND_DETAIL = "利用者が見つかりませんでした。"
+CREATE_ERROR_DETAIL = "利用者の作成中にエラーが発生しました。"
+FETCH_ERROR_DETAIL = "利用者の取得中にエラーが発生しました。"
+UPDATE_ERROR_DETAIL = "利用者の更新中にエラーが発生しました。"
+DELETE_ERROR_DETAIL = "利用者の削除中にエラーが発生しました。"
+
+# Exception -> HTTP error mappings for translate_errors
+CREATE_ERRORS = {Exception: (500, CREATE_ERROR_DETAIL)}
+FETCH_ERRORS = {NotFoundError: (404, NOT_FOUND_DETAIL), Exception: (500, FETCH_ERROR_DETAIL)}
+UPDATE_ERRORS = {
+    NotFoundError: (404, NOT_FOUND_DETAIL),
+    InvalidStatusError: (400, None),
+    Exception: (500, UPDATE_ERROR_DETAIL),
+}
+DELETE_ERRORS = {NotFoundError: (404, NOT_FOUND_DETAIL), Exception: (500, DELETE_ERROR_DETAIL)}
+
+# Keep the default response class. With a response_model, FastAPI encodes the
+# result with pydantic-core's dump_json; a custom class such as ORJSONResponse
+# would switch back to building a Python dict first and then encoding it.
 router = APIRouter()
 
 
@@ -33,10 +79,11 @@ router = APIRouter()
     summary="Create a new patient",
     description="Create a new patient (利用者) record with baseline information.",
 )
-async def create_patient_endpoint(
+@translate_errors(CREATE_ERRORS)
+def create_patient_endpoint(
     request: PatientCreateRequest,
-    current_user: dict = Depends(get_current_user),
-) -> PatientResponse:
+    user_id: str = Depends(get_current_user_id),
+) -> dict[str, Any]:
     """
     Create a new patient record.
     
@@ -44,65 +91,43 @@ async def create_patient_endpoint(
     
     Returns the created patient data.
     """
-    try:
-        patient_data = create_patient(
-            user_id=current_user["user_id"],
-            name=request.name,
-            age=request.age,
-            gender=request.gender,
-            primary_diagnosis=request.primary_diagnosis,
-            individual_notes=request.individual_notes,
-            status=request.status,
-            birth_date=request.birth_date,
-            birth_date_year=request.birth_date_year,
-            birth_date_month=request.birth_date_month,
-            birth_date_day=request.birth_date_day,
-            address=request.address,
-            contact=request.contact,
-            key_person_name=request.key_person_name,
-            key_person_relationship=request.key_person_relationship,
-            key_person_address=request.key_person_address,
-            key_person_contact1=request.key_person_contact1,
-            key_person_contact2=request.key_person_contact2,
-            medical_history=request.medical_history,
-            current_illness_history=request.current_illness_history,
-            family_structure=request.family_structure,
-            doctor_name=request.doctor_name,
-            hospital_name=request.hospital_name,
-            hospital_address=request.hospital_address,
-            hospital_phone=request.hospital_phone,
-            initial_visit_date=request.initial_visit_date,
-            initial_visit_year=request.initial_visit_year,
-            initial_visit_month=request.initial_visit_month,
-            initial_visit_day=request.initial_visit_day,
-            initial_visit_day_of_week=request.initial_visit_day_of_week,
-            initial_visit_start_hour=request.initial_visit_start_hour,
-            initial_visit_start_minute=request.initial_visit_start_minute,
-            initial_visit_end_hour=request.initial_visit_end_hour,
-            initial_visit_end_minute=request.initial_visit_end_minute,
-            daily_life_meal_nutrition=request.daily_life_meal_nutrition,
-            daily_life_hygiene=request.daily_life_hygiene,
-            daily_life_medication=request.daily_life_medication,
-            daily_life_sleep=request.daily_life_sleep,
-            daily_life_living_environment=request.daily_life_living_environment,
-            daily_life_family_environment=request.daily_life_family_environment,
-            recorder_name=request.recorder_name,
+    return create_patient(
+        user_id=user_id,
+        **request.model_dump(exclude_unset=True),
+    )
+
+
+@router.post(
+    "/patients/bulk",
+    response_model=PatientsListResponse,
+    responses={
+        400: {"model": ErrorResponse, "description": "Validation error"},
+        401: {"model": ErrorResponse, "description": "Authentication error"},
+        500: {"model": ErrorResponse, "description": "Internal server error"},
+    },
+    tags=["patients"],
+    summary="Create several patients",
+    description="Create several patient (利用者) records in one request.",
+)
+@translate_errors(CREATE_ERRORS)
+def bulk_create_patients_endpoint(
+    request: PatientBulkCreateRequest,
+    user_id: str = Depends(get_current_user_id),
+) -> dict[str, Any]:
+    """
+    Create several patient records at once.
+    
+    Requires authentication via Supabase JWT token.
+    
+    Rows are written with multi-row INSERTs instead of one request per
+    patient. Returns the created patients in request order.
+    """
+    return {
+        "patients": bulk_create_patients(
+            user_id=user_id,
+            patients=[patient.model_dump(exclude_unset=True) for patient in request.patients],
         )
-        
-        return PatientResponse(**{k: str(v) if k in ["id", "created_at", "updated_at"] or (k in ["birth_date", "initial_visit_date"] and v) else v for k, v in patient_data.items()})
-        
-    except DatabaseServiceError as db_exc:
-        logger.error(f"Database error creating patient: {db_exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="利用者の作成中にエラーが発生しました。",
-        ) from db_exc
-    except Exception as exc:  # pragma: no cover - defensive
-        logger.error(f"Unexpected error creating patient: {exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="利用者の作成中にエラーが発生しました。",
-        ) from exc
+    }
 
 
 @router.get(
@@ -115,11 +140,15 @@ async def create_patient_endpoint(
     tags=["patients"],
     summary="Get all patients",
     description="Fetch all patients (利用者) for the authenticated user with optional status filter.",
+    dependencies=[Depends(set_cache_headers)],
 )
-async def get_patients_endpoint(
-    current_user: dict = Depends(get_current_user),
+@translate_errors(FETCH_ERRORS)
+def get_patients_endpoint(
+    request: Request,
+    response: Response,
+    user_id: str = Depends(get_current_user_id),
     status: str | None = Query(None, description="Filter by status (active/inactive/archived)"),
-) -> PatientsListResponse:
+) -> Any:
     """
     Fetch all patients for the authenticated user.
     
@@ -129,32 +158,21 @@ async def get_patients_endpoint(
     - status: Filter patients by status (active/inactive/archived)
     
     Returns list of patients ordered by name.
+    Responds with 304 Not Modified when If-None-Match matches the list's ETag.
     """
-    try:
-        patients_data = get_patients(
-            user_id=current_user["user_id"],
-            status=status,
-        )
-        
-        patients = [
-            PatientResponse(**{k: str(v) if k in ["id", "created_at", "updated_at"] or (k in ["birth_date", "initial_visit_date"] and v) else v for k, v in patient.items()})
-            for patient in patients_data
-        ]
-        
-        return PatientsListResponse(patients=patients)
-        
-    except DatabaseServiceError as db_exc:
-        logger.error(f"Database error fetching patients: {db_exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="利用者の取得中にエラーが発生しました。",
-        ) from db_exc
-    except Exception as exc:  # pragma: no cover - defensive
-        logger.error(f"Unexpected error fetching patients: {exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="利用者の取得中にエラーが発生しました。",
-        ) from exc
+    patients_data = get_patients(
+        user_id=user_id,
+        status=status,
+    )
+    
+    # Checked before the list is validated and serialized
+    etag = rows_etag(patients_data, status)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    response.headers["ETag"] = etag
+    
+    return {"patients": patients_data}
 
 
 @router.get(
@@ -168,42 +186,32 @@ async def get_patients_endpoint(
     tags=["patients"],
     summary="Get a single patient",
     description="Fetch a single patient (利用者) by ID.",
+    dependencies=[Depends(set_cache_headers)],
 )
-async def get_patient_endpoint(
+@translate_errors(FETCH_ERRORS)
+def get_patient_endpoint(
     patient_id: str,
-    current_user: dict = Depends(get_current_user),
-) -> PatientResponse:
+    request: Request,
+    response: Response,
+    user_id: str = Depends(get_current_user_id),
+) -> Any:
     """
     Fetch a single patient by ID for the authenticated user.
     
     Requires authentication via Supabase JWT token.
     
     Returns patient data.
+    Responds with 304 Not Modified when If-None-Match matches the patient's ETag.
     """
-    try:
-        patient_data = get_patient_by_id(patient_id=patient_id, user_id=current_user["user_id"])
-        
-        return PatientResponse(**{k: str(v) if k in ["id", "created_at", "updated_at"] or (k in ["birth_date", "initial_visit_date"] and v) else v for k, v in patient_data.items()})
-        
-    except DatabaseServiceError as db_exc:
-        error_msg = str(db_exc)
-        if "not found" in error_msg.lower():
-            logger.warning(f"Patient {patient_id} not found for user {current_user['user_id']}")
-            raise HTTPException(
-                status_code=404,
-                detail="利用者が見つかりませんでした。",
-            ) from db_exc
-        logger.error(f"Database error fetching patient: {db_exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="利用者の取得中にエラーが発生しました。",
-        ) from db_exc
-    except Exception as exc:  # pragma: no cover - defensive
-        logger.error(f"Unexpected error fetching patient: {exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="利用者の取得中にエラーが発生しました。",
-        ) from exc
+    patient_data = get_patient_by_id(patient_id=patient_id, user_id=user_id)
+    
+    etag = row_etag(patient_data)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    response.headers["ETag"] = etag
+    
+    return patient_data
 
 
 @router.patch(
@@ -219,91 +227,29 @@ async def get_patient_endpoint(
     summary="Update a patient",
     description="Update a patient (利用者) record.",
 )
-async def update_patient_endpoint(
+@translate_errors(UPDATE_ERRORS)
+def update_patient_endpoint(
     patient_id: str,
     request: PatientUpdateRequest,
-    current_user: dict = Depends(get_current_user),
-) -> PatientResponse:
+    user_id: str = Depends(get_current_user_id),
+) -> dict[str, Any]:
     """
     Update a patient record for the authenticated user.
     
     Requires authentication via Supabase JWT token.
     
-    Returns updated patient data.
+    Returns updated patient data. An empty body is a no-op and returns the
+    current patient without writing to the database.
     """
-    try:
-        updated_patient = update_patient(
-            patient_id=patient_id,
-            user_id=current_user["user_id"],
-            name=request.name,
-            age=request.age,
-            gender=request.gender,
-            primary_diagnosis=request.primary_diagnosis,
-            individual_notes=request.individual_notes,
-            status=request.status,
-            birth_date=request.birth_date,
-            birth_date_year=request.birth_date_year,
-            birth_date_month=request.birth_date_month,
-            birth_date_day=request.birth_date_day,
-            address=request.address,
-            contact=request.contact,
-            key_person_name=request.key_person_name,
-            key_person_relationship=request.key_person_relationship,
-            key_person_address=request.key_person_address,
-            key_person_contact1=request.key_person_contact1,
-            key_person_contact2=request.key_person_contact2,
-            medical_history=request.medical_history,
-            current_illness_history=request.current_illness_history,
-            family_structure=request.family_structure,
-            doctor_name=request.doctor_name,
-            hospital_name=request.hospital_name,
-            hospital_address=request.hospital_address,
-            hospital_phone=request.hospital_phone,
-            initial_visit_date=request.initial_visit_date,
-            initial_visit_year=request.initial_visit_year,
-            initial_visit_month=request.initial_visit_month,
-            initial_visit_day=request.initial_visit_day,
-            initial_visit_day_of_week=request.initial_visit_day_of_week,
-            initial_visit_start_hour=request.initial_visit_start_hour,
-            initial_visit_start_minute=request.initial_visit_start_minute,
-            initial_visit_end_hour=request.initial_visit_end_hour,
-            initial_visit_end_minute=request.initial_visit_end_minute,
-            daily_life_meal_nutrition=request.daily_life_meal_nutrition,
-            daily_life_hygiene=request.daily_life_hygiene,
-            daily_life_medication=request.daily_life_medication,
-            daily_life_sleep=request.daily_life_sleep,
-            daily_life_living_environment=request.daily_life_living_environment,
-            daily_life_family_environment=request.daily_life_family_environment,
-            recorder_name=request.recorder_name,
-        )
-        
-        return PatientResponse(**{k: str(v) if k in ["id", "created_at", "updated_at"] or (k in ["birth_date", "initial_visit_date"] and v) else v for k, v in updated_patient.items()})
-        
-    except DatabaseServiceError as db_exc:
-        error_msg = str(db_exc)
-        if "not found" in error_msg.lower():
-            logger.warning(f"Patient {patient_id} not found for user {current_user['user_id']}")
-            raise HTTPException(
-                status_code=404,
-                detail="利用者が見つかりませんでした。",
-            ) from db_exc
-        if "Invalid status" in error_msg:
-            logger.warning(f"Invalid status provided: {request.status}")
-            raise HTTPException(
-                status_code=400,
-                detail=error_msg,
-            ) from db_exc
-        logger.error(f"Database error updating patient: {db_exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="利用者の更新中にエラーが発生しました。",
-        ) from db_exc
-    except Exception as exc:  # pragma: no cover - defensive
-        logger.error(f"Unexpected error updating patient: {exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="利用者の更新中にエラーが発生しました。",
-        ) from exc
+    changes = request.model_dump(exclude_unset=True)
+    if not changes:
+        return get_patient_by_id(patient_id=patient_id, user_id=user_id)
+    
+    return update_patient(
+        patient_id=patient_id,
+        user_id=user_id,
+        **changes,
+    )
 
 
 @router.delete(
@@ -317,9 +263,10 @@ async def update_patient_endpoint(
     summary="Delete a patient",
     description="Delete a patient (利用者) record.",
 )
-async def delete_patient_endpoint(
+@translate_errors(DELETE_ERRORS)
+def delete_patient_endpoint(
     patient_id: str,
-    current_user: dict = Depends(get_current_user),
+    user_id: str = Depends(get_current_user_id),
 ):
     """
     Delete a patient record for the authenticated user.
@@ -328,28 +275,6 @@ async def delete_patient_endpoint(
     
     Returns 204 No Content on success.
     """
-    try:
-        delete_patient(patient_id=patient_id, user_id=current_user["user_id"])
-        
-        return Response(status_code=204)
-        
-    except DatabaseServiceError as db_exc:
-        error_msg = str(db_exc)
-        if "not found" in error_msg.lower():
-            logger.warning(f"Patient {patient_id} not found for user {current_user['user_id']}")
-            raise HTTPException(
-                status_code=404,
-                detail="利用者が見つかりませんでした。",
-            ) from db_exc
-        logger.error(f"Database error deleting patient: {db_exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="利用者の削除中にエラーが発生しました。",
-        ) from db_exc
-    except Exception as exc:  # pragma: no cover - defensive
-        logger.error(f"Unexpected error deleting patient: {exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="利用者の削除中にエラーが発生しました。",
-        ) from exc
-
+    delete_patient(patient_id=patient_id, user_id=user_id)
+    
+    return Response(status_code=204)
@@ -1,25 +1,72 @@
 """PDF generation routes."""
 
+import asyncio
+import hashlib
+import io
 import logging
+from typing import AsyncIterator
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import Response
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from fastapi.responses import RedirectResponse, Response, StreamingResponse
 
-from api.dependencies import get_current_user
+from api.dependencies import get_current_user_id
+from api.error_mapping import translate_errors
+from api.etag import compute_etag
+from api.headers import content_disposition
+from api.params import UUIDPath
 from models import ErrorResponse, PDFGenerationResponse
-from services.database_service import DatabaseServiceError, get_soap_record_by_id, get_visits_by_patient_and_month, get_patient_by_id
-from services.pdf_service import PDFServiceError, generate_monthly_report_pdf, generate_visit_report_pdf, generate_patient_record_pdf
-from services.s3_service import S3ServiceError, generate_presigned_url, upload_pdf_to_s3
+from services.database_service import NotFoundError, get_soap_record_by_id, get_visits_by_patient_and_month, get_patient_by_id
+from services.s3_service import (
+    S3ServiceError,
+    generate_presigned_url,
+    get_object_metadata,
+    object_exists,
+    upload_pdf_to_s3,
+)
+from services.pdf_worker import run_pdf_job
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Chunk size for streamed PDF bodies
+PDF_STREAM_CHUNK_SIZE = 64 * 1024
+
+# S3 metadata key holding a fingerprint of the rows a stored PDF was rendered from
+SOURCE_ETAG_METADATA_KEY = "source-etag"
+
+# Error details shared by every endpoint in this module. PDFServiceError is
+# covered by the Exception entry so pdf_service can stay lazily imported.
+PDF_ERROR_DETAIL = "PDF生成中にエラーが発生しました。"
+UPLOAD_ERROR_DETAIL = "PDFアップロード中にエラーが発生しました。"
+
+# Exception -> HTTP error mappings for translate_errors
+VISIT_REPORT_ERRORS = {
+    NotFoundError: (404, "訪問記録が見つかりませんでした。"),
+    S3ServiceError: (500, UPLOAD_ERROR_DETAIL),
+    Exception: (500, PDF_ERROR_DETAIL),
+}
+MONTHLY_REPORT_ERRORS = {
+    S3ServiceError: (500, UPLOAD_ERROR_DETAIL),
+    Exception: (500, PDF_ERROR_DETAIL),
+}
+PATIENT_RECORD_ERRORS = {
+    NotFoundError: (404, "利用者が見つかりませんでした。"),
+    Exception: (500, PDF_ERROR_DETAIL),
+}
+
+
+async def _iter_chunks(buffer: io.BytesIO) -> AsyncIterator[bytes]:
+    """Yield an in-memory PDF in fixed-size chunks."""
+    while chunk := buffer.read(PDF_STREAM_CHUNK_SIZE):
+        yield chunk
+
 
 @router.post(
     "/pdf/visit-report/{visit_id}",
     response_class=Response,
     responses={
+        303: {"description": "Redirect to a presigned S3 URL (redirect=true)"},
         401: {"model": ErrorResponse, "description": "Authentication error"},
         404: {"model": ErrorResponse, "description": "Visit record not found"},
         500: {"model": ErrorResponse, "description": "Internal server error"},
@@ -28,62 +75,63 @@ router = APIRouter()
     summary="Generate visit report PDF",
     description="Generate 精神科訪問看護記録書Ⅱ PDF for a specific visit and return it directly.",
 )
+@translate_errors(VISIT_REPORT_ERRORS)
 async def generate_visit_report_pdf_endpoint(
-    visit_id: str,
-    current_user: dict = Depends(get_current_user),
+    visit_id: UUIDPath,
+    redirect: bool = Query(False, description="Redirect to a presigned S3 URL instead of returning the PDF bytes"),
+    user_id: str = Depends(get_current_user_id),
 ) -> Response:
     """
     Generate visit report PDF (精神科訪問看護記録書Ⅱ) for a specific visit.
     
     Requires authentication via Supabase JWT token.
     
-    Returns the PDF file directly.
+    Returns the PDF file directly, streamed in chunks. With ``redirect=true``
+    the PDF is stored in S3 and the response is a 303 redirect to a presigned
+    URL, so the bytes do not pass through this server.
     """
-    try:
-        # Fetch visit record
-        record_data = get_soap_record_by_id(record_id=visit_id, user_id=current_user["user_id"])
-        
-        # Generate PDF
-        pdf_bytes = generate_visit_report_pdf(record_data)
-        
-        logger.info(f"Successfully generated visit report PDF for visit {visit_id}")
+    # Imported lazily so workers that never render PDFs skip WeasyPrint/Jinja2
+    from services.pdf_service import generate_visit_report_pdf
+    
+    # Fetch visit record
+    record_data = await asyncio.to_thread(
+        get_soap_record_by_id, record_id=visit_id, user_id=user_id
+    )
+    
+    if redirect:
+        # The key changes whenever the record does, so an unchanged record
+        # reuses the PDF already in S3 instead of rendering it again
+        version = hashlib.blake2b(
+            str(record_data.get("updated_at") or record_data.get("created_at")).encode("utf-8"),
+            digest_size=8,
+        ).hexdigest()
+        s3_key = f"pdf/visit/{visit_id}_{version}.pdf"
         
-        # Return PDF directly with appropriate headers
-        # Use Japanese-safe filename encoding
-        filename = f"visit_report_{visit_id}.pdf"
-        return Response(
-            content=pdf_bytes,
-            media_type="application/pdf",
-            headers={
-                "Content-Disposition": f"attachment; filename={filename}; filename*=UTF-8''{filename}"
-            }
-        )
+        if not await asyncio.to_thread(object_exists, s3_key):
+            pdf_bytes = await run_pdf_job(generate_visit_report_pdf, record_data)
+            await asyncio.to_thread(upload_pdf_to_s3, pdf_bytes, s3_key)
         
-    except DatabaseServiceError as db_exc:
-        error_msg = str(db_exc)
-        if "not found" in error_msg.lower():
-            logger.warning(f"Visit {visit_id} not found for user {current_user['user_id']}")
-            raise HTTPException(
-                status_code=404,
-                detail="訪問記録が見つかりませんでした。",
-            ) from db_exc
-        logger.error(f"Database error generating visit report PDF: {db_exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="PDF生成中にエラーが発生しました。",
-        ) from db_exc
-    except PDFServiceError as pdf_exc:
-        logger.error(f"PDF service error generating visit report: {pdf_exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="PDF生成中にエラーが発生しました。",
-        ) from pdf_exc
-    except Exception as exc:  # pragma: no cover - defensive
-        logger.error(f"Unexpected error generating visit report PDF: {exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="PDF生成中にエラーが発生しました。",
-        ) from exc
+        presigned_url = generate_presigned_url(s3_key)
+        return RedirectResponse(url=presigned_url, status_code=303)
+    
+    # Render in the PDF process pool, then stream the bytes out in chunks
+    pdf_bytes = await run_pdf_job(generate_visit_report_pdf, record_data)
+    size = len(pdf_bytes)
+    buffer = io.BytesIO(pdf_bytes)
+    
+    logger.info("Successfully generated visit report PDF for visit %s", visit_id)
+    
+    # Return PDF directly with appropriate headers
+    # Use Japanese-safe filename encoding
+    filename = f"visit_report_{visit_id}.pdf"
+    return StreamingResponse(
+        _iter_chunks(buffer),
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": content_disposition(filename),
+            "Content-Length": str(size),
+        }
+    )
 
 
 @router.post(
@@ -99,11 +147,13 @@ async def generate_visit_report_pdf_endpoint(
     summary="Generate monthly report PDF",
     description="Generate monthly report PDF for a specific patient and upload to S3.",
 )
+@translate_errors(MONTHLY_REPORT_ERRORS)
 async def generate_monthly_report_pdf_endpoint(
-    patient_id: str,
+    # Currently the patient name, not the patients.id uuid
+    patient_id: str = Path(..., min_length=1, max_length=128),
     year: int = Query(..., description="Year (YYYY format)", ge=2000, le=2100),
     month: int = Query(..., description="Month (1-12)", ge=1, le=12),
-    current_user: dict = Depends(get_current_user),
+    user_id: str = Depends(get_current_user_id),
 ) -> PDFGenerationResponse:
     """
     Generate monthly report PDF for a specific patient.
@@ -116,74 +166,60 @@ async def generate_monthly_report_pdf_endpoint(
 
     Returns presigned URL for downloading the PDF.
     """
-    try:
-        # Fetch visits for the month
-        # Note: patient_id is actually patient_name in the current schema
-        visits_data = get_visits_by_patient_and_month(
-            user_id=current_user["user_id"],
-            patient_name=patient_id,
-            year=year,
-            month=month,
-        )
-
-        if not visits_data:
-            raise HTTPException(
-                status_code=404,
-                detail=f"{year}年{month}月の訪問記録が見つかりませんでした。",
-            )
-
-        # Get patient name from first visit
-        patient_name = visits_data[0].get("patient_name", patient_id)
+    from services.pdf_service import generate_monthly_report_pdf
+    
+    # Fetch visits for the month
+    # Note: patient_id is actually patient_name in the current schema
+    visits_data = await asyncio.to_thread(
+        get_visits_by_patient_and_month,
+        user_id=user_id,
+        patient_name=patient_id,
+        year=year,
+        month=month,
+    )
 
-        # Generate PDF
-        pdf_bytes = generate_monthly_report_pdf(
-            patient_id=patient_id,
-            patient_name=patient_name,
-            month=f"{month:02d}",
-            year=str(year),
-            visits_data=visits_data,
+    if not visits_data:
+        raise HTTPException(
+            status_code=404,
+            detail=f"{year}年{month}月の訪問記録が見つかりませんでした。",
         )
 
-        # Upload to S3
-        s3_key = f"pdf/monthly/{patient_id}_{year}{month:02d}.pdf"
-        upload_pdf_to_s3(pdf_bytes, s3_key)
+    # Get patient name from first visit (filled from the patients row if NULL)
+    patient_name = visits_data[0].get("patient_name") or patient_id
 
-        # Generate presigned URL
+    # The S3 key is deterministic. The stored PDF is reused while the
+    # month's visits (ids and update times) are unchanged.
+    s3_key = f"pdf/monthly/{patient_id}_{year}{month:02d}.pdf"
+    source_etag = compute_etag(
+        *(f"{visit.get('id')}:{visit.get('updated_at') or visit.get('created_at')}" for visit in visits_data)
+    )
+    stored_metadata = await asyncio.to_thread(get_object_metadata, s3_key)
+    if stored_metadata is not None and stored_metadata.get(SOURCE_ETAG_METADATA_KEY) == source_etag:
+        logger.info("Reusing stored monthly report PDF for patient %s, %s-%02d", patient_id, year, month)
         presigned_url = generate_presigned_url(s3_key)
+        return PDFGenerationResponse(pdf_url=presigned_url, s3_key=s3_key)
 
-        logger.info(f"Successfully generated monthly report PDF for patient {patient_id}, {year}-{month:02d}")
+    pdf_bytes = await run_pdf_job(
+        generate_monthly_report_pdf,
+        patient_id=patient_id,
+        patient_name=patient_name,
+        month=f"{month:02d}",
+        year=str(year),
+        visits_data=visits_data,
+    )
 
-        return PDFGenerationResponse(
-            pdf_url=presigned_url,
-            s3_key=s3_key,
-        )
+    # Upload to S3; presigning is local signing only, no thread needed
+    await asyncio.to_thread(
+        upload_pdf_to_s3, pdf_bytes, s3_key, {SOURCE_ETAG_METADATA_KEY: source_etag}
+    )
+    presigned_url = generate_presigned_url(s3_key)
 
-    except HTTPException:
-        raise
-    except DatabaseServiceError as db_exc:
-        logger.error(f"Database error generating monthly report PDF: {db_exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="PDF生成中にエラーが発生しました。",
-        ) from db_exc
-    except PDFServiceError as pdf_exc:
-        logger.error(f"PDF service error generating monthly report: {pdf_exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="PDF生成中にエラーが発生しました。",
-        ) from pdf_exc
-    except S3ServiceError as s3_exc:
-        logger.error(f"S3 service error generating monthly report PDF: {s3_exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="PDFアップロード中にエラーが発生しました。",
-        ) from s3_exc
-    except Exception as exc:  # pragma: no cover - defensive
-        logger.error(f"Unexpected error generating monthly report PDF: {exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="PDF生成中にエラーが発生しました。",
-        ) from exc
+    logger.info("Successfully generated monthly report PDF for patient %s, %s-%02d", patient_id, year, month)
+
+    return PDFGenerationResponse(
+        pdf_url=presigned_url,
+        s3_key=s3_key,
+    )
 
 
 @router.post(
@@ -198,9 +234,10 @@ async def generate_monthly_report_pdf_endpoint(
     summary="Generate patient record PDF",
     description="Generate 精神科訪問看護記録書Ⅰ PDF for a specific patient and return it directly.",
 )
-async def generate_patient_record_pdf_endpoint(
-    patient_id: str,
-    current_user: dict = Depends(get_current_user),
+@translate_errors(PATIENT_RECORD_ERRORS)
+def generate_patient_record_pdf_endpoint(
+    patient_id: UUIDPath,
+    user_id: str = Depends(get_current_user_id),
 ) -> Response:
     """
     Generate patient record PDF (精神科訪問看護記録書Ⅰ) for a specific patient.
@@ -209,49 +246,24 @@ async def generate_patient_record_pdf_endpoint(
     
     Returns the PDF file directly.
     """
-    try:
-        # Fetch patient data
-        patient_data = get_patient_by_id(patient_id=patient_id, user_id=current_user["user_id"])
-        
-        # Generate PDF
-        pdf_bytes = generate_patient_record_pdf(patient_data)
-        
-        logger.info(f"Successfully generated patient record PDF for patient {patient_id}")
-        
-        # Return PDF directly with appropriate headers
-        # Use Japanese-safe filename encoding
-        filename = f"patient_record_{patient_id}.pdf"
-        return Response(
-            content=pdf_bytes,
-            media_type="application/pdf",
-            headers={
-                "Content-Disposition": f"attachment; filename={filename}; filename*=UTF-8''{filename}"
-            }
-        )
-        
-    except DatabaseServiceError as db_exc:
-        error_msg = str(db_exc)
-        if "not found" in error_msg.lower():
-            logger.warning(f"Patient {patient_id} not found for user {current_user['user_id']}")
-            raise HTTPException(
-                status_code=404,
-                detail="利用者が見つかりませんでした。",
-            ) from db_exc
-        logger.error(f"Database error generating patient record PDF: {db_exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="PDF生成中にエラーが発生しました。",
-        ) from db_exc
-    except PDFServiceError as pdf_exc:
-        logger.error(f"PDF service error generating patient record: {pdf_exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="PDF生成中にエラーが発生しました。",
-        ) from pdf_exc
-    except Exception as exc:  # pragma: no cover - defensive
-        logger.error(f"Unexpected error generating patient record PDF: {exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="PDF生成中にエラーが発生しました。",
-        ) from exc
+    from services.pdf_service import generate_patient_record_pdf
+    
+    # Fetch patient data
+    patient_data = get_patient_by_id(patient_id=patient_id, user_id=user_id)
+    
+    # Generate PDF
+    pdf_bytes = generate_patient_record_pdf(patient_data)
+    
+    logger.info("Successfully generated patient record PDF for patient %s", patient_id)
+    
+    # Return PDF directly with appropriate headers
+    # Use Japanese-safe filename encoding
+    filename = f"patient_record_{patient_id}.pdf"
+    return Response(
+        content=pdf_bytes,
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": content_disposition(filename)
+        }
+    )
 
@@ -1,117 +1,76 @@
 """Plan (訪問看護計画書) routes."""
 
 import logging
-from typing import Any, Dict
+from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends
 from fastapi.responses import Response
 
-from api.dependencies import get_current_user
+from api.dependencies import get_current_user_id
+from api.error_mapping import translate_errors
+from api.headers import content_disposition
 from models import (
     ErrorResponse,
     PlanCreateRequest,
-    PlanEvaluationResponse,
     PlanHospitalizationCreate,
-    PlanHospitalizationResponse,
-    PlanItemResponse,
     PlanResponse,
     PlansListResponse,
     PlanUpdateRequest,
 )
 from services.database_service import (
-    DatabaseServiceError,
+    NotFoundError,
     create_plan,
     create_plan_hospitalization,
     delete_plan,
+    get_org_settings,
     get_patient_by_id,
     get_plan_by_id,
     get_plans_by_patient,
     update_plan,
 )
-from services.pdf_service import PDFServiceError, generate_plan_pdf
-from services.plan_service import PlanServiceError, auto_evaluate_plan
+from services.plan_service import auto_evaluate_plan
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Error details shared by several endpoints in this module
+PATIENT_NOT_FOUND_DETAIL = "利用者が見つかりませんでした。"
+PLAN_NOT_FOUND_DETAIL = "計画書が見つかりませんでした。"
+FETCH_ERROR_DETAIL = "計画書の取得中にエラーが発生しました。"
 
-def convert_plan_to_response(plan: Dict[str, Any]) -> PlanResponse:
-    """
-    Convert plan database dictionary to PlanResponse model.
-    
-    Args:
-        plan: Plan dictionary from database
-        
-    Returns:
-        PlanResponse model instance
-    """
-    # Convert nested items
-    items = []
-    for item in plan.get("items", []):
-        items.append(PlanItemResponse(
-            id=str(item["id"]),
-            plan_id=str(item["plan_id"]),
-            item_key=item.get("item_key", ""),
-            label=item.get("label", ""),
-            observation_text=item.get("observation_text"),
-            assistance_text=item.get("assistance_text"),
-            sort_order=item.get("sort_order", 0),
-            created_at=str(item.get("created_at", "")),
-            updated_at=str(item.get("updated_at", "")),
-        ))
-    
-    # Convert nested evaluations
-    evaluations = []
-    for eval_item in plan.get("evaluations", []):
-        evaluations.append(PlanEvaluationResponse(
-            id=str(eval_item["id"]),
-            plan_id=str(eval_item["plan_id"]),
-            evaluation_slot=eval_item.get("evaluation_slot", 0),
-            evaluation_date=str(eval_item.get("evaluation_date", "")),
-            result=eval_item.get("result", "NONE"),
-            note=eval_item.get("note"),
-            decided_by=eval_item.get("decided_by"),
-            source_soap_record_id=str(eval_item["source_soap_record_id"]) if eval_item.get("source_soap_record_id") else None,
-            created_at=str(eval_item.get("created_at", "")),
-            updated_at=str(eval_item.get("updated_at", "")),
-        ))
-    
-    # Convert nested hospitalizations
-    hospitalizations = []
-    for hosp_item in plan.get("hospitalizations", []):
-        hospitalizations.append(PlanHospitalizationResponse(
-            id=str(hosp_item["id"]),
-            plan_id=str(hosp_item["plan_id"]),
-            hospitalized_at=str(hosp_item.get("hospitalized_at", "")),
-            note=hosp_item.get("note"),
-            created_at=str(hosp_item.get("created_at", "")),
-        ))
-    
-    return PlanResponse(
-        id=str(plan["id"]),
-        patient_id=str(plan["patient_id"]),
-        title=plan.get("title", "精神科訪問看護計画書"),
-        start_date=str(plan.get("start_date", "")),
-        end_date=str(plan.get("end_date", "")),
-        long_term_goal=plan.get("long_term_goal"),
-        short_term_goal=plan.get("short_term_goal"),
-        nursing_policy=plan.get("nursing_policy"),
-        patient_family_wish=plan.get("patient_family_wish"),
-        has_procedure=plan.get("has_procedure", False),
-        procedure_content=plan.get("procedure_content"),
-        material_details=plan.get("material_details"),
-        material_amount=plan.get("material_amount"),
-        procedure_note=plan.get("procedure_note"),
-        status=plan.get("status", "ACTIVE"),
-        closed_at=str(plan["closed_at"]) if plan.get("closed_at") else None,
-        closed_reason=plan.get("closed_reason"),
-        created_at=str(plan.get("created_at", "")),
-        updated_at=str(plan.get("updated_at", "")),
-        items=items,
-        evaluations=evaluations,
-        hospitalizations=hospitalizations,
-    )
+# Exception -> HTTP error mappings for translate_errors. PlanServiceError and
+# PDFServiceError are covered by the Exception entries, so pdf_service can
+# stay lazily imported.
+PATIENT_PLANS_FETCH_ERRORS = {
+    NotFoundError: (404, PATIENT_NOT_FOUND_DETAIL),
+    Exception: (500, FETCH_ERROR_DETAIL),
+}
+PLAN_CREATE_ERRORS = {
+    NotFoundError: (404, PATIENT_NOT_FOUND_DETAIL),
+    Exception: (500, "計画書の作成中にエラーが発生しました。"),
+}
+PLAN_FETCH_ERRORS = {NotFoundError: (404, PLAN_NOT_FOUND_DETAIL), Exception: (500, FETCH_ERROR_DETAIL)}
+PLAN_UPDATE_ERRORS = {
+    NotFoundError: (404, PLAN_NOT_FOUND_DETAIL),
+    Exception: (500, "計画書の更新中にエラーが発生しました。"),
+}
+HOSPITALIZE_ERRORS = {
+    NotFoundError: (404, PLAN_NOT_FOUND_DETAIL),
+    Exception: (500, "入院記録の作成中にエラーが発生しました。"),
+}
+AUTO_EVALUATE_ERRORS = {
+    NotFoundError: (404, PLAN_NOT_FOUND_DETAIL),
+    Exception: (500, "自動評価中にエラーが発生しました。"),
+}
+PLAN_DELETE_ERRORS = {
+    NotFoundError: (404, PLAN_NOT_FOUND_DETAIL),
+    Exception: (500, "計画書の削除中にエラーが発生しました。"),
+}
+PLAN_PDF_ERRORS = {
+    NotFoundError: (404, PLAN_NOT_FOUND_DETAIL),
+    Exception: (500, "PDF生成中にエラーが発生しました。"),
+}
 
 
 @router.get(
@@ -126,11 +85,12 @@ def convert_plan_to_response(plan: Dict[str, Any]) -> PlanResponse:
     summary="Get plans for a patient",
     description="Fetch all plans (訪問看護計画書) for a specific patient.",
 )
-async def get_patient_plans(
+@translate_errors(PATIENT_PLANS_FETCH_ERRORS)
+def get_patient_plans(
     patient_id: str,
-    current_user: dict = Depends(get_current_user),
+    user_id: str = Depends(get_current_user_id),
     status: str | None = None,
-) -> PlansListResponse:
+) -> dict[str, Any]:
     """
     Fetch all plans for a specific patient.
     
@@ -141,41 +101,19 @@ async def get_patient_plans(
     
     Returns list of plans ordered by start_date DESC.
     """
-    try:
-        # Verify patient exists and belongs to user
-        get_patient_by_id(patient_id=patient_id, user_id=current_user["user_id"])
-        
-        # Fetch plans
-        plans_data = get_plans_by_patient(
-            patient_id=patient_id,
-            user_id=current_user["user_id"],
-            status=status,
-        )
-        
-        # Convert to response format
-        plans = [convert_plan_to_response(plan) for plan in plans_data]
-        
-        return PlansListResponse(plans=plans)
-        
-    except DatabaseServiceError as db_exc:
-        error_msg = str(db_exc)
-        if "not found" in error_msg.lower():
-            logger.warning(f"Patient {patient_id} not found for user {current_user['user_id']}")
-            raise HTTPException(
-                status_code=404,
-                detail="利用者が見つかりませんでした。",
-            ) from db_exc
-        logger.error(f"Database error fetching plans: {db_exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="計画書の取得中にエラーが発生しました。",
-        ) from db_exc
-    except Exception as exc:  # pragma: no cover - defensive
-        logger.error(f"Unexpected error fetching plans: {exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="計画書の取得中にエラーが発生しました。",
-        ) from exc
+    # Verify patient exists and belongs to user
+    get_patient_by_id(patient_id=patient_id, user_id=user_id)
+    
+    # Fetch plans
+    plans_data = get_plans_by_patient(
+        patient_id=patient_id,
+        user_id=user_id,
+        status=status,
+    )
+    
+    # Rows (with their nested items/evaluations/hospitalizations) are
+    # validated and dumped to JSON by response_model in one pydantic-core pass
+    return {"plans": plans_data}
 
 
 @router.post(
@@ -191,10 +129,11 @@ async def get_patient_plans(
     summary="Create a plan",
     description="Create a new plan (訪問看護計画書) for a patient.",
 )
-async def create_plan_endpoint(
+@translate_errors(PLAN_CREATE_ERRORS)
+def create_plan_endpoint(
     patient_id: str,
     request: PlanCreateRequest,
-    current_user: dict = Depends(get_current_user),
+    user_id: str = Depends(get_current_user_id),
 ) -> PlanResponse:
     """
     Create a new plan for a patient.
@@ -215,61 +154,40 @@ async def create_plan_endpoint(
     
     Returns the created plan with items and evaluations.
     """
-    try:
-        # Verify patient exists and belongs to user
-        get_patient_by_id(patient_id=patient_id, user_id=current_user["user_id"])
-        
-        # Convert items and evaluations to dict format
-        items_data = None
-        if request.items:
-            items_data = [item.dict(exclude_none=True) for item in request.items]
-        
-        evaluations_data = None
-        if request.evaluations:
-            evaluations_data = [eval_item.dict(exclude_none=True) for eval_item in request.evaluations]
-        
-        # Create plan
-        plan_data = create_plan(
-            user_id=current_user["user_id"],
-            patient_id=patient_id,
-            title=request.title,
-            start_date=request.start_date,
-            end_date=request.end_date,
-            long_term_goal=request.long_term_goal,
-            short_term_goal=request.short_term_goal,
-            nursing_policy=request.nursing_policy,
-            patient_family_wish=request.patient_family_wish,
-            has_procedure=request.has_procedure,
-            procedure_content=request.procedure_content,
-            material_details=request.material_details,
-            material_amount=request.material_amount,
-            procedure_note=request.procedure_note,
-            items=items_data,
-            evaluations=evaluations_data,
-        )
-        
-        # Convert to response format
-        return convert_plan_to_response(plan_data)
-        
-    except DatabaseServiceError as db_exc:
-        error_msg = str(db_exc)
-        if "not found" in error_msg.lower():
-            logger.warning(f"Patient {patient_id} not found for user {current_user['user_id']}")
-            raise HTTPException(
-                status_code=404,
-                detail="利用者が見つかりませんでした。",
-            ) from db_exc
-        logger.error(f"Database error creating plan: {db_exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="計画書の作成中にエラーが発生しました。",
-        ) from db_exc
-    except Exception as exc:  # pragma: no cover - defensive
-        logger.error(f"Unexpected error creating plan: {exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="計画書の作成中にエラーが発生しました。",
-        ) from exc
+    # Verify patient exists and belongs to user
+    get_patient_by_id(patient_id=patient_id, user_id=user_id)
+    
+    # Convert items and evaluations to dict format
+    items_data = None
+    if request.items:
+        items_data = [item.dict(exclude_none=True) for item in request.items]
+    
+    evaluations_data = None
+    if request.evaluations:
+        evaluations_data = [eval_item.dict(exclude_none=True) for eval_item in request.evaluations]
+    
+    # Create plan
+    plan_data = create_plan(
+        user_id=user_id,
+        patient_id=patient_id,
+        title=request.title,
+        start_date=request.start_date,
+        end_date=request.end_date,
+        long_term_goal=request.long_term_goal,
+        short_term_goal=request.short_term_goal,
+        nursing_policy=request.nursing_policy,
+        patient_family_wish=request.patient_family_wish,
+        has_procedure=request.has_procedure,
+        procedure_content=request.procedure_content,
+        material_details=request.material_details,
+        material_amount=request.material_amount,
+        procedure_note=request.procedure_note,
+        items=items_data,
+        evaluations=evaluations_data,
+    )
+    
+    # Convert to response format
+    return PlanResponse.from_row(plan_data)
 
 
 @router.get(
@@ -284,9 +202,10 @@ async def create_plan_endpoint(
     summary="Get a plan",
     description="Fetch a single plan (訪問看護計画書) by ID.",
 )
-async def get_plan_endpoint(
+@translate_errors(PLAN_FETCH_ERRORS)
+def get_plan_endpoint(
     plan_id: str,
-    current_user: dict = Depends(get_current_user),
+    user_id: str = Depends(get_current_user_id),
 ) -> PlanResponse:
     """
     Fetch a single plan by ID.
@@ -295,31 +214,10 @@ async def get_plan_endpoint(
     
     Returns plan data with items and evaluations.
     """
-    try:
-        plan_data = get_plan_by_id(plan_id=plan_id, user_id=current_user["user_id"])
-        
-        # Convert to response format
-        return convert_plan_to_response(plan_data)
-        
-    except DatabaseServiceError as db_exc:
-        error_msg = str(db_exc)
-        if "not found" in error_msg.lower():
-            logger.warning(f"Plan {plan_id} not found for user {current_user['user_id']}")
-            raise HTTPException(
-                status_code=404,
-                detail="計画書が見つかりませんでした。",
-            ) from db_exc
-        logger.error(f"Database error fetching plan: {db_exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="計画書の取得中にエラーが発生しました。",
-        ) from db_exc
-    except Exception as exc:  # pragma: no cover - defensive
-        logger.error(f"Unexpected error fetching plan: {exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="計画書の取得中にエラーが発生しました。",
-        ) from exc
+    plan_data = get_plan_by_id(plan_id=plan_id, user_id=user_id)
+    
+    # Convert to response format
+    return PlanResponse.from_row(plan_data)
 
 
 @router.patch(
@@ -335,10 +233,11 @@ async def get_plan_endpoint(
     summary="Update a plan",
     description="Update a plan (訪問看護計画書) and optionally upsert items and evaluations.",
 )
-async def update_plan_endpoint(
+@translate_errors(PLAN_UPDATE_ERRORS)
+def update_plan_endpoint(
     plan_id: str,
     request: PlanUpdateRequest,
-    current_user: dict = Depends(get_current_user),
+    user_id: str = Depends(get_current_user_id),
 ) -> PlanResponse:
     """
     Update a plan.
@@ -351,59 +250,38 @@ async def update_plan_endpoint(
     
     Returns the updated plan.
     """
-    try:
-        # Convert items and evaluations to dict format
-        items_data = None
-        if request.items is not None:
-            items_data = [item.dict(exclude_none=True) for item in request.items]
-        
-        evaluations_data = None
-        if request.evaluations is not None:
-            evaluations_data = [eval_item.dict(exclude_none=True) for eval_item in request.evaluations]
-        
-        # Update plan
-        plan_data = update_plan(
-            plan_id=plan_id,
-            user_id=current_user["user_id"],
-            title=request.title,
-            start_date=request.start_date,
-            end_date=request.end_date,
-            long_term_goal=request.long_term_goal,
-            short_term_goal=request.short_term_goal,
-            nursing_policy=request.nursing_policy,
-            patient_family_wish=request.patient_family_wish,
-            has_procedure=request.has_procedure,
-            procedure_content=request.procedure_content,
-            material_details=request.material_details,
-            material_amount=request.material_amount,
-            procedure_note=request.procedure_note,
-            status=request.status,
-            items=items_data,
-            evaluations=evaluations_data,
-        )
-        
-        # Convert to response format
-        return convert_plan_to_response(plan_data)
-        
-    except DatabaseServiceError as db_exc:
-        error_msg = str(db_exc)
-        if "not found" in error_msg.lower():
-            logger.warning(f"Plan {plan_id} not found for user {current_user['user_id']}")
-            raise HTTPException(
-                status_code=404,
-                detail="計画書が見つかりませんでした。",
-            ) from db_exc
-        logger.error(f"Database error updating plan: {db_exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="計画書の更新中にエラーが発生しました。",
-        ) from db_exc
-    except Exception as exc:  # pragma: no cover - defensive
-        logger.error(f"Unexpected error updating plan: {exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="計画書の更新中にエラーが発生しました。",
-        ) from exc
+    # Convert items and evaluations to dict format
+    items_data = None
+    if request.items is not None:
+        items_data = [item.dict(exclude_none=True) for item in request.items]
+    
+    evaluations_data = None
+    if request.evaluations is not None:
+        evaluations_data = [eval_item.dict(exclude_none=True) for eval_item in request.evaluations]
+    
+    # Update plan
+    plan_data = update_plan(
+        plan_id=plan_id,
+        user_id=user_id,
+        title=request.title,
+        start_date=request.start_date,
+        end_date=request.end_date,
+        long_term_goal=request.long_term_goal,
+        short_term_goal=request.short_term_goal,
+        nursing_policy=request.nursing_policy,
+        patient_family_wish=request.patient_family_wish,
+        has_procedure=request.has_procedure,
+        procedure_content=request.procedure_content,
+        material_details=request.material_details,
+        material_amount=request.material_amount,
+        procedure_note=request.procedure_note,
+        status=request.status,
+        items=items_data,
+        evaluations=evaluations_data,
+    )
+    
+    # Convert to response format
+    return PlanResponse.from_row(plan_data)
 
 
 @router.post(
@@ -419,10 +297,11 @@ async def update_plan_endpoint(
     summary="Record hospitalization",
     description="Record a hospitalization and close the plan.",
 )
-async def hospitalize_plan_endpoint(
+@translate_errors(HOSPITALIZE_ERRORS)
+def hospitalize_plan_endpoint(
     plan_id: str,
     request: PlanHospitalizationCreate,
-    current_user: dict = Depends(get_current_user),
+    user_id: str = Depends(get_current_user_id),
 ) -> PlanResponse:
     """
     Record a hospitalization and close the plan.
@@ -437,40 +316,19 @@ async def hospitalize_plan_endpoint(
     
     Returns the updated plan.
     """
-    try:
-        # Create hospitalization record
-        create_plan_hospitalization(
-            plan_id=plan_id,
-            user_id=current_user["user_id"],
-            hospitalized_at=request.hospitalized_at,
-            note=request.note,
-        )
-        
-        # Fetch updated plan
-        plan_data = get_plan_by_id(plan_id=plan_id, user_id=current_user["user_id"])
-        
-        # Convert to response format
-        return convert_plan_to_response(plan_data)
-        
-    except DatabaseServiceError as db_exc:
-        error_msg = str(db_exc)
-        if "not found" in error_msg.lower():
-            logger.warning(f"Plan {plan_id} not found for user {current_user['user_id']}")
-            raise HTTPException(
-                status_code=404,
-                detail="計画書が見つかりませんでした。",
-            ) from db_exc
-        logger.error(f"Database error recording hospitalization: {db_exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="入院記録の作成中にエラーが発生しました。",
-        ) from db_exc
-    except Exception as exc:  # pragma: no cover - defensive
-        logger.error(f"Unexpected error recording hospitalization: {exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="入院記録の作成中にエラーが発生しました。",
-        ) from exc
+    # Create hospitalization record
+    create_plan_hospitalization(
+        plan_id=plan_id,
+        user_id=user_id,
+        hospitalized_at=request.hospitalized_at,
+        note=request.note,
+    )
+    
+    # Fetch updated plan
+    plan_data = get_plan_by_id(plan_id=plan_id, user_id=user_id)
+    
+    # Convert to response format
+    return PlanResponse.from_row(plan_data)
 
 
 @router.post(
@@ -485,9 +343,10 @@ async def hospitalize_plan_endpoint(
     summary="Auto-evaluate plan",
     description="Auto-evaluate plan based on SOAP record visit durations.",
 )
-async def auto_evaluate_plan_endpoint(
+@translate_errors(AUTO_EVALUATE_ERRORS)
+def auto_evaluate_plan_endpoint(
     plan_id: str,
-    current_user: dict = Depends(get_current_user),
+    user_id: str = Depends(get_current_user_id),
 ) -> PlanResponse:
     """
     Auto-evaluate plan based on SOAP record visit durations.
@@ -502,40 +361,13 @@ async def auto_evaluate_plan_endpoint(
     
     Returns the updated plan.
     """
-    try:
-        plan_data = auto_evaluate_plan(
-            plan_id=plan_id,
-            user_id=current_user["user_id"],
-        )
-        
-        # Convert to response format
-        return convert_plan_to_response(plan_data)
-        
-    except PlanServiceError as plan_exc:
-        logger.error(f"Plan service error auto-evaluating: {plan_exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="自動評価中にエラーが発生しました。",
-        ) from plan_exc
-    except DatabaseServiceError as db_exc:
-        error_msg = str(db_exc)
-        if "not found" in error_msg.lower():
-            logger.warning(f"Plan {plan_id} not found for user {current_user['user_id']}")
-            raise HTTPException(
-                status_code=404,
-                detail="計画書が見つかりませんでした。",
-            ) from db_exc
-        logger.error(f"Database error auto-evaluating plan: {db_exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="自動評価中にエラーが発生しました。",
-        ) from db_exc
-    except Exception as exc:  # pragma: no cover - defensive
-        logger.error(f"Unexpected error auto-evaluating plan: {exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="自動評価中にエラーが発生しました。",
-        ) from exc
+    plan_data = auto_evaluate_plan(
+        plan_id=plan_id,
+        user_id=user_id,
+    )
+    
+    # Convert to response format
+    return PlanResponse.from_row(plan_data)
 
 
 @router.delete(
@@ -551,9 +383,10 @@ async def auto_evaluate_plan_endpoint(
     summary="Delete a plan",
     description="Delete a plan (訪問看護計画書) and all related records.",
 )
-async def delete_plan_endpoint(
+@translate_errors(PLAN_DELETE_ERRORS)
+def delete_plan_endpoint(
     plan_id: str,
-    current_user: dict = Depends(get_current_user),
+    user_id: str = Depends(get_current_user_id),
 ) -> Response:
     """
     Delete a plan record.
@@ -568,30 +401,9 @@ async def delete_plan_endpoint(
     
     Returns 204 No Content on success.
     """
-    try:
-        delete_plan(plan_id=plan_id, user_id=current_user["user_id"])
-        
-        return Response(status_code=204)
-        
-    except DatabaseServiceError as db_exc:
-        error_msg = str(db_exc)
-        if "not found" in error_msg.lower():
-            logger.warning(f"Plan {plan_id} not found for user {current_user['user_id']}")
-            raise HTTPException(
-                status_code=404,
-                detail="計画書が見つかりませんでした。",
-            ) from db_exc
-        logger.error(f"Database error deleting plan: {db_exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="計画書の削除中にエラーが発生しました。",
-        ) from db_exc
-    except Exception as exc:  # pragma: no cover - defensive
-        logger.error(f"Unexpected error deleting plan: {exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="計画書の削除中にエラーが発生しました。",
-        ) from exc
+    delete_plan(plan_id=plan_id, user_id=user_id)
+    
+    return Response(status_code=204)
 
 
 @router.get(
@@ -606,9 +418,10 @@ async def delete_plan_endpoint(
     summary="Generate plan PDF",
     description="Generate 精神科訪問看護計画書 PDF for a plan and return it directly.",
 )
-async def generate_plan_pdf_endpoint(
+@translate_errors(PLAN_PDF_ERRORS)
+def generate_plan_pdf_endpoint(
     plan_id: str,
-    current_user: dict = Depends(get_current_user),
+    user_id: str = Depends(get_current_user_id),
 ) -> Response:
     """
     Generate plan PDF (精神科訪問看護計画書) for a specific plan.
@@ -617,67 +430,28 @@ async def generate_plan_pdf_endpoint(
     
     Returns the PDF file directly.
     """
-    try:
-        # Fetch plan and patient data
-        plan_data = get_plan_by_id(plan_id=plan_id, user_id=current_user["user_id"])
-        patient_id = plan_data["patient_id"]
-        patient_data = get_patient_by_id(patient_id=patient_id, user_id=current_user["user_id"])
-        
-        # Fetch org settings (optional)
-        org_settings = None
-        try:
-            from services.database_service import get_supabase_client
-            supabase = get_supabase_client()
-            org_response = (
-                supabase.table("org_settings")
-                .select("*")
-                .eq("user_id", current_user["user_id"])
-                .single()
-                .execute()
-            )
-            if org_response.data:
-                org_settings = org_response.data
-        except Exception:
-            # Org settings not found, use defaults
-            pass
-        
-        # Generate PDF
-        pdf_bytes = generate_plan_pdf(plan_data, patient_data, org_settings)
-        
-        logger.info(f"Successfully generated plan PDF for plan {plan_id}")
-        
-        # Return PDF directly with appropriate headers
-        filename = f"plan_{plan_id}.pdf"
-        return Response(
-            content=pdf_bytes,
-            media_type="application/pdf",
-            headers={
-                "Content-Disposition": f"attachment; filename={filename}; filename*=UTF-8''{filename}"
-            }
-        )
-        
-    except DatabaseServiceError as db_exc:
-        error_msg = str(db_exc)
-        if "not found" in error_msg.lower():
-            logger.warning(f"Plan {plan_id} not found for user {current_user['user_id']}")
-            raise HTTPException(
-                status_code=404,
-                detail="計画書が見つかりませんでした。",
-            ) from db_exc
-        logger.error(f"Database error generating plan PDF: {db_exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="PDF生成中にエラーが発生しました。",
-        ) from db_exc
-    except PDFServiceError as pdf_exc:
-        logger.error(f"PDF service error generating plan: {pdf_exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="PDF生成中にエラーが発生しました。",
-        ) from pdf_exc
-    except Exception as exc:  # pragma: no cover - defensive
-        logger.error(f"Unexpected error generating plan PDF: {exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="PDF生成中にエラーが発生しました。",
-        ) from exc
+    # Imported lazily so workers that never render PDFs skip WeasyPrint/Jinja2
+    from services.pdf_service import generate_plan_pdf
+    
+    # Fetch plan and patient data
+    plan_data = get_plan_by_id(plan_id=plan_id, user_id=user_id)
+    patient_id = plan_data["patient_id"]
+    patient_data = get_patient_by_id(patient_id=patient_id, user_id=user_id)
+    
+    # Fetch org settings (optional)
+    org_settings = get_org_settings(user_id)
+    
+    # Generate PDF
+    pdf_bytes = generate_plan_pdf(plan_data, patient_data, org_settings)
+    
+    logger.info("Successfully generated plan PDF for plan %s", plan_id)
+    
+    # Return PDF directly with appropriate headers
+    filename = f"plan_{plan_id}.pdf"
+    return Response(
+        content=pdf_bytes,
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": content_disposition(filename)
+        }
+    )
@@ -1,21 +1,57 @@
 """SOAP records routes."""
 
 import logging
+from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Request, Response
+from pydantic import TypeAdapter
 
-from api.dependencies import get_current_user
-from models import ErrorResponse, FullSOAPRecordResponse, RecordsListResponse, SOAPRecordResponse, UpdateRecordRequest
-from services.database_service import DatabaseServiceError, get_soap_record_by_id, get_soap_records, update_soap_record
+from api.dependencies import get_current_user_id, set_revalidate_headers
+from api.error_mapping import translate_errors
+from api.etag import compute_etag, not_modified, row_etag
+from api.params import UUIDPath
+from models import (
+    ErrorResponse,
+    FullSOAPRecordResponse,
+    RecordsListResponse,
+    SOAPRecordResponse,
+    UpdateRecordRequest,
+)
+from services.database_service import (
+    InvalidStatusError,
+    NotFoundError,
+    RecordFilters,
+    get_soap_record_by_id,
+    get_soap_records_fingerprint,
+    get_soap_records_page,
+    update_soap_record,
+)
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Error details shared by every endpoint in this module
+NOT_FOUND_DETAIL = "記録が見つかりませんでした。"
+FETCH_ERROR_DETAIL = "記録の取得中にエラーが発生しました。"
+UPDATE_ERROR_DETAIL = "記録の更新中にエラーが発生しました。"
+
+# Exception -> HTTP error mappings for translate_errors
+FETCH_ERRORS = {NotFoundError: (404, NOT_FOUND_DETAIL), Exception: (500, FETCH_ERROR_DETAIL)}
+UPDATE_ERRORS = {
+    NotFoundError: (404, NOT_FOUND_DETAIL),
+    InvalidStatusError: (400, None),
+    Exception: (500, UPDATE_ERROR_DETAIL),
+}
+
+# Validates a whole page of rows in one pydantic-core call
+_RECORDS_ADAPTER = TypeAdapter(list[SOAPRecordResponse])
+
 
 @router.get(
     "/records",
     response_model=RecordsListResponse,
+    dependencies=[Depends(set_revalidate_headers)],
     responses={
         401: {"model": ErrorResponse, "description": "Authentication error"},
         500: {"model": ErrorResponse, "description": "Internal server error"},
@@ -24,15 +60,18 @@ router = APIRouter()
     summary="Get SOAP records",
     description="Fetch all SOAP records for the authenticated user with optional filters.",
 )
-async def get_records(
-    current_user: dict = Depends(get_current_user),
+@translate_errors(FETCH_ERRORS)
+def get_records(
+    request: Request,
+    response: Response,
+    user_id: str = Depends(get_current_user_id),
     date_from: str | None = None,
     date_to: str | None = None,
     nurse_name: str | None = None,
     patient_id: str | None = None,
     page: int = 1,
     page_size: int = 10,
-) -> RecordsListResponse:
+) -> Any:
     """
     Fetch SOAP records for the authenticated user with optional filtering and pagination.
     
@@ -47,90 +86,61 @@ async def get_records(
     - page_size: Number of records per page (default: 10, max: 100)
     
     Returns paginated list of SOAP records ordered by visit_date DESC.
+    Responds with 304 Not Modified when If-None-Match matches the list's ETag.
     """
-    try:
-        # Validate pagination parameters
-        page = max(1, page)  # Ensure page is at least 1
-        page_size = min(max(1, page_size), 100)  # Ensure page_size is between 1 and 100
-        
-        # Log user information for debugging
-        logger.info(f"Fetching records for user_id={current_user['user_id']}, email={current_user.get('email', 'N/A')}, page={page}, page_size={page_size}")
-        
-        # Get total count first (for pagination metadata) - fetch all matching records to count
-        all_records_data = get_soap_records(
-            user_id=current_user["user_id"],
-            date_from=date_from,
-            date_to=date_to,
-            nurse_name=nurse_name,
-            patient_id=patient_id,
-            limit=None,  # Get all for count
-        )
-        total = len(all_records_data)
-        
-        # Get paginated records
-        records_data = get_soap_records(
-            user_id=current_user["user_id"],
-            date_from=date_from,
-            date_to=date_to,
-            nurse_name=nurse_name,
-            patient_id=patient_id,
-            page=page,
-            page_size=page_size,
-        )
-        
-        # Convert database records to response format
-        records = []
-        for record in records_data:
-            try:
-                records.append(
-                    SOAPRecordResponse(
-                        id=str(record["id"]),
-                        patient_id=str(record["patient_id"]) if record.get("patient_id") else None,
-                        patient_name=record.get("patient_name") or "",
-                        visit_date=str(record["visit_date"]) if record.get("visit_date") else "",
-                        chief_complaint=record.get("chief_complaint"),
-                        created_at=str(record["created_at"]) if record.get("created_at") else "",
-                        diagnosis=record.get("diagnosis"),
-                        start_time=str(record["start_time"]) if record.get("start_time") else None,
-                        end_time=str(record["end_time"]) if record.get("end_time") else None,
-                        plan_output=record.get("plan_output"),
-                        status=record.get("status", "draft"),
-                    )
-                )
-            except Exception as e:
-                logger.error(f"Error converting record {record.get('id', 'unknown')} to response format: {e}")
-                logger.error(f"Record data: {record}")
-                # Skip this record but continue processing others
-                continue
-        
-        # Calculate pagination metadata
-        total_pages = (total + page_size - 1) // page_size if total > 0 else 0
-        
-        return RecordsListResponse(
-            records=records,
-            total=total,
-            page=page,
-            page_size=page_size,
-            total_pages=total_pages
-        )
-        
-    except DatabaseServiceError as db_exc:
-        logger.error(f"Database error fetching records: {db_exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="記録の取得中にエラーが発生しました。",
-        ) from db_exc
-    except Exception as exc:  # pragma: no cover - defensive
-        logger.error(f"Unexpected error fetching records: {exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="記録の取得中にエラーが発生しました。",
-        ) from exc
+    # Validate pagination parameters
+    page = max(1, page)  # Ensure page is at least 1
+    page_size = min(max(1, page_size), 100)  # Ensure page_size is between 1 and 100
+    
+    # Log user information for debugging
+    logger.info("Fetching records for user_id=%s, page=%s, page_size=%s", user_id, page, page_size)
+    
+    filters = RecordFilters(
+        date_from=date_from,
+        date_to=date_to,
+        nurse_name=nurse_name,
+        patient_id=patient_id,
+    )
+    
+    # ETag from the user's record count + newest updated_at and the query,
+    # checked before fetching and serializing the list itself
+    fingerprint = get_soap_records_fingerprint(user_id)
+    etag = compute_etag(*fingerprint, filters, page, page_size)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    response.headers["ETag"] = etag
+    
+    # One request returns the page (list columns only) and the total count;
+    # keyed by the same fingerprint so the body always matches the ETag
+    records_data, total = get_soap_records_page(
+        user_id=user_id,
+        filters=filters,
+        page=page,
+        page_size=page_size,
+        fingerprint=fingerprint,
+    )
+    
+    # The NULL patient_name -> "" coercion lives on the model, so the rows
+    # need no per-row Python preprocessing
+    records = _RECORDS_ADAPTER.validate_python(records_data)
+    
+    # Calculate pagination metadata
+    total_pages = (total + page_size - 1) // page_size if total > 0 else 0
+    
+    return {
+        "records": records,
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "total_pages": total_pages,
+    }
 
 
 @router.get(
     "/records/{record_id}",
     response_model=FullSOAPRecordResponse,
+    dependencies=[Depends(set_revalidate_headers)],
     responses={
         401: {"model": ErrorResponse, "description": "Authentication error"},
         404: {"model": ErrorResponse, "description": "Record not found"},
@@ -140,9 +150,12 @@ async def get_records(
     summary="Get single SOAP record",
     description="Fetch a single SOAP record by ID with full SOAP and Plan data.",
 )
-async def get_record(
-    record_id: str,
-    current_user: dict = Depends(get_current_user),
+@translate_errors(FETCH_ERRORS)
+def get_record(
+    record_id: UUIDPath,
+    request: Request,
+    response: Response,
+    user_id: str = Depends(get_current_user_id),
 ) -> FullSOAPRecordResponse:
     """
     Fetch a single SOAP record by ID for the authenticated user.
@@ -150,48 +163,17 @@ async def get_record(
     Requires authentication via Supabase JWT token.
     
     Returns full SOAP record with soap_output and plan_output.
+    Responds with 304 Not Modified when If-None-Match matches the record's ETag.
     """
-    try:
-        record_data = get_soap_record_by_id(record_id=record_id, user_id=current_user["user_id"])
-        
-        # Convert database record to response format
-        record = FullSOAPRecordResponse(
-            id=str(record_data["id"]),
-            patient_id=str(record_data["patient_id"]) if record_data.get("patient_id") else None,
-            patient_name=record_data["patient_name"],
-            visit_date=str(record_data["visit_date"]),
-            chief_complaint=record_data.get("chief_complaint"),
-            created_at=str(record_data["created_at"]),
-            diagnosis=record_data.get("diagnosis"),
-            start_time=str(record_data["start_time"]) if record_data.get("start_time") else None,
-            end_time=str(record_data["end_time"]) if record_data.get("end_time") else None,
-            nurses=record_data.get("nurses", []),
-            soap_output=record_data.get("soap_output", {}),
-            plan_output=record_data.get("plan_output"),
-            status=record_data.get("status", "draft"),
-        )
-        
-        return record
-        
-    except DatabaseServiceError as db_exc:
-        error_msg = str(db_exc)
-        if "not found" in error_msg.lower():
-            logger.warning(f"Record {record_id} not found for user {current_user['user_id']}")
-            raise HTTPException(
-                status_code=404,
-                detail="記録が見つかりませんでした。",
-            ) from db_exc
-        logger.error(f"Database error fetching record: {db_exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="記録の取得中にエラーが発生しました。",
-        ) from db_exc
-    except Exception as exc:  # pragma: no cover - defensive
-        logger.error(f"Unexpected error fetching record: {exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="記録の取得中にエラーが発生しました。",
-        ) from exc
+    record_data = get_soap_record_by_id(record_id=record_id, user_id=user_id)
+    
+    etag = row_etag(record_data)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    response.headers["ETag"] = etag
+    
+    return FullSOAPRecordResponse.from_row(record_data)
 
 
 @router.patch(
@@ -207,10 +189,11 @@ async def get_record(
     summary="Update SOAP record",
     description="Update SOAP output, plan output, or status of a SOAP record.",
 )
-async def update_record(
-    record_id: str,
+@translate_errors(UPDATE_ERRORS)
+def update_record(
+    record_id: UUIDPath,
     request: UpdateRecordRequest,
-    current_user: dict = Depends(get_current_user),
+    user_id: str = Depends(get_current_user_id),
 ) -> FullSOAPRecordResponse:
     """
     Update a SOAP record for the authenticated user.
@@ -219,58 +202,14 @@ async def update_record(
     
     Returns updated SOAP record with soap_output and plan_output.
     """
-    try:
-        # Update the record
-        updated_record = update_soap_record(
-            record_id=record_id,
-            user_id=current_user["user_id"],
-            soap_output=request.soap_output,
-            plan_output=request.plan_output,
-            status=request.status,
-        )
-        
-        # Convert database record to response format
-        record = FullSOAPRecordResponse(
-            id=str(updated_record["id"]),
-            patient_id=str(updated_record["patient_id"]) if updated_record.get("patient_id") else None,
-            patient_name=updated_record["patient_name"],
-            visit_date=str(updated_record["visit_date"]),
-            chief_complaint=updated_record.get("chief_complaint"),
-            created_at=str(updated_record["created_at"]),
-            diagnosis=updated_record.get("diagnosis"),
-            start_time=str(updated_record["start_time"]) if updated_record.get("start_time") else None,
-            end_time=str(updated_record["end_time"]) if updated_record.get("end_time") else None,
-            nurses=updated_record.get("nurses", []),
-            soap_output=updated_record.get("soap_output", {}),
-            plan_output=updated_record.get("plan_output"),
-            status=updated_record.get("status", "draft"),
-        )
-        
-        return record
-        
-    except DatabaseServiceError as db_exc:
-        error_msg = str(db_exc)
-        if "not found" in error_msg.lower():
-            logger.warning(f"Record {record_id} not found for user {current_user['user_id']}")
-            raise HTTPException(
-                status_code=404,
-                detail="記録が見つかりませんでした。",
-            ) from db_exc
-        if "Invalid status" in error_msg:
-            logger.warning(f"Invalid status provided: {request.status}")
-            raise HTTPException(
-                status_code=400,
-                detail=error_msg,
-            ) from db_exc
-        logger.error(f"Database error updating record: {db_exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="記録の更新中にエラーが発生しました。",
-        ) from db_exc
-    except Exception as exc:  # pragma: no cover - defensive
-        logger.error(f"Unexpected error updating record: {exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="記録の更新中にエラーが発生しました。",
-        ) from exc
+    # Update the record
+    updated_record = update_soap_record(
+        record_id=record_id,
+        user_id=user_id,
+        soap_output=request.soap_output,
+        plan_output=request.plan_output,
+        status=request.status,
+    )
+    
+    return FullSOAPRecordResponse.from_row(updated_record)
 
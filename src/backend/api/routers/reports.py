@@ -1,89 +1,82 @@
 """Report (精神科訪問看護報告書) routes."""
 
+import asyncio
 import logging
 from typing import Any, Dict
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import Response
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from pydantic import TypeAdapter
 
-from api.dependencies import get_current_user
+from api.dependencies import get_current_user_id
+from api.error_mapping import translate_errors
+from api.etag import not_modified, row_etag
+from api.headers import content_disposition
+from api.streaming import stream_batches
 from models import (
     ErrorResponse,
     ReportCreateRequest,
     ReportRegenerateRequest,
     ReportResponse,
     ReportUpdateRequest,
-    ReportVisitMarkResponse,
     ReportsListResponse,
 )
 from services.database_service import (
-    DatabaseServiceError,
+    AlreadyExistsError,
+    NotFoundError,
     create_report,
     delete_report,
-    get_all_reports,
+    get_org_settings,
     get_patient_by_id,
     get_report_by_id,
     get_reports_by_patient,
+    iter_all_reports,
     update_report,
 )
-from services.report_service import ReportServiceError, regenerate_report_marks
-from services.report_pdf_service import ReportPDFServiceError, generate_report_pdf
+from services.report_service import regenerate_report_marks
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Error details shared by several endpoints in this module
+PATIENT_NOT_FOUND_DETAIL = "利用者が見つかりませんでした。"
+REPORT_NOT_FOUND_DETAIL = "報告書が見つかりませんでした。"
+FETCH_ERROR_DETAIL = "報告書の取得中にエラーが発生しました。"
 
-def convert_report_to_response(report: Dict[str, Any]) -> ReportResponse:
-    """
-    Convert report database dictionary to ReportResponse model.
-    
-    Args:
-        report: Report dictionary from database
-        
-    Returns:
-        ReportResponse model instance
-    """
-    # Convert visit marks
-    visit_marks = []
-    for mark in report.get("visit_marks", []):
-        visit_marks.append(ReportVisitMarkResponse(
-            id=str(mark["id"]),
-            report_id=str(mark["report_id"]),
-            visit_date=str(mark.get("visit_date", "")),
-            mark=mark.get("mark", ""),
-            created_at=str(mark.get("created_at", "")),
-            updated_at=str(mark.get("updated_at", "")),
-        ))
-    
-    # Helper to safely convert date to string
-    def safe_date_str(value):
-        if value is None:
-            return None
-        if isinstance(value, str):
-            return value
-        return str(value)
-    
-    return ReportResponse(
-        id=str(report["id"]),
-        patient_id=str(report["patient_id"]),
-        year_month=report.get("year_month", ""),
-        period_start=safe_date_str(report.get("period_start")) or "",
-        period_end=safe_date_str(report.get("period_end")) or "",
-        disease_progress_text=report.get("disease_progress_text"),
-        nursing_rehab_text=report.get("nursing_rehab_text"),
-        family_situation_text=report.get("family_situation_text"),
-        procedure_text=report.get("procedure_text"),
-        monitoring_text=report.get("monitoring_text"),
-        gaf_score=report.get("gaf_score"),
-        gaf_date=safe_date_str(report.get("gaf_date")),
-        profession_text=report.get("profession_text", "訪問した職種：看護師"),
-        report_date=safe_date_str(report.get("report_date")) or "",
-        status=report.get("status", "DRAFT"),
-        created_at=safe_date_str(report.get("created_at")) or "",
-        updated_at=safe_date_str(report.get("updated_at")) or "",
-        visit_marks=visit_marks,
-    )
+# Exception -> HTTP error mappings for translate_errors. ReportServiceError and
+# ReportPDFServiceError are covered by the Exception entries, so
+# report_pdf_service can stay lazily imported.
+ALL_REPORTS_FETCH_ERRORS = {Exception: (500, FETCH_ERROR_DETAIL)}
+PATIENT_REPORTS_FETCH_ERRORS = {
+    NotFoundError: (404, PATIENT_NOT_FOUND_DETAIL),
+    Exception: (500, FETCH_ERROR_DETAIL),
+}
+REPORT_CREATE_ERRORS = {
+    NotFoundError: (404, PATIENT_NOT_FOUND_DETAIL),
+    AlreadyExistsError: (400, "この期間の報告書は既に存在します。"),
+    Exception: (500, "報告書の作成中にエラーが発生しました。"),
+}
+REPORT_FETCH_ERRORS = {NotFoundError: (404, REPORT_NOT_FOUND_DETAIL), Exception: (500, FETCH_ERROR_DETAIL)}
+REPORT_UPDATE_ERRORS = {
+    NotFoundError: (404, REPORT_NOT_FOUND_DETAIL),
+    Exception: (500, "報告書の更新中にエラーが発生しました。"),
+}
+REGENERATE_ERRORS = {
+    NotFoundError: (404, REPORT_NOT_FOUND_DETAIL),
+    Exception: (500, "マークの再生成中にエラーが発生しました。"),
+}
+REPORT_DELETE_ERRORS = {
+    NotFoundError: (404, REPORT_NOT_FOUND_DETAIL),
+    Exception: (500, "報告書の削除中にエラーが発生しました。"),
+}
+REPORT_PDF_ERRORS = {
+    NotFoundError: (404, REPORT_NOT_FOUND_DETAIL),
+    Exception: (500, "PDF生成中にエラーが発生しました。"),
+}
+
+# Validates and encodes a batch of report rows in one pydantic-core call
+_REPORTS_ADAPTER = TypeAdapter(list[ReportResponse])
 
 
 @router.get(
@@ -97,37 +90,34 @@ def convert_report_to_response(report: Dict[str, Any]) -> ReportResponse:
     summary="Get all reports",
     description="Fetch all reports (精神科訪問看護報告書) for the authenticated user.",
 )
-async def get_all_reports_endpoint(
-    current_user: dict = Depends(get_current_user),
-) -> ReportsListResponse:
+@translate_errors(ALL_REPORTS_FETCH_ERRORS)
+def get_all_reports_endpoint(
+    user_id: str = Depends(get_current_user_id),
+) -> StreamingResponse:
     """
     Fetch all reports for the authenticated user.
     
     Requires authentication via Supabase JWT token.
     
-    Returns list of reports ordered by year_month DESC.
+    Returns list of reports ordered by year_month DESC. The body is streamed
+    as reports are fetched in batches, so the first bytes go out before the
+    whole list has been loaded.
     """
-    try:
-        # Fetch all reports for the user
-        reports_data = get_all_reports(user_id=current_user["user_id"])
-        
-        # Convert to response format
-        reports = [convert_report_to_response(report) for report in reports_data]
-        
-        return ReportsListResponse(reports=reports)
-        
-    except DatabaseServiceError as db_exc:
-        logger.error(f"Database error fetching all reports: {db_exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="報告書の取得中にエラーが発生しました。",
-        ) from db_exc
-    except Exception as exc:  # pragma: no cover - defensive
-        logger.error(f"Unexpected error fetching all reports: {exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="報告書の取得中にエラーが発生しました。",
-        ) from exc
+    batches = iter_all_reports(user_id=user_id)
+    return stream_batches(
+        batches,
+        _encode_reports,
+        "application/json",
+        what="reports",
+        prefix=b'{"reports":[',
+        separator=b",",
+        suffix=b"]}",
+    )
+
+
+def _encode_reports(batch: list[Dict[str, Any]]) -> bytes:
+    """Validate and encode a batch of report rows at once, minus the list brackets."""
+    return _REPORTS_ADAPTER.dump_json(_REPORTS_ADAPTER.validate_python(batch))[1:-1]
 
 
 @router.get(
@@ -142,11 +132,12 @@ async def get_all_reports_endpoint(
     summary="Get reports for a patient",
     description="Fetch all reports (精神科訪問看護報告書) for a specific patient.",
 )
-async def get_patient_reports(
+@translate_errors(PATIENT_REPORTS_FETCH_ERRORS)
+def get_patient_reports(
     patient_id: str,
-    current_user: dict = Depends(get_current_user),
+    user_id: str = Depends(get_current_user_id),
     year_month: str | None = Query(None, description="Filter by year-month (YYYY-MM)"),
-) -> ReportsListResponse:
+) -> dict[str, Any]:
     """
     Fetch all reports for a specific patient.
     
@@ -157,41 +148,19 @@ async def get_patient_reports(
     
     Returns list of reports ordered by year_month DESC.
     """
-    try:
-        # Verify patient exists and belongs to user
-        get_patient_by_id(patient_id=patient_id, user_id=current_user["user_id"])
-        
-        # Fetch reports
-        reports_data = get_reports_by_patient(
-            patient_id=patient_id,
-            user_id=current_user["user_id"],
-            year_month=year_month,
-        )
-        
-        # Convert to response format
-        reports = [convert_report_to_response(report) for report in reports_data]
-        
-        return ReportsListResponse(reports=reports)
-        
-    except DatabaseServiceError as db_exc:
-        error_msg = str(db_exc)
-        if "not found" in error_msg.lower():
-            logger.warning(f"Patient {patient_id} not found for user {current_user['user_id']}")
-            raise HTTPException(
-                status_code=404,
-                detail="利用者が見つかりませんでした。",
-            ) from db_exc
-        logger.error(f"Database error fetching reports: {db_exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="報告書の取得中にエラーが発生しました。",
-        ) from db_exc
-    except Exception as exc:  # pragma: no cover - defensive
-        logger.error(f"Unexpected error fetching reports: {exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="報告書の取得中にエラーが発生しました。",
-        ) from exc
+    # Verify patient exists and belongs to user
+    get_patient_by_id(patient_id=patient_id, user_id=user_id)
+    
+    # Fetch reports
+    reports_data = get_reports_by_patient(
+        patient_id=patient_id,
+        user_id=user_id,
+        year_month=year_month,
+    )
+    
+    # Rows (with their visit marks) are validated and dumped to JSON by
+    # response_model in one pydantic-core pass
+    return {"reports": reports_data}
 
 
 @router.post(
@@ -207,10 +176,11 @@ async def get_patient_reports(
     summary="Create a report",
     description="Create a new report (精神科訪問看護報告書) for a patient.",
 )
-async def create_report_endpoint(
+@translate_errors(REPORT_CREATE_ERRORS)
+def create_report_endpoint(
     patient_id: str,
     request: ReportCreateRequest,
-    current_user: dict = Depends(get_current_user),
+    user_id: str = Depends(get_current_user_id),
 ) -> ReportResponse:
     """
     Create a new report for a patient.
@@ -233,47 +203,20 @@ async def create_report_endpoint(
     
     Returns the created report with visit marks.
     """
-    try:
-        # Verify patient exists and belongs to user
-        get_patient_by_id(patient_id=patient_id, user_id=current_user["user_id"])
-        
-        # Create report
-        report_data = create_report(
-            user_id=current_user["user_id"],
-            patient_id=patient_id,
-            year_month=request.year_month,
-            period_start=request.period_start,
-            period_end=request.period_end,
-        )
-        
-        # Convert to response format
-        return convert_report_to_response(report_data)
-        
-    except DatabaseServiceError as db_exc:
-        error_msg = str(db_exc)
-        if "not found" in error_msg.lower():
-            logger.warning(f"Patient {patient_id} not found for user {current_user['user_id']}")
-            raise HTTPException(
-                status_code=404,
-                detail="利用者が見つかりませんでした。",
-            ) from db_exc
-        if "already exists" in error_msg.lower():
-            logger.warning(f"Report already exists: {db_exc}")
-            raise HTTPException(
-                status_code=400,
-                detail="この期間の報告書は既に存在します。",
-            ) from db_exc
-        logger.error(f"Database error creating report: {db_exc}", exc_info=True)
-        raise HTTPException(
-            status_code=500,
-            detail=f"報告書の作成中にエラーが発生しました: {error_msg}",
-        ) from db_exc
-    except Exception as exc:  # pragma: no cover - defensive
-        logger.error(f"Unexpected error creating report: {exc}", exc_info=True)
-        raise HTTPException(
-            status_code=500,
-            detail=f"報告書の作成中にエラーが発生しました: {str(exc)}",
-        ) from exc
+    # Verify patient exists and belongs to user
+    get_patient_by_id(patient_id=patient_id, user_id=user_id)
+    
+    # Create report
+    report_data = create_report(
+        user_id=user_id,
+        patient_id=patient_id,
+        year_month=request.year_month,
+        period_start=request.period_start,
+        period_end=request.period_end,
+    )
+    
+    # Convert to response format
+    return ReportResponse.from_row(report_data)
 
 
 @router.get(
@@ -288,9 +231,12 @@ async def create_report_endpoint(
     summary="Get a report",
     description="Fetch a single report (精神科訪問看護報告書) by ID.",
 )
-async def get_report_endpoint(
+@translate_errors(REPORT_FETCH_ERRORS)
+def get_report_endpoint(
     report_id: str,
-    current_user: dict = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    user_id: str = Depends(get_current_user_id),
 ) -> ReportResponse:
     """
     Fetch a single report by ID.
@@ -298,32 +244,19 @@ async def get_report_endpoint(
     Requires authentication via Supabase JWT token.
     
     Returns report data with visit marks.
+    Responds with 304 Not Modified when If-None-Match matches the report's ETag.
     """
-    try:
-        report_data = get_report_by_id(report_id=report_id, user_id=current_user["user_id"])
-        
-        # Convert to response format
-        return convert_report_to_response(report_data)
-        
-    except DatabaseServiceError as db_exc:
-        error_msg = str(db_exc)
-        if "not found" in error_msg.lower():
-            logger.warning(f"Report {report_id} not found for user {current_user['user_id']}")
-            raise HTTPException(
-                status_code=404,
-                detail="報告書が見つかりませんでした。",
-            ) from db_exc
-        logger.error(f"Database error fetching report: {db_exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="報告書の取得中にエラーが発生しました。",
-        ) from db_exc
-    except Exception as exc:  # pragma: no cover - defensive
-        logger.error(f"Unexpected error fetching report: {exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="報告書の取得中にエラーが発生しました。",
-        ) from exc
+    report_data = get_report_by_id(report_id=report_id, user_id=user_id)
+    
+    # Visit marks are edited separately, so they are part of the version
+    etag = row_etag(report_data, report_data.get("visit_marks", []))
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    response.headers["ETag"] = etag
+    
+    # Convert to response format
+    return ReportResponse.from_row(report_data)
 
 
 @router.patch(
@@ -339,10 +272,11 @@ async def get_report_endpoint(
     summary="Update a report",
     description="Update a report (精神科訪問看護報告書) and optionally upsert visit marks.",
 )
-async def update_report_endpoint(
+@translate_errors(REPORT_UPDATE_ERRORS)
+def update_report_endpoint(
     report_id: str,
     request: ReportUpdateRequest,
-    current_user: dict = Depends(get_current_user),
+    user_id: str = Depends(get_current_user_id),
 ) -> ReportResponse:
     """
     Update a report.
@@ -354,51 +288,30 @@ async def update_report_endpoint(
     
     Returns the updated report.
     """
-    try:
-        # Convert visit marks to dict format
-        visit_marks_data = None
-        if request.visit_marks is not None:
-            visit_marks_data = [mark.dict(exclude_none=True) for mark in request.visit_marks]
-        
-        # Update report
-        report_data = update_report(
-            report_id=report_id,
-            user_id=current_user["user_id"],
-            disease_progress_text=request.disease_progress_text,
-            nursing_rehab_text=request.nursing_rehab_text,
-            family_situation_text=request.family_situation_text,
-            procedure_text=request.procedure_text,
-            monitoring_text=request.monitoring_text,
-            gaf_score=request.gaf_score,
-            gaf_date=request.gaf_date,
-            profession_text=request.profession_text,
-            report_date=request.report_date,
-            status=request.status,
-            visit_marks=visit_marks_data,
-        )
-        
-        # Convert to response format
-        return convert_report_to_response(report_data)
-        
-    except DatabaseServiceError as db_exc:
-        error_msg = str(db_exc)
-        if "not found" in error_msg.lower():
-            logger.warning(f"Report {report_id} not found for user {current_user['user_id']}")
-            raise HTTPException(
-                status_code=404,
-                detail="報告書が見つかりませんでした。",
-            ) from db_exc
-        logger.error(f"Database error updating report: {db_exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="報告書の更新中にエラーが発生しました。",
-        ) from db_exc
-    except Exception as exc:  # pragma: no cover - defensive
-        logger.error(f"Unexpected error updating report: {exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="報告書の更新中にエラーが発生しました。",
-        ) from exc
+    # Convert visit marks to dict format
+    visit_marks_data = None
+    if request.visit_marks is not None:
+        visit_marks_data = [mark.dict(exclude_none=True) for mark in request.visit_marks]
+    
+    # Update report
+    report_data = update_report(
+        report_id=report_id,
+        user_id=user_id,
+        disease_progress_text=request.disease_progress_text,
+        nursing_rehab_text=request.nursing_rehab_text,
+        family_situation_text=request.family_situation_text,
+        procedure_text=request.procedure_text,
+        monitoring_text=request.monitoring_text,
+        gaf_score=request.gaf_score,
+        gaf_date=request.gaf_date,
+        profession_text=request.profession_text,
+        report_date=request.report_date,
+        status=request.status,
+        visit_marks=visit_marks_data,
+    )
+    
+    # Convert to response format
+    return ReportResponse.from_row(report_data)
 
 
 @router.post(
@@ -413,10 +326,11 @@ async def update_report_endpoint(
     summary="Regenerate report marks",
     description="Re-run auto mark generation and optionally regenerate draft summaries.",
 )
-async def regenerate_report_endpoint(
+@translate_errors(REGENERATE_ERRORS)
+def regenerate_report_endpoint(
     report_id: str,
     request: ReportRegenerateRequest,
-    current_user: dict = Depends(get_current_user),
+    user_id: str = Depends(get_current_user_id),
 ) -> ReportResponse:
     """
     Regenerate visit marks for a report.
@@ -430,41 +344,14 @@ async def regenerate_report_endpoint(
     
     Returns the updated report.
     """
-    try:
-        report_data = regenerate_report_marks(
-            report_id=report_id,
-            user_id=current_user["user_id"],
-            force=request.force,
-        )
-        
-        # Convert to response format
-        return convert_report_to_response(report_data)
-        
-    except ReportServiceError as report_exc:
-        logger.error(f"Report service error regenerating: {report_exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="マークの再生成中にエラーが発生しました。",
-        ) from report_exc
-    except DatabaseServiceError as db_exc:
-        error_msg = str(db_exc)
-        if "not found" in error_msg.lower():
-            logger.warning(f"Report {report_id} not found for user {current_user['user_id']}")
-            raise HTTPException(
-                status_code=404,
-                detail="報告書が見つかりませんでした。",
-            ) from db_exc
-        logger.error(f"Database error regenerating report: {db_exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="マークの再生成中にエラーが発生しました。",
-        ) from db_exc
-    except Exception as exc:  # pragma: no cover - defensive
-        logger.error(f"Unexpected error regenerating report: {exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="マークの再生成中にエラーが発生しました。",
-        ) from exc
+    report_data = regenerate_report_marks(
+        report_id=report_id,
+        user_id=user_id,
+        force=request.force,
+    )
+    
+    # Convert to response format
+    return ReportResponse.from_row(report_data)
 
 
 @router.delete(
@@ -479,9 +366,10 @@ async def regenerate_report_endpoint(
     summary="Delete a report",
     description="Delete a report (精神科訪問看護報告書) and its associated visit marks.",
 )
-async def delete_report_endpoint(
+@translate_errors(REPORT_DELETE_ERRORS)
+def delete_report_endpoint(
     report_id: str,
-    current_user: dict = Depends(get_current_user),
+    user_id: str = Depends(get_current_user_id),
 ) -> dict:
     """
     Delete a report.
@@ -492,31 +380,17 @@ async def delete_report_endpoint(
     
     Returns success message.
     """
-    try:
-        delete_report(report_id=report_id, user_id=current_user["user_id"])
-        
-        logger.info(f"Successfully deleted report {report_id} for user {current_user['user_id']}")
-        return {"message": "報告書が削除されました。", "id": report_id}
-        
-    except DatabaseServiceError as db_exc:
-        error_msg = str(db_exc)
-        if "not found" in error_msg.lower():
-            logger.warning(f"Report {report_id} not found for user {current_user['user_id']}")
-            raise HTTPException(
-                status_code=404,
-                detail="報告書が見つかりませんでした。",
-            ) from db_exc
-        logger.error(f"Database error deleting report: {db_exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="報告書の削除中にエラーが発生しました。",
-        ) from db_exc
-    except Exception as exc:  # pragma: no cover - defensive
-        logger.error(f"Unexpected error deleting report: {exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="報告書の削除中にエラーが発生しました。",
-        ) from exc
+    delete_report(report_id=report_id, user_id=user_id)
+    
+    logger.info("Successfully deleted report %s for user %s", report_id, user_id)
+    return {"message": "報告書が削除されました。", "id": report_id}
+
+
+def _fetch_report_bundle(report_id: str, user_id: str) -> tuple[Dict[str, Any], Dict[str, Any]]:
+    """Fetch a report together with the patient it belongs to."""
+    report_data = get_report_by_id(report_id=report_id, user_id=user_id)
+    patient_data = get_patient_by_id(patient_id=report_data["patient_id"], user_id=user_id)
+    return report_data, patient_data
 
 
 @router.get(
@@ -531,9 +405,10 @@ async def delete_report_endpoint(
     summary="Generate report PDF",
     description="Generate 精神科訪問看護報告書 PDF for a report and return it directly.",
 )
+@translate_errors(REPORT_PDF_ERRORS)
 async def generate_report_pdf_endpoint(
     report_id: str,
-    current_user: dict = Depends(get_current_user),
+    user_id: str = Depends(get_current_user_id),
 ) -> Response:
     """
     Generate report PDF (精神科訪問看護報告書) for a specific report.
@@ -542,67 +417,26 @@ async def generate_report_pdf_endpoint(
     
     Returns the PDF file directly.
     """
-    try:
-        # Fetch report and patient data
-        report_data = get_report_by_id(report_id=report_id, user_id=current_user["user_id"])
-        patient_id = report_data["patient_id"]
-        patient_data = get_patient_by_id(patient_id=patient_id, user_id=current_user["user_id"])
-        
-        # Fetch org settings (optional)
-        org_settings = None
-        try:
-            from services.database_service import get_supabase_client
-            supabase = get_supabase_client()
-            org_response = (
-                supabase.table("org_settings")
-                .select("*")
-                .eq("user_id", current_user["user_id"])
-                .maybe_single()
-                .execute()
-            )
-            if org_response.data:
-                org_settings = org_response.data
-        except Exception:
-            # Org settings not found, use defaults
-            pass
-        
-        # Generate PDF
-        pdf_bytes = generate_report_pdf(report_data, patient_data, org_settings)
-        
-        logger.info(f"Successfully generated report PDF for report {report_id}")
-        
-        # Return PDF directly with appropriate headers
-        filename = f"report_{report_id}.pdf"
-        return Response(
-            content=pdf_bytes,
-            media_type="application/pdf",
-            headers={
-                "Content-Disposition": f"attachment; filename={filename}; filename*=UTF-8''{filename}"
-            }
-        )
-        
-    except DatabaseServiceError as db_exc:
-        error_msg = str(db_exc)
-        if "not found" in error_msg.lower():
-            logger.warning(f"Report {report_id} not found for user {current_user['user_id']}")
-            raise HTTPException(
-                status_code=404,
-                detail="報告書が見つかりませんでした。",
-            ) from db_exc
-        logger.error(f"Database error generating report PDF: {db_exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="PDF生成中にエラーが発生しました。",
-        ) from db_exc
-    except ReportPDFServiceError as pdf_exc:
-        logger.error(f"PDF service error generating report: {pdf_exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="PDF生成中にエラーが発生しました。",
-        ) from pdf_exc
-    except Exception as exc:  # pragma: no cover - defensive
-        logger.error(f"Unexpected error generating report PDF: {exc}")
-        raise HTTPException(
-            status_code=500,
-            detail="PDF生成中にエラーが発生しました。",
-        ) from exc
+    # Imported lazily so workers that never render PDFs skip WeasyPrint/Jinja2
+    from services.report_pdf_service import generate_report_pdf
+    
+    # Fetch the report/patient pair and org settings concurrently
+    (report_data, patient_data), org_settings = await asyncio.gather(
+        asyncio.to_thread(_fetch_report_bundle, report_id, user_id),
+        asyncio.to_thread(get_org_settings, user_id),
+    )
+    
+    # Generate PDF (CPU-bound WeasyPrint render)
+    pdf_bytes = await asyncio.to_thread(generate_report_pdf, report_data, patient_data, org_settings)
+    
+    logger.info("Successfully generated report PDF for report %s", report_id)
+    
+    # Return PDF directly with appropriate headers
+    filename = f"report_{report_id}.pdf"
+    return Response(
+        content=pdf_bytes,
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": content_disposition(filename)
+        }
+    )
@@ -8,6 +8,10 @@ Routes are organized by domain in separate router modules:
 - PDF generation routes
 - Patient CRUD routes
 - Care plan routes
+
+Endpoints that only call the synchronous Supabase client or PDF renderers are
+plain ``def`` so FastAPI runs them on its threadpool; ``async def`` endpoints
+push any blocking call through ``asyncio.to_thread``.
 """
 
 from fastapi import APIRouter
@@ -0,0 +1,73 @@
+"""Streaming responses for lists fetched from the database in batches."""
+
+import itertools
+import logging
+from typing import Any, Callable, Dict, Iterator
+
+from fastapi.responses import StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+Batch = list[Dict[str, Any]]
+
+
+def stream_batches(
+    batches: Iterator[Batch],
+    encode: Callable[[Batch], bytes],
+    media_type: str,
+    *,
+    what: str,
+    prefix: bytes = b"",
+    separator: bytes = b"",
+    suffix: bytes = b"",
+) -> StreamingResponse:
+    """
+    Stream row batches as one response body, encoding one batch at a time.
+
+    The first batch is fetched before the response is created, so a database
+    error on the initial query still propagates out of the endpoint (and is
+    translated to a 500) instead of cutting off an already started 200.
+
+    Args:
+        batches: Row batches, e.g. from an ``iter_*`` database service function.
+        encode: Turns a non-empty batch into its bytes in the body.
+        media_type: Response media type.
+        what: What is being streamed, for the error log.
+        prefix: Written before the first batch.
+        separator: Written between encoded batches.
+        suffix: Written after the last batch.
+
+    Returns:
+        StreamingResponse over the encoded batches.
+    """
+    first_batch = next(batches)
+    body = _encode_batches(
+        itertools.chain([first_batch], batches), encode, what, prefix, separator, suffix
+    )
+    return StreamingResponse(body, media_type=media_type)
+
+
+def _encode_batches(
+    batches: Iterator[Batch],
+    encode: Callable[[Batch], bytes],
+    what: str,
+    prefix: bytes,
+    separator: bytes,
+    suffix: bytes,
+) -> Iterator[bytes]:
+    """Yield prefix, the encoded non-empty batches and suffix."""
+    if prefix:
+        yield prefix
+    pending = b""
+    try:
+        for batch in batches:
+            if not batch:
+                continue
+            yield pending + encode(batch)
+            pending = separator
+    except Exception as exc:
+        # Headers are already sent; all we can do is cut the body short
+        logger.error("Error while streaming %s: %s", what, exc)
+        raise
+    if suffix:
+        yield suffix
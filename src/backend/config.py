@@ -1,6 +1,8 @@
 """Configuration management for NurseNote AI backend."""
 
 import os
+import sys
+from functools import cached_property
 from typing import List
 
 from dotenv import load_dotenv
@@ -16,18 +18,27 @@ class Settings:
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
     OPENAI_MODEL: str = os.getenv("OPENAI_MODEL", "gpt-4.1-mini")
 
+    # Worker threads for sync endpoints (FastAPI threadpool) and asyncio.to_thread
+    # offloads; the HTTP/S3 connection pools below default to the same size
+    THREADPOOL_SIZE: int = int(os.getenv("THREADPOOL_SIZE", "100"))
+
     # Supabase Configuration
     SUPABASE_PROJECT_URL: str = os.getenv("SUPABASE_PROJECT_URL", "")
     SUPABASE_JWT_SECRET: str = os.getenv("SUPABASE_JWT_SECRET", "")
     SUPABASE_SERVICE_ROLE_KEY: str = os.getenv("SUPABASE_SERVICE_ROLE_KEY", "")
+    # HTTP connection pool shared by all PostgREST/Storage calls (size it to the threadpool)
+    SUPABASE_HTTP_MAX_CONNECTIONS: int = int(os.getenv("SUPABASE_HTTP_MAX_CONNECTIONS", str(THREADPOOL_SIZE)))
+    SUPABASE_HTTP_MAX_KEEPALIVE: int = int(os.getenv("SUPABASE_HTTP_MAX_KEEPALIVE", "20"))
+    SUPABASE_HTTP_TIMEOUT_SECONDS: float = float(os.getenv("SUPABASE_HTTP_TIMEOUT_SECONDS", "120"))
 
     # CORS Configuration
     ALLOWED_ORIGINS_ENV: str = os.getenv("ALLOWED_ORIGINS", "")
-    DEFAULT_DEV_ORIGINS: List[str] = ["*"]
+    # Local Next.js dev server; a wildcard cannot be combined with credentials
+    DEFAULT_DEV_ORIGINS: List[str] = ["http://localhost:3000", "http://127.0.0.1:3000"]
 
-    @property
+    @cached_property
     def allowed_origins(self) -> List[str]:
-        """Parse and return allowed CORS origins."""
+        """Parse and return allowed CORS origins (parsed once per process)."""
         if self.ALLOWED_ORIGINS_ENV:
             return [
                 origin.strip()
@@ -45,6 +56,42 @@ class Settings:
     HOST: str = os.getenv("HOST", "0.0.0.0")
     PORT: int = int(os.getenv("PORT", "8000"))
     RELOAD: bool = os.getenv("RELOAD", "false").lower() == "true"
+    # Event loop / HTTP parser for uvicorn; uvloop is not available on Windows
+    SERVER_LOOP: str = os.getenv("SERVER_LOOP", "asyncio" if sys.platform == "win32" else "uvloop")
+    SERVER_HTTP: str = os.getenv("SERVER_HTTP", "httptools")
+    # Root log level for application loggers (uvicorn's own loggers are separate).
+    # INFO lines include user and patient ids, so they are opt-in.
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "WARNING").upper()
+    # Worker processes for `python main.py` (ignored with RELOAD). Caches are per
+    # process and only the worker handling a write invalidates its own copy, so
+    # more than one worker can serve stale data for up to the cache TTLs
+    WORKERS: int = int(os.getenv("WORKERS", "1"))
+    # Idle keep-alive; above the usual load balancer idle timeout so it closes first
+    SERVER_KEEP_ALIVE_SECONDS: int = int(os.getenv("SERVER_KEEP_ALIVE_SECONDS", "75"))
+
+    # Admission control for patient/care-plan writes (0 disables the limit)
+    WRITE_CONCURRENCY_LIMIT: int = int(os.getenv("WRITE_CONCURRENCY_LIMIT", "20"))
+    WRITE_QUEUE_TIMEOUT_SECONDS: float = float(os.getenv("WRITE_QUEUE_TIMEOUT_SECONDS", "5"))
+
+    # Processes rendering PDFs off the API worker (0 renders on the thread executor)
+    PDF_RENDER_PROCESSES: int = int(os.getenv("PDF_RENDER_PROCESSES", "2"))
+
+    # Response Compression Configuration
+    GZIP_MINIMUM_SIZE: int = int(os.getenv("GZIP_MINIMUM_SIZE", "1024"))  # bytes
+    GZIP_COMPRESS_LEVEL: int = int(os.getenv("GZIP_COMPRESS_LEVEL", "5"))  # 1 (fast) - 9 (small)
+
+    # Cache Configuration (seconds, per worker process; 0 disables)
+    # Patient caches default to off: the frontend still writes patients directly
+    # through Supabase, which bypasses the backend's cache invalidation
+    PATIENT_CACHE_TTL_SECONDS: int = int(os.getenv("PATIENT_CACHE_TTL_SECONDS", "0"))
+    PATIENT_LIST_CACHE_TTL_SECONDS: int = int(os.getenv("PATIENT_LIST_CACHE_TTL_SECONDS", "0"))
+    CARE_PLAN_LIST_CACHE_TTL_SECONDS: int = int(os.getenv("CARE_PLAN_LIST_CACHE_TTL_SECONDS", "30"))
+    SOAP_RECORDS_CACHE_TTL_SECONDS: int = int(os.getenv("SOAP_RECORDS_CACHE_TTL_SECONDS", "30"))
+    JWT_CACHE_TTL_SECONDS: int = int(os.getenv("JWT_CACHE_TTL_SECONDS", "300"))
+    AI_OUTPUT_CACHE_TTL_SECONDS: int = int(os.getenv("AI_OUTPUT_CACHE_TTL_SECONDS", "600"))
+
+    # Browser cache lifetime for GET responses (seconds; 0 always revalidates)
+    HTTP_CACHE_MAX_AGE_SECONDS: int = int(os.getenv("HTTP_CACHE_MAX_AGE_SECONDS", "30"))
 
     # AWS S3 Configuration
     AWS_ACCESS_KEY_ID: str = os.getenv("AWS_ACCESS_KEY_ID", "")
@@ -52,6 +99,8 @@ class Settings:
     AWS_REGION: str = os.getenv("AWS_REGION", "ap-northeast-1")
     AWS_S3_BUCKET_NAME: str = os.getenv("AWS_S3_BUCKET_NAME", "")
     AWS_S3_PRESIGNED_URL_EXPIRATION: int = int(os.getenv("AWS_S3_PRESIGNED_URL_EXPIRATION", "3600"))  # 1 hour default
+    # Size of the boto3 connection pool shared by the threads running S3 calls
+    AWS_S3_MAX_POOL_CONNECTIONS: int = int(os.getenv("AWS_S3_MAX_POOL_CONNECTIONS", str(THREADPOOL_SIZE)))
 
     def validate(self) -> None:
         """Validate required settings."""
@@ -1,22 +1,54 @@
 """FastAPI application for NurseNote AI backend."""
 
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 
+import anyio.to_thread
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 
+from api.exception_handlers import register_exception_handlers
 from api.routes import router
 from config import settings
+from middleware.admission import setup_admission_control
+from middleware.compression import setup_compression
 from middleware.cors import setup_cors
+from services.ai_service import close_ai_service, get_ai_service
+from services.database_service import close_supabase_client, get_supabase_client
+from services.pdf_worker import shutdown_pdf_pool
+from utils.log_queue import start_log_queue, stop_log_queue
+
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup and shutdown events."""
     # Startup
+    start_log_queue()
     settings.validate()
+    # Sync endpoints run on anyio's threadpool (40 threads by default) and the
+    # async ones offload through asyncio.to_thread (the loop's default
+    # executor); size both so blocking DB/S3 calls don't queue behind each other
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_SIZE
+    executor = ThreadPoolExecutor(max_workers=settings.THREADPOOL_SIZE, thread_name_prefix="offload")
+    asyncio.get_running_loop().set_default_executor(executor)
+    # Open the shared Supabase connection pool before the first request
+    try:
+        get_supabase_client()
+    except ValueError as exc:
+        logger.warning("Supabase client not initialized at startup: %s", exc)
+    # Create the shared OpenAI clients before the first /generate
+    get_ai_service()
     yield
-    # Shutdown (if needed in the future)
+    # Shutdown
+    close_supabase_client()
+    await close_ai_service()
+    shutdown_pdf_pool()
+    executor.shutdown(wait=False)
+    stop_log_queue()
 
 
 def create_app() -> FastAPI:
@@ -28,12 +60,17 @@ def create_app() -> FastAPI:
         lifespan=lifespan,
     )
 
-    # Setup middleware
+    # Setup middleware (added innermost first, so rejected writes still get CORS headers)
+    setup_admission_control(app)
     setup_cors(app)
+    setup_compression(app)
 
     # Include routers
     app.include_router(router)
 
+    # Request validation error handler
+    register_exception_handlers(app)
+
     # Global exception handler
     @app.exception_handler(Exception)
     async def global_exception_handler(request: Request, exc: Exception):
@@ -58,4 +95,8 @@ if __name__ == "__main__":
         host=settings.HOST,
         port=settings.PORT,
         reload=settings.RELOAD,
+        loop=settings.SERVER_LOOP,
+        http=settings.SERVER_HTTP,
+        workers=None if settings.RELOAD else settings.WORKERS,
+        timeout_keep_alive=settings.SERVER_KEEP_ALIVE_SECONDS,
     )
@@ -0,0 +1,75 @@
+"""Admission control for write endpoints."""
+
+import asyncio
+import logging
+import re
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# (method, full-path pattern) of the writes whose database work is heaviest
+WRITE_ROUTES = (
+    ("POST", re.compile(r"/patients(/bulk)?")),
+    ("PATCH", re.compile(r"/patients/[^/]+")),
+    ("POST", re.compile(r"/care-plans")),
+)
+OVERLOADED_DETAIL = "サーバーが混み合っています。しばらくしてから再度お試しください。"
+
+
+class AdmissionControlMiddleware:
+    """
+    Cap the number of write requests in flight and queue the rest.
+
+    Requests past the limit wait in FIFO order for a free slot. If none frees
+    up within queue_timeout seconds they get a 503 with Retry-After instead of
+    piling more work onto a saturated threadpool and database. Every other
+    request passes straight through.
+    """
+
+    def __init__(self, app: ASGIApp, limit: int, queue_timeout: float):
+        self.app = app
+        self.queue_timeout = queue_timeout
+        self._slots = asyncio.Semaphore(limit)
+
+    def _is_watched(self, scope: Scope) -> bool:
+        method = scope["method"]
+        path = scope["path"]
+        return any(method == m and pattern.fullmatch(path) for m, pattern in WRITE_ROUTES)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._is_watched(scope):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Rejected %s %s: no write slot within %ss", scope["method"], scope["path"], self.queue_timeout)
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": OVERLOADED_DETAIL},
+                headers={"Retry-After": str(max(1, round(self.queue_timeout)))},
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self._slots.release()
+
+
+def setup_admission_control(app: FastAPI) -> None:
+    """Limit concurrent patient/care-plan writes (disabled when the limit is 0)."""
+    if settings.WRITE_CONCURRENCY_LIMIT <= 0:
+        return
+    app.add_middleware(
+        AdmissionControlMiddleware,
+        limit=settings.WRITE_CONCURRENCY_LIMIT,
+        queue_timeout=settings.WRITE_QUEUE_TIMEOUT_SECONDS,
+    )
@@ -0,0 +1,21 @@
+"""Response compression middleware configuration."""
+
+from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.middleware.gzip import DEFAULT_EXCLUDED_CONTENT_TYPES
+
+from config import settings
+
+# PDFs are already deflate-compressed internally; gzipping them again costs CPU
+# and drops Content-Length for next to no size gain
+EXCLUDED_CONTENT_TYPES = DEFAULT_EXCLUDED_CONTENT_TYPES + ("application/pdf",)
+
+
+def setup_compression(app: FastAPI) -> None:
+    """Configure gzip compression for responses above the size threshold."""
+    app.add_middleware(
+        GZipMiddleware,
+        minimum_size=settings.GZIP_MINIMUM_SIZE,
+        compresslevel=settings.GZIP_COMPRESS_LEVEL,
+        exclude_content_types=EXCLUDED_CONTENT_TYPES,
+    )
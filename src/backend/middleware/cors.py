@@ -5,6 +5,11 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from config import settings
 
+# Methods the routers expose; preflight for anything else is rejected
+ALLOWED_METHODS = ["GET", "POST", "PATCH", "DELETE"]
+# Request headers the frontend sends (plus If-None-Match for ETag revalidation)
+ALLOWED_HEADERS = ["Authorization", "Content-Type", "If-None-Match", "ngrok-skip-browser-warning"]
+
 
 def setup_cors(app: FastAPI) -> None:
     """Configure CORS middleware for the FastAPI application."""
@@ -12,7 +17,7 @@ def setup_cors(app: FastAPI) -> None:
         CORSMiddleware,
         allow_origins=settings.allowed_origins,
         allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
+        allow_methods=ALLOWED_METHODS,
+        allow_headers=ALLOWED_HEADERS,
     )
 
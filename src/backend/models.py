@@ -1,17 +1,25 @@
-from pydantic import BaseModel, Field
+from datetime import date, time
+from typing import Annotated, Any
 
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field, field_validator, model_validator
 
-class PatientCreateRequest(BaseModel):
-    """Request body for creating a patient."""
+# Column types for building responses straight from database rows. uuid,
+# date, time and timestamptz columns need none: PostgREST already sends them
+# as ISO 8601 JSON strings, which plain str fields pass through in Rust.
+# Denormalized name columns may be NULL on rows created before the patients table existed
+RowNameStr = Annotated[str, BeforeValidator(lambda v: v or "")]
+# Required text/date columns sent as "" when the row has NULL
+RowStrOrEmpty = Annotated[str, BeforeValidator(lambda v: "" if v is None else str(v))]
+
+
+class PatientFieldsBase(BaseModel):
+    """Optional patient profile fields shared by the patient request and response models."""
 
-    name: str = Field(..., description="利用者名")
     age: int | None = Field(None, description="年齢")
     gender: str | None = Field(None, description="性別")
     primary_diagnosis: str | None = Field(None, description="主疾患")
     individual_notes: str | None = Field(None, description="個別メモ")
-    status: str = Field(default="active", description="ステータス (active/inactive/archived)")
     
-    # Additional patient information
     birth_date: str | None = Field(None, description="生年月日 (YYYY-MM-DD)")
     birth_date_year: int | None = Field(None, description="生年月日(年)")
     birth_date_month: int | None = Field(None, description="生年月日(月)")
@@ -60,125 +68,40 @@ class PatientCreateRequest(BaseModel):
     recorder_name: str | None = Field(None, description="記載者")
 
 
-class PatientUpdateRequest(BaseModel):
+class PatientCreateRequest(PatientFieldsBase):
+    """Request body for creating a patient."""
+
+    model_config = ConfigDict(frozen=True, extra="ignore", str_strip_whitespace=True)
+
+    name: str = Field(..., description="利用者名")
+    status: str = Field(default="active", description="ステータス (active/inactive/archived)")
+
+
+class PatientBulkCreateRequest(BaseModel):
+    """Request body for creating several patients at once."""
+
+    patients: list[PatientCreateRequest] = Field(..., min_length=1, max_length=2000, description="Patients to create")
+
+
+class PatientUpdateRequest(PatientFieldsBase):
     """Request body for updating a patient."""
 
+    model_config = ConfigDict(frozen=True, extra="ignore", str_strip_whitespace=True)
+
     name: str | None = Field(None, description="利用者名")
-    age: int | None = Field(None, description="年齢")
-    gender: str | None = Field(None, description="性別")
-    primary_diagnosis: str | None = Field(None, description="主疾患")
-    individual_notes: str | None = Field(None, description="個別メモ")
     status: str | None = Field(None, description="ステータス (active/inactive/archived)")
-    
-    # Additional patient information
-    birth_date: str | None = Field(None, description="生年月日 (YYYY-MM-DD)")
-    birth_date_year: int | None = Field(None, description="生年月日(年)")
-    birth_date_month: int | None = Field(None, description="生年月日(月)")
-    birth_date_day: int | None = Field(None, description="生年月日(日)")
-    address: str | None = Field(None, description="住所")
-    contact: str | None = Field(None, description="連絡先")
-    
-    # Key Person Information
-    key_person_name: str | None = Field(None, description="キーパーソン氏名")
-    key_person_relationship: str | None = Field(None, description="キーパーソン続柄")
-    key_person_address: str | None = Field(None, description="キーパーソン住所")
-    key_person_contact1: str | None = Field(None, description="キーパーソン連絡先1")
-    key_person_contact2: str | None = Field(None, description="キーパーソン連絡先2")
-    
-    # Medical Information
-    medical_history: str | None = Field(None, description="既往歴")
-    current_illness_history: str | None = Field(None, description="現病歴")
-    family_structure: str | None = Field(None, description="家族構成")
-    
-    # Primary Doctor Information
-    doctor_name: str | None = Field(None, description="主治医氏名")
-    hospital_name: str | None = Field(None, description="医療機関名")
-    hospital_address: str | None = Field(None, description="医療機関所在地")
-    hospital_phone: str | None = Field(None, description="医療機関電話番号")
-    
-    # Initial Visit Date
-    initial_visit_date: str | None = Field(None, description="初回訪問年月日 (YYYY-MM-DD)")
-    initial_visit_year: int | None = Field(None, description="初回訪問年")
-    initial_visit_month: int | None = Field(None, description="初回訪問月")
-    initial_visit_day: int | None = Field(None, description="初回訪問日")
-    initial_visit_day_of_week: str | None = Field(None, description="初回訪問曜日")
-    initial_visit_start_hour: int | None = Field(None, description="初回訪問開始時")
-    initial_visit_start_minute: int | None = Field(None, description="初回訪問開始分")
-    initial_visit_end_hour: int | None = Field(None, description="初回訪問終了時")
-    initial_visit_end_minute: int | None = Field(None, description="初回訪問終了分")
-    
-    # Daily Life Status
-    daily_life_meal_nutrition: str | None = Field(None, description="日常生活状況 - 食事・栄養")
-    daily_life_hygiene: str | None = Field(None, description="日常生活状況 - 清潔・整容")
-    daily_life_medication: str | None = Field(None, description="日常生活状況 - 服薬")
-    daily_life_sleep: str | None = Field(None, description="日常生活状況 - 睡眠")
-    daily_life_living_environment: str | None = Field(None, description="日常生活状況 - 生活環境")
-    daily_life_family_environment: str | None = Field(None, description="日常生活状況 - 家族環境")
-    
-    # Recorder Information
-    recorder_name: str | None = Field(None, description="記載者")
 
 
-class PatientResponse(BaseModel):
+class PatientResponse(PatientFieldsBase):
     """Response model for a patient."""
 
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     id: str = Field(..., description="Patient ID")
     name: str = Field(..., description="利用者名")
-    age: int | None = Field(None, description="年齢")
-    gender: str | None = Field(None, description="性別")
-    primary_diagnosis: str | None = Field(None, description="主疾患")
-    individual_notes: str | None = Field(None, description="個別メモ")
     status: str = Field(..., description="ステータス")
     created_at: str = Field(..., description="作成日時")
     updated_at: str = Field(..., description="更新日時")
-    
-    # Additional patient information
-    birth_date: str | None = Field(None, description="生年月日")
-    birth_date_year: int | None = Field(None, description="生年月日(年)")
-    birth_date_month: int | None = Field(None, description="生年月日(月)")
-    birth_date_day: int | None = Field(None, description="生年月日(日)")
-    address: str | None = Field(None, description="住所")
-    contact: str | None = Field(None, description="連絡先")
-    
-    # Key Person Information
-    key_person_name: str | None = Field(None, description="キーパーソン氏名")
-    key_person_relationship: str | None = Field(None, description="キーパーソン続柄")
-    key_person_address: str | None = Field(None, description="キーパーソン住所")
-    key_person_contact1: str | None = Field(None, description="キーパーソン連絡先1")
-    key_person_contact2: str | None = Field(None, description="キーパーソン連絡先2")
-    
-    # Medical Information
-    medical_history: str | None = Field(None, description="既往歴")
-    current_illness_history: str | None = Field(None, description="現病歴")
-    family_structure: str | None = Field(None, description="家族構成")
-    
-    # Primary Doctor Information
-    doctor_name: str | None = Field(None, description="主治医氏名")
-    hospital_name: str | None = Field(None, description="医療機関名")
-    hospital_address: str | None = Field(None, description="医療機関所在地")
-    hospital_phone: str | None = Field(None, description="医療機関電話番号")
-    
-    # Initial Visit Date
-    initial_visit_date: str | None = Field(None, description="初回訪問年月日")
-    initial_visit_year: int | None = Field(None, description="初回訪問年")
-    initial_visit_month: int | None = Field(None, description="初回訪問月")
-    initial_visit_day: int | None = Field(None, description="初回訪問日")
-    initial_visit_day_of_week: str | None = Field(None, description="初回訪問曜日")
-    initial_visit_start_hour: int | None = Field(None, description="初回訪問開始時")
-    initial_visit_start_minute: int | None = Field(None, description="初回訪問開始分")
-    initial_visit_end_hour: int | None = Field(None, description="初回訪問終了時")
-    initial_visit_end_minute: int | None = Field(None, description="初回訪問終了分")
-    
-    # Daily Life Status
-    daily_life_meal_nutrition: str | None = Field(None, description="日常生活状況 - 食事・栄養")
-    daily_life_hygiene: str | None = Field(None, description="日常生活状況 - 清潔・整容")
-    daily_life_medication: str | None = Field(None, description="日常生活状況 - 服薬")
-    daily_life_sleep: str | None = Field(None, description="日常生活状況 - 睡眠")
-    daily_life_living_environment: str | None = Field(None, description="日常生活状況 - 生活環境")
-    daily_life_family_environment: str | None = Field(None, description="日常生活状況 - 家族環境")
-    
-    # Recorder Information
-    recorder_name: str | None = Field(None, description="記載者")
 
 
 class PatientsListResponse(BaseModel):
@@ -218,9 +141,25 @@ class CarePlansListResponse(BaseModel):
     care_plans: list[CarePlanResponse] = Field(..., description="List of care plans")
 
 
+class CarePlansBatchRequest(BaseModel):
+    """Request body for fetching the care plans of several patients."""
+
+    patient_ids: list[str] = Field(..., min_length=1, max_length=100, description="Patient IDs")
+    status: str | None = Field(None, description="Filter by status (active/inactive/completed)")
+
+
+class CarePlansBatchResponse(BaseModel):
+    """Response model for care plans grouped by patient."""
+
+    care_plans: dict[str, list[CarePlanResponse]] = Field(..., description="Care plans keyed by patient ID")
+
+
 class GenerateRequest(BaseModel):
     """Request body for /generate."""
 
+    # Text fields arrive stripped, so the handler uses them as-is
+    model_config = ConfigDict(str_strip_whitespace=True)
+
     patient_id: str | None = Field(
         None,
         description="Patient ID (優先。指定時はuserName/diagnosisは無視)",
@@ -237,16 +176,16 @@ class GenerateRequest(BaseModel):
         default_factory=list,
         description="看護師名（複数選択可）",
     )
-    visitDate: str = Field(
-        default="",
+    visitDate: date | None = Field(
+        default=None,
         description="訪問日（YYYY-MM-DD形式）",
     )
-    startTime: str = Field(
-        default="",
+    startTime: time | None = Field(
+        default=None,
         description="訪問開始時間（HH:MM形式）",
     )
-    endTime: str = Field(
-        default="",
+    endTime: time | None = Field(
+        default=None,
         description="訪問終了時間（HH:MM形式）",
     )
     chiefComplaint: str = Field(
@@ -262,6 +201,34 @@ class GenerateRequest(BaseModel):
         description="O（客観）",
     )
 
+    @field_validator("visitDate", "startTime", "endTime", mode="before")
+    @classmethod
+    def blank_to_none(cls, value: Any) -> Any:
+        """Treat blank date/time strings as missing so the required-field check reports them."""
+        if isinstance(value, str):
+            return value.strip() or None
+        return value
+
+    @model_validator(mode="after")
+    def check_required_fields(self) -> "GenerateRequest":
+        """Check every required field in one pass and report all problems together."""
+        errors = []
+        if not self.patient_id:
+            # Backward compatibility: userName and diagnosis are required without patient_id
+            if not self.userName:
+                errors.append("利用者名は必須です（patient_idが指定されていない場合）。")
+            if not self.diagnosis:
+                errors.append("主疾患は必須です（patient_idが指定されていない場合）。")
+        if self.visitDate is None:
+            errors.append("訪問日は必須です。")
+        if self.startTime is None or self.endTime is None:
+            errors.append("訪問時間（開始・終了）は必須です。")
+        if not self.sText and not self.oText:
+            errors.append("SまたはOのいずれか一方は必須です。")
+        if errors:
+            raise ValueError(" ".join(errors))
+        return self
+
 
 class GenerateResponse(BaseModel):
     """Successful response body."""
@@ -280,7 +247,7 @@ class SOAPRecordResponse(BaseModel):
 
     id: str = Field(..., description="Record ID")
     patient_id: str | None = Field(None, description="Patient ID")
-    patient_name: str = Field(..., description="利用者名")
+    patient_name: RowNameStr = Field("", description="利用者名")
     visit_date: str = Field(..., description="訪問日 (YYYY-MM-DD)")
     chief_complaint: str | None = Field(None, description="主訴")
     created_at: str = Field(..., description="作成日時")
@@ -306,18 +273,23 @@ class FullSOAPRecordResponse(BaseModel):
 
     id: str = Field(..., description="Record ID")
     patient_id: str | None = Field(None, description="Patient ID")
-    patient_name: str = Field(..., description="利用者名")
+    patient_name: RowNameStr = Field("", description="利用者名")
     visit_date: str = Field(..., description="訪問日 (YYYY-MM-DD)")
     chief_complaint: str | None = Field(None, description="主訴")
     created_at: str = Field(..., description="作成日時")
     diagnosis: str | None = Field(None, description="主疾患")
     start_time: str | None = Field(None, description="訪問開始時間")
     end_time: str | None = Field(None, description="訪問終了時間")
-    nurses: list[str] = Field(default_factory=list, description="看護師名リスト")
-    soap_output: dict = Field(..., description="SOAP出力データ (JSON)")
+    nurses: Annotated[list[str], BeforeValidator(lambda v: v or [])] = Field(default_factory=list, description="看護師名リスト")
+    soap_output: Annotated[dict, BeforeValidator(lambda v: v or {})] = Field(..., description="SOAP出力データ (JSON)")
     plan_output: dict | None = Field(None, description="看護計画出力データ (JSON)")
     status: str = Field(default="draft", description="記録ステータス (draft/confirmed)")
 
+    @classmethod
+    def from_row(cls, row: dict[str, Any]) -> "FullSOAPRecordResponse":
+        """Build the response from a soap_records row; extra columns are ignored."""
+        return cls.model_validate(row)
+
 
 class PDFGenerationResponse(BaseModel):
     """Response model for PDF generation endpoints."""
@@ -410,13 +382,13 @@ class PlanItemResponse(BaseModel):
 
     id: str = Field(..., description="Plan item ID")
     plan_id: str = Field(..., description="Plan ID")
-    item_key: str = Field(..., description="Item key")
-    label: str = Field(..., description="Display label")
+    item_key: str = Field("", description="Item key")
+    label: str = Field("", description="Display label")
     observation_text: str | None = Field(None, description="必要な観察項目")
     assistance_text: str | None = Field(None, description="援助内容")
-    sort_order: int = Field(..., description="Sort order")
-    created_at: str = Field(..., description="Created at")
-    updated_at: str = Field(..., description="Updated at")
+    sort_order: int = Field(0, description="Sort order")
+    created_at: RowStrOrEmpty = Field("", description="Created at")
+    updated_at: RowStrOrEmpty = Field("", description="Updated at")
 
 
 class PlanEvaluationResponse(BaseModel):
@@ -424,14 +396,14 @@ class PlanEvaluationResponse(BaseModel):
 
     id: str = Field(..., description="Evaluation ID")
     plan_id: str = Field(..., description="Plan ID")
-    evaluation_slot: int = Field(..., description="Evaluation slot number")
-    evaluation_date: str = Field(..., description="Evaluation date (YYYY-MM-DD)")
-    result: str = Field(..., description="Result: CIRCLE, CHECK, or NONE")
+    evaluation_slot: int = Field(0, description="Evaluation slot number")
+    evaluation_date: RowStrOrEmpty = Field("", description="Evaluation date (YYYY-MM-DD)")
+    result: str = Field("NONE", description="Result: CIRCLE, CHECK, or NONE")
     note: str | None = Field(None, description="Evaluation note")
     decided_by: str | None = Field(None, description="How result was decided: AUTO or MANUAL")
     source_soap_record_id: str | None = Field(None, description="Source SOAP record ID")
-    created_at: str = Field(..., description="Created at")
-    updated_at: str = Field(..., description="Updated at")
+    created_at: RowStrOrEmpty = Field("", description="Created at")
+    updated_at: RowStrOrEmpty = Field("", description="Updated at")
 
 
 class PlanHospitalizationResponse(BaseModel):
@@ -439,9 +411,9 @@ class PlanHospitalizationResponse(BaseModel):
 
     id: str = Field(..., description="Hospitalization ID")
     plan_id: str = Field(..., description="Plan ID")
-    hospitalized_at: str = Field(..., description="Hospitalization date (YYYY-MM-DD)")
+    hospitalized_at: RowStrOrEmpty = Field("", description="Hospitalization date (YYYY-MM-DD)")
     note: str | None = Field(None, description="Hospitalization note")
-    created_at: str = Field(..., description="Created at")
+    created_at: RowStrOrEmpty = Field("", description="Created at")
 
 
 class PlanResponse(BaseModel):
@@ -449,27 +421,32 @@ class PlanResponse(BaseModel):
 
     id: str = Field(..., description="Plan ID")
     patient_id: str = Field(..., description="Patient ID")
-    title: str = Field(..., description="Plan title")
-    start_date: str = Field(..., description="Start date (YYYY-MM-DD)")
-    end_date: str = Field(..., description="End date (YYYY-MM-DD)")
+    title: str = Field("精神科訪問看護計画書", description="Plan title")
+    start_date: RowStrOrEmpty = Field("", description="Start date (YYYY-MM-DD)")
+    end_date: RowStrOrEmpty = Field("", description="End date (YYYY-MM-DD)")
     long_term_goal: str | None = Field(None, description="看護の目標")
     short_term_goal: str | None = Field(None, description="短期目標")
     nursing_policy: str | None = Field(None, description="看護援助の方針")
     patient_family_wish: str | None = Field(None, description="患者様とご家族の希望")
-    has_procedure: bool = Field(..., description="衛生材料等を要する処置の有無")
+    has_procedure: bool = Field(False, description="衛生材料等を要する処置の有無")
     procedure_content: str | None = Field(None, description="処置内容")
     material_details: str | None = Field(None, description="衛生材料（種類・サイズ）等")
     material_amount: str | None = Field(None, description="必要量")
     procedure_note: str | None = Field(None, description="備考")
-    status: str = Field(..., description="Status: ACTIVE, ENDED_BY_HOSPITALIZATION, CLOSED")
-    closed_at: str | None = Field(None, description="Closed at")
+    status: str = Field("ACTIVE", description="Status: ACTIVE, ENDED_BY_HOSPITALIZATION, CLOSED")
+    closed_at: Annotated[str | None, BeforeValidator(lambda v: str(v) if v else None)] = Field(None, description="Closed at")
     closed_reason: str | None = Field(None, description="Closed reason")
-    created_at: str = Field(..., description="Created at")
-    updated_at: str = Field(..., description="Updated at")
+    created_at: RowStrOrEmpty = Field("", description="Created at")
+    updated_at: RowStrOrEmpty = Field("", description="Updated at")
     items: list[PlanItemResponse] = Field(default_factory=list, description="Plan items")
     evaluations: list[PlanEvaluationResponse] = Field(default_factory=list, description="Plan evaluations")
     hospitalizations: list[PlanHospitalizationResponse] = Field(default_factory=list, description="Hospitalizations")
 
+    @classmethod
+    def from_row(cls, row: dict[str, Any]) -> "PlanResponse":
+        """Build the response from a plan row with its nested child rows; extra columns are ignored."""
+        return cls.model_validate(row)
+
 
 class PlansListResponse(BaseModel):
     """Response model for list of plans."""
@@ -523,10 +500,10 @@ class ReportVisitMarkResponse(BaseModel):
 
     id: str = Field(..., description="Visit mark ID")
     report_id: str = Field(..., description="Report ID")
-    visit_date: str = Field(..., description="Visit date (YYYY-MM-DD)")
-    mark: str = Field(..., description="Mark type")
-    created_at: str = Field(..., description="Created at")
-    updated_at: str = Field(..., description="Updated at")
+    visit_date: RowStrOrEmpty = Field("", description="Visit date (YYYY-MM-DD)")
+    mark: str = Field("", description="Mark type")
+    created_at: RowStrOrEmpty = Field("", description="Created at")
+    updated_at: RowStrOrEmpty = Field("", description="Updated at")
 
 
 class ReportResponse(BaseModel):
@@ -534,9 +511,9 @@ class ReportResponse(BaseModel):
 
     id: str = Field(..., description="Report ID")
     patient_id: str = Field(..., description="Patient ID")
-    year_month: str = Field(..., description="Year-month (YYYY-MM)")
-    period_start: str = Field(..., description="Period start date")
-    period_end: str = Field(..., description="Period end date")
+    year_month: str = Field("", description="Year-month (YYYY-MM)")
+    period_start: RowStrOrEmpty = Field("", description="Period start date")
+    period_end: RowStrOrEmpty = Field("", description="Period end date")
     disease_progress_text: str | None = Field(None, description="病状の経過")
     nursing_rehab_text: str | None = Field(None, description="看護・リハビリテーションの内容")
     family_situation_text: str | None = Field(None, description="家庭状況")
@@ -544,13 +521,18 @@ class ReportResponse(BaseModel):
     monitoring_text: str | None = Field(None, description="特記すべき事項及びモニタリング")
     gaf_score: int | None = Field(None, description="GAF score")
     gaf_date: str | None = Field(None, description="GAF date")
-    profession_text: str = Field(..., description="訪問した職種")
-    report_date: str = Field(..., description="Report date")
-    status: str = Field(..., description="Status: DRAFT or FINAL")
-    created_at: str = Field(..., description="Created at")
-    updated_at: str = Field(..., description="Updated at")
+    profession_text: str = Field("訪問した職種：看護師", description="訪問した職種")
+    report_date: RowStrOrEmpty = Field("", description="Report date")
+    status: str = Field("DRAFT", description="Status: DRAFT or FINAL")
+    created_at: RowStrOrEmpty = Field("", description="Created at")
+    updated_at: RowStrOrEmpty = Field("", description="Updated at")
     visit_marks: list[ReportVisitMarkResponse] = Field(default_factory=list, description="Visit marks")
 
+    @classmethod
+    def from_row(cls, row: dict[str, Any]) -> "ReportResponse":
+        """Build the response from a report row with its visit marks; extra columns are ignored."""
+        return cls.model_validate(row)
+
 
 class ReportsListResponse(BaseModel):
     """Response model for list of reports."""
@@ -1,12 +1,21 @@
 """AI service layer for generating SOAP notes via OpenAI."""
 
-from typing import Optional
+import hashlib
+import threading
+from typing import AsyncIterator, Optional
 
-from openai import OpenAI, OpenAIError
+from openai import AsyncOpenAI, OpenAI, OpenAIError
 
 from config import settings
+from utils.cache import TTLCache
 from utils.exceptions import AIServiceError, ConfigurationError
 
+# Generated text keyed by a digest of (model, instructions, prompt), so a
+# retried or double-submitted generation with the exact same input does not
+# call the model again. Only exact matches are reused: a note generated for
+# one visit must never be served for a merely similar one.
+_output_cache = TTLCache(ttl=settings.AI_OUTPUT_CACHE_TTL_SECONDS, maxsize=256)
+
 
 class AIService:
     """Thin wrapper around the OpenAI Responses API."""
@@ -27,14 +36,25 @@ class AIService:
             raise ConfigurationError("OPENAI_API_KEY is not configured.")
 
         self.client = OpenAI(api_key=api_key)
+        self.async_client = AsyncOpenAI(api_key=api_key)
         self.model = model or settings.OPENAI_MODEL
 
-    def generate_output(self, prompt: str) -> str:
+    def _cache_key(self, prompt: str, instructions: Optional[str]) -> bytes:
+        """Digest of everything that determines the generated text."""
+        digest = hashlib.blake2b(digest_size=16)
+        for part in (self.model, instructions or "", prompt):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x1f")
+        return digest.digest()
+
+    def generate_output(self, prompt: str, instructions: Optional[str] = None) -> str:
         """
         Send prompt to OpenAI and return the generated text.
 
         Args:
             prompt: The prompt text to send to OpenAI.
+            instructions: Static system instructions sent ahead of the prompt;
+                keeping them identical across calls lets OpenAI cache them.
 
         Returns:
             The generated text output.
@@ -45,9 +65,15 @@ class AIService:
         if not prompt or not prompt.strip():
             raise AIServiceError("Prompt cannot be empty.")
 
+        cache_key = self._cache_key(prompt, instructions)
+        cached = _output_cache.get(cache_key)
+        if cached is not None:
+            return cached.strip()
+
         try:
             response = self.client.responses.create(
                 model=self.model,
+                instructions=instructions,
                 input=prompt,
                 temperature=0.3,
                 max_output_tokens=3000,  # Increased for comprehensive SOAP + care plan output
@@ -56,6 +82,7 @@ class AIService:
             output_text = response.output_text if hasattr(response, "output_text") else None
             if not output_text:
                 raise AIServiceError("Empty response from OpenAI API.")
+            _output_cache.set(cache_key, output_text)
             return output_text.strip()
 
         except OpenAIError as exc:
@@ -63,14 +90,85 @@ class AIService:
         except Exception as exc:  # pragma: no cover - defensive
             raise AIServiceError(f"Unexpected error during AI generation: {exc}") from exc
 
+    async def stream_output(self, prompt: str, instructions: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Send prompt to OpenAI and yield the generated text as it arrives.
+
+        Args:
+            prompt: The prompt text to send to OpenAI.
+            instructions: Static system instructions sent ahead of the prompt;
+                keeping them identical across calls lets OpenAI cache them.
+
+        Yields:
+            Text deltas in generation order.
+
+        Raises:
+            AIServiceError: If the API call fails or the stream reports an error.
+        """
+        if not prompt or not prompt.strip():
+            raise AIServiceError("Prompt cannot be empty.")
+
+        cache_key = self._cache_key(prompt, instructions)
+        cached = _output_cache.get(cache_key)
+        if cached is not None:
+            yield cached
+            return
+
+        parts: list[str] = []
+        try:
+            stream = await self.async_client.responses.create(
+                model=self.model,
+                instructions=instructions,
+                input=prompt,
+                temperature=0.3,
+                max_output_tokens=3000,
+                stream=True,
+            )
+            async for event in stream:
+                if event.type == "response.output_text.delta":
+                    parts.append(event.delta)
+                    yield event.delta
+                elif event.type in ("error", "response.failed"):
+                    raise AIServiceError(f"OpenAI stream error: {event}")
+
+        except AIServiceError:
+            raise
+        except OpenAIError as exc:
+            raise AIServiceError(f"OpenAI API error: {exc}") from exc
+        except Exception as exc:  # pragma: no cover - defensive
+            raise AIServiceError(f"Unexpected error during AI generation: {exc}") from exc
+
+        # Only reached when the stream ran to completion without errors
+        if parts:
+            _output_cache.set(cache_key, "".join(parts))
+
 
 _ai_service: Optional[AIService] = None
+_ai_service_lock = threading.Lock()
 
 
 def get_ai_service() -> AIService:
-    """Return singleton AI service instance."""
+    """
+    Return singleton AI service instance (thread-safe).
+
+    Its OpenAI clients keep their HTTPS connection pools for the life of the
+    process, so requests after the first reuse open connections.
+    """
     global _ai_service
     if _ai_service is None:
-        _ai_service = AIService()
+        with _ai_service_lock:
+            if _ai_service is None:
+                _ai_service = AIService()
     return _ai_service
 
+
+async def close_ai_service() -> None:
+    """Close the OpenAI clients' connection pools; called on application shutdown."""
+    global _ai_service
+
+    with _ai_service_lock:
+        service, _ai_service = _ai_service, None
+    if service is not None:
+        service.client.close()
+        await service.async_client.close()
+
@@ -6,16 +6,23 @@ This module provides database operations organized into service classes:
 - CarePlanService: Care plan operations
 - SOAPRecordService: SOAP record operations
 - PlanService: Plan operations
+- ReportService: Report operations
+- OrgSettingsService: Organization settings lookups
 
 All functions maintain backward compatibility as module-level wrappers.
 """
 
+import dataclasses
 import logging
-from typing import Any, Dict, Optional
+import threading
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, Mapping, Optional
 
-from supabase import create_client, Client
+import httpx
+from supabase import Client, ClientOptions, create_client
 
 from config import settings
+from utils.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -23,8 +30,10 @@ logger = logging.getLogger(__name__)
 # Client Management
 # ============================================================================
 
-# Global Supabase client instance
+# Global Supabase client instance and the pooled HTTP client it sends requests through
 _supabase_client: Optional[Client] = None
+_http_client: Optional[httpx.Client] = None
+_supabase_client_lock = threading.Lock()
 
 
 def get_supabase_client() -> Client:
@@ -37,23 +46,51 @@ def get_supabase_client() -> Client:
     Raises:
         ValueError: If Supabase configuration is missing.
     """
-    global _supabase_client
+    global _supabase_client, _http_client
     
-    if _supabase_client is None:
-        if not settings.SUPABASE_PROJECT_URL:
-            raise ValueError("SUPABASE_PROJECT_URL environment variable is required.")
-        if not settings.SUPABASE_SERVICE_ROLE_KEY:
-            raise ValueError("SUPABASE_SERVICE_ROLE_KEY environment variable is required.")
-        
-        _supabase_client = create_client(
-            settings.SUPABASE_PROJECT_URL,
-            settings.SUPABASE_SERVICE_ROLE_KEY
-        )
-        logger.info("Supabase client initialized")
+    if _supabase_client is not None:
+        return _supabase_client
+    
+    # Worker threads may race here on the first requests; build one pool only
+    with _supabase_client_lock:
+        if _supabase_client is None:
+            if not settings.SUPABASE_PROJECT_URL:
+                raise ValueError("SUPABASE_PROJECT_URL environment variable is required.")
+            if not settings.SUPABASE_SERVICE_ROLE_KEY:
+                raise ValueError("SUPABASE_SERVICE_ROLE_KEY environment variable is required.")
+            
+            # One pooled HTTP/2 client for every request, so worker threads reuse
+            # warm keep-alive connections to PostgREST instead of reconnecting
+            _http_client = httpx.Client(
+                http2=True,
+                follow_redirects=True,
+                timeout=settings.SUPABASE_HTTP_TIMEOUT_SECONDS,
+                limits=httpx.Limits(
+                    max_connections=settings.SUPABASE_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.SUPABASE_HTTP_MAX_KEEPALIVE,
+                ),
+            )
+            _supabase_client = create_client(
+                settings.SUPABASE_PROJECT_URL,
+                settings.SUPABASE_SERVICE_ROLE_KEY,
+                options=ClientOptions(httpx_client=_http_client),
+            )
+            logger.info("Supabase client initialized")
     
     return _supabase_client
 
 
+def close_supabase_client() -> None:
+    """Close the shared HTTP connection pool; called on application shutdown."""
+    global _supabase_client, _http_client
+    
+    with _supabase_client_lock:
+        if _http_client is not None:
+            _http_client.close()
+        _supabase_client = None
+        _http_client = None
+
+
 # ============================================================================
 # Exceptions
 # ============================================================================
@@ -63,6 +100,50 @@ class DatabaseServiceError(Exception):
     pass
 
 
+class NotFoundError(DatabaseServiceError):
+    """Raised when the requested row does not exist for the user."""
+
+    def __init__(self, message: str, resource: str = "record"):
+        super().__init__(message)
+        self.resource = resource
+
+
+class InvalidStatusError(DatabaseServiceError):
+    """Raised when a status value is not one the table accepts."""
+    pass
+
+
+class AlreadyExistsError(DatabaseServiceError):
+    """Raised when a row the user tried to create already exists."""
+    pass
+
+
+# ============================================================================
+# Query Filters
+# ============================================================================
+
+@dataclasses.dataclass(frozen=True)
+class RecordFilters:
+    """Optional filters for SOAP record list queries.
+
+    Each field carries the PostgREST operator it maps to, so ``apply`` only
+    touches the filters that are actually set.
+    """
+
+    date_from: Optional[str] = dataclasses.field(default=None, metadata={"apply": lambda q, v: q.gte("visit_date", v)})
+    date_to: Optional[str] = dataclasses.field(default=None, metadata={"apply": lambda q, v: q.lte("visit_date", v)})
+    nurse_name: Optional[str] = dataclasses.field(default=None, metadata={"apply": lambda q, v: q.contains("nurses", [v])})
+    patient_id: Optional[str] = dataclasses.field(default=None, metadata={"apply": lambda q, v: q.eq("patient_id", v)})
+
+    def apply(self, query):
+        """Apply every set filter to a Supabase query builder."""
+        for f in dataclasses.fields(self):
+            value = getattr(self, f.name)
+            if value:
+                query = f.metadata["apply"](query, value)
+        return query
+
+
 # ============================================================================
 # Base Database Service
 # ============================================================================
@@ -70,6 +151,9 @@ class DatabaseServiceError(Exception):
 class BaseDatabaseService:
     """Base class for database services with common functionality."""
     
+    # Resource name reported on NotFoundError
+    resource: str = "record"
+    
     def __init__(self):
         """Initialize the database service."""
         self._client: Optional[Client] = None
@@ -81,9 +165,18 @@ class BaseDatabaseService:
             self._client = get_supabase_client()
         return self._client
     
+    def _not_found(self, message: str) -> NotFoundError:
+        """Build a NotFoundError tagged with this service's resource name."""
+        return NotFoundError(message, resource=self.resource)
+    
     def _handle_error(self, operation: str, error: Exception) -> None:
         """Handle database errors consistently."""
-        logger.error(f"Error {operation}: {error}")
+        if isinstance(error, (NotFoundError, InvalidStatusError, AlreadyExistsError)):
+            raise error
+        if getattr(error, "code", None) == "PGRST116":
+            # .single() matched no rows
+            raise self._not_found(f"Failed to {operation}: {self.resource} not found") from error
+        logger.error("Error %s: %s", operation, error)
         raise DatabaseServiceError(f"Failed to {operation}: {str(error)}") from error
 
 
@@ -91,11 +184,37 @@ class BaseDatabaseService:
 # Patient Service
 # ============================================================================
 
+# Read-through caches for patient lookups, keyed by user. Writes through
+# PatientService invalidate the affected entries in this process; writes made
+# directly in Supabase do not, which is why both are disabled by default.
+_patient_cache = TTLCache(ttl=settings.PATIENT_CACHE_TTL_SECONDS)
+_patient_list_cache = TTLCache(ttl=settings.PATIENT_LIST_CACHE_TTL_SECONDS)
+
+
+def _read_only_rows(rows: list[Dict[str, Any]]) -> tuple[Mapping[str, Any], ...]:
+    """
+    Wrap list rows read-only so cached lists can be handed out without per-row copies.
+
+    List callers only read (validate/serialize) the rows; any attempt to mutate
+    one raises TypeError instead of silently corrupting the cache.
+    """
+    return tuple(MappingProxyType(row) for row in rows)
+
+
+def _invalidate_patient_cache(user_id: str, patient_id: Optional[str] = None) -> None:
+    """Drop cached patient lookups for a user after a write."""
+    if patient_id is not None:
+        _patient_cache.invalidate((user_id, patient_id))
+    _patient_list_cache.invalidate_where(lambda key: key[0] == user_id)
+
+
 class PatientService(BaseDatabaseService):
     """Service for patient CRUD operations."""
     
-    def create(
-        self,
+    resource = "patient"
+    
+    @staticmethod
+    def _build_row(
         user_id: str,
         name: str,
         age: Optional[int] = None,
@@ -138,86 +257,127 @@ class PatientService(BaseDatabaseService):
         daily_life_family_environment: Optional[str] = None,
         recorder_name: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Create a new patient record."""
+        """Build the patients row to insert from the create fields."""
+        patient_data = {
+            "user_id": user_id,
+            "name": name.strip(),
+            "status": status,
+        }
+        
+        # Basic fields
+        if age is not None:
+            patient_data["age"] = age
+        if gender:
+            patient_data["gender"] = gender.strip()
+        if primary_diagnosis:
+            patient_data["primary_diagnosis"] = primary_diagnosis.strip()
+        if individual_notes:
+            patient_data["individual_notes"] = individual_notes.strip()
+        
+        # Additional patient information
+        optional_fields = {
+            "birth_date": birth_date,
+            "birth_date_year": birth_date_year,
+            "birth_date_month": birth_date_month,
+            "birth_date_day": birth_date_day,
+            "address": address,
+            "contact": contact,
+            "key_person_name": key_person_name,
+            "key_person_relationship": key_person_relationship,
+            "key_person_address": key_person_address,
+            "key_person_contact1": key_person_contact1,
+            "key_person_contact2": key_person_contact2,
+            "medical_history": medical_history,
+            "current_illness_history": current_illness_history,
+            "family_structure": family_structure,
+            "doctor_name": doctor_name,
+            "hospital_name": hospital_name,
+            "hospital_address": hospital_address,
+            "hospital_phone": hospital_phone,
+            "initial_visit_date": initial_visit_date,
+            "initial_visit_year": initial_visit_year,
+            "initial_visit_month": initial_visit_month,
+            "initial_visit_day": initial_visit_day,
+            "initial_visit_day_of_week": initial_visit_day_of_week,
+            "initial_visit_start_hour": initial_visit_start_hour,
+            "initial_visit_start_minute": initial_visit_start_minute,
+            "initial_visit_end_hour": initial_visit_end_hour,
+            "initial_visit_end_minute": initial_visit_end_minute,
+            "daily_life_meal_nutrition": daily_life_meal_nutrition,
+            "daily_life_hygiene": daily_life_hygiene,
+            "daily_life_medication": daily_life_medication,
+            "daily_life_sleep": daily_life_sleep,
+            "daily_life_living_environment": daily_life_living_environment,
+            "daily_life_family_environment": daily_life_family_environment,
+            "recorder_name": recorder_name,
+        }
+        
+        for field, value in optional_fields.items():
+            if value is not None:
+                if isinstance(value, str):
+                    patient_data[field] = value.strip() if value else None
+                else:
+                    patient_data[field] = value
+        
+        return patient_data
+    
+    def create(self, user_id: str, **fields: Any) -> Dict[str, Any]:
+        """Create a new patient record (fields as accepted by _build_row)."""
         try:
-            patient_data = {
-                "user_id": user_id,
-                "name": name.strip(),
-                "status": status,
-            }
+            patient_data = self._build_row(user_id, **fields)
             
-            # Basic fields
-            if age is not None:
-                patient_data["age"] = age
-            if gender:
-                patient_data["gender"] = gender.strip()
-            if primary_diagnosis:
-                patient_data["primary_diagnosis"] = primary_diagnosis.strip()
-            if individual_notes:
-                patient_data["individual_notes"] = individual_notes.strip()
-            
-            # Additional patient information
-            optional_fields = {
-                "birth_date": birth_date,
-                "birth_date_year": birth_date_year,
-                "birth_date_month": birth_date_month,
-                "birth_date_day": birth_date_day,
-                "address": address,
-                "contact": contact,
-                "key_person_name": key_person_name,
-                "key_person_relationship": key_person_relationship,
-                "key_person_address": key_person_address,
-                "key_person_contact1": key_person_contact1,
-                "key_person_contact2": key_person_contact2,
-                "medical_history": medical_history,
-                "current_illness_history": current_illness_history,
-                "family_structure": family_structure,
-                "doctor_name": doctor_name,
-                "hospital_name": hospital_name,
-                "hospital_address": hospital_address,
-                "hospital_phone": hospital_phone,
-                "initial_visit_date": initial_visit_date,
-                "initial_visit_year": initial_visit_year,
-                "initial_visit_month": initial_visit_month,
-                "initial_visit_day": initial_visit_day,
-                "initial_visit_day_of_week": initial_visit_day_of_week,
-                "initial_visit_start_hour": initial_visit_start_hour,
-                "initial_visit_start_minute": initial_visit_start_minute,
-                "initial_visit_end_hour": initial_visit_end_hour,
-                "initial_visit_end_minute": initial_visit_end_minute,
-                "daily_life_meal_nutrition": daily_life_meal_nutrition,
-                "daily_life_hygiene": daily_life_hygiene,
-                "daily_life_medication": daily_life_medication,
-                "daily_life_sleep": daily_life_sleep,
-                "daily_life_living_environment": daily_life_living_environment,
-                "daily_life_family_environment": daily_life_family_environment,
-                "recorder_name": recorder_name,
-            }
-            
-            for field, value in optional_fields.items():
-                if value is not None:
-                    if isinstance(value, str):
-                        patient_data[field] = value.strip() if value else None
-                    else:
-                        patient_data[field] = value
-            
-            logger.info(f"Creating patient for user {user_id}, name: {name}")
+            logger.info("Creating patient for user %s, name: %s", user_id, patient_data["name"])
             
             response = self.client.table("patients").insert(patient_data).execute()
             
             if not response.data:
                 raise DatabaseServiceError("Failed to create patient: No data returned")
             
-            logger.info(f"Successfully created patient with ID: {response.data[0].get('id')}")
+            logger.info("Successfully created patient with ID: %s", response.data[0].get("id"))
+            _invalidate_patient_cache(user_id)
             return response.data[0]
             
         except Exception as e:
             self._handle_error("create patient", e)
     
-    def get_all(self, user_id: str, status: Optional[str] = None) -> list[Dict[str, Any]]:
-        """Fetch all patients for a specific user."""
+    def bulk_create(self, user_id: str, patients: list[Dict[str, Any]]) -> list[Dict[str, Any]]:
+        """
+        Create several patient records with one multi-row insert.
+        
+        All rows go in a single INSERT statement, so either every patient is
+        created or none is and the request can be retried safely. Columns a
+        row leaves out get their database default, as in create().
+        
+        Returns:
+            The created rows, in input order.
+        """
         try:
-            logger.info(f"Fetching patients for user {user_id}, status={status}")
+            rows = [self._build_row(user_id, **fields) for fields in patients]
+            logger.info("Bulk creating %s patients for user %s", len(rows), user_id)
+            
+            response = (
+                self.client.table("patients")
+                .insert(rows, default_to_null=False)
+                .execute()
+            )
+            if len(response.data or []) != len(rows):
+                raise DatabaseServiceError("Failed to create patients: Not all rows were returned")
+            
+            logger.info("Successfully created %s patients for user %s", len(response.data), user_id)
+            _invalidate_patient_cache(user_id)
+            return response.data
+            
+        except Exception as e:
+            self._handle_error("bulk create patients", e)
+    
+    def get_all(self, user_id: str, status: Optional[str] = None) -> list[Mapping[str, Any]]:
+        """Fetch all patients for a specific user (rows are read-only)."""
+        cached = _patient_list_cache.get((user_id, status))
+        if cached is not None:
+            return list(cached)
+        
+        try:
+            logger.info("Fetching patients for user %s, status=%s", user_id, status)
             
             query = (
                 self.client.table("patients")
@@ -235,19 +395,25 @@ class PatientService(BaseDatabaseService):
             )
             
             if not response.data:
-                logger.info(f"No patients found for user {user_id}")
+                logger.info("No patients found for user %s", user_id)
                 return []
             
-            logger.info(f"Successfully fetched {len(response.data)} patients for user {user_id}")
-            return response.data
+            logger.info("Successfully fetched %s patients for user %s", len(response.data), user_id)
+            patients = _read_only_rows(response.data)
+            _patient_list_cache.set((user_id, status), patients)
+            return list(patients)
             
         except Exception as e:
             self._handle_error("fetch patients", e)
     
     def get_by_id(self, patient_id: str, user_id: str) -> Dict[str, Any]:
         """Fetch a single patient by ID for a specific user."""
+        cached = _patient_cache.get((user_id, patient_id))
+        if cached is not None:
+            return dict(cached)
+        
         try:
-            logger.info(f"Fetching patient {patient_id} for user {user_id}")
+            logger.info("Fetching patient %s for user %s", patient_id, user_id)
             
             response = (
                 self.client.table("patients")
@@ -259,9 +425,10 @@ class PatientService(BaseDatabaseService):
             )
             
             if not response.data:
-                raise DatabaseServiceError(f"Patient {patient_id} not found")
+                raise self._not_found(f"Patient {patient_id} not found")
             
-            logger.info(f"Successfully fetched patient {patient_id}")
+            logger.info("Successfully fetched patient %s", patient_id)
+            _patient_cache.set((user_id, patient_id), dict(response.data))
             return response.data
             
         except Exception as e:
@@ -329,7 +496,7 @@ class PatientService(BaseDatabaseService):
                 update_data["individual_notes"] = individual_notes.strip() if individual_notes else None
             if status is not None:
                 if status not in ["active", "inactive", "archived"]:
-                    raise DatabaseServiceError(f"Invalid status: {status}. Must be 'active', 'inactive', or 'archived'.")
+                    raise InvalidStatusError(f"Invalid status: {status}. Must be 'active', 'inactive', or 'archived'.")
                 update_data["status"] = status
             
             # Additional patient information
@@ -380,7 +547,7 @@ class PatientService(BaseDatabaseService):
             if not update_data:
                 raise DatabaseServiceError("No update data provided")
             
-            logger.info(f"Updating patient {patient_id} for user {user_id}")
+            logger.info("Updating patient %s for user %s", patient_id, user_id)
             
             response = (
                 self.client.table("patients")
@@ -391,9 +558,10 @@ class PatientService(BaseDatabaseService):
             )
             
             if not response.data:
-                raise DatabaseServiceError(f"Patient {patient_id} not found or update failed")
+                raise self._not_found(f"Patient {patient_id} not found or update failed")
             
-            logger.info(f"Successfully updated patient {patient_id}")
+            logger.info("Successfully updated patient %s", patient_id)
+            _invalidate_patient_cache(user_id, patient_id)
             return response.data[0]
             
         except DatabaseServiceError:
@@ -414,7 +582,7 @@ class PatientService(BaseDatabaseService):
                 and foreign key constraint is RESTRICT.
         """
         try:
-            logger.info(f"Deleting patient {patient_id} for user {user_id}")
+            logger.info("Deleting patient %s for user %s", patient_id, user_id)
             
             # Check if patient exists first
             existing = (
@@ -427,7 +595,7 @@ class PatientService(BaseDatabaseService):
             )
             
             if not existing.data:
-                raise DatabaseServiceError(f"Patient {patient_id} not found")
+                raise self._not_found(f"Patient {patient_id} not found")
             
             # Attempt deletion
             response = (
@@ -438,7 +606,11 @@ class PatientService(BaseDatabaseService):
                 .execute()
             )
             
-            logger.info(f"Successfully deleted patient {patient_id}")
+            logger.info("Successfully deleted patient %s", patient_id)
+            _invalidate_patient_cache(user_id, patient_id)
+            # soap_records.patient_id cascades on delete; drop cached care plans too
+            _invalidate_soap_records_cache(user_id)
+            _invalidate_care_plan_cache(user_id)
             
         except Exception as e:
             error_msg = str(e).lower()
@@ -455,9 +627,25 @@ class PatientService(BaseDatabaseService):
 # Care Plan Service
 # ============================================================================
 
+# Read-through cache for care plan lists, keyed by (user_id, patient_id, status).
+# Writes through CarePlanService invalidate the user's entries.
+_care_plan_list_cache = TTLCache(ttl=settings.CARE_PLAN_LIST_CACHE_TTL_SECONDS)
+
+
+def _invalidate_care_plan_cache(user_id: str) -> None:
+    """Drop cached care plan lists for a user after a write."""
+    _care_plan_list_cache.invalidate_where(lambda key: key[0] == user_id)
+
+
+# Columns of CarePlanResponse; PostgREST then sends only what the API returns
+_CARE_PLAN_SELECT = "id, patient_id, plan_output, start_date, end_date, status, notes, created_at, updated_at"
+
+
 class CarePlanService(BaseDatabaseService):
     """Service for care plan operations."""
     
+    resource = "care_plan"
+    
     def create(
         self,
         user_id: str,
@@ -484,14 +672,15 @@ class CarePlanService(BaseDatabaseService):
             if notes:
                 care_plan_data["notes"] = notes.strip()
             
-            logger.info(f"Creating care plan for patient {patient_id}, user {user_id}")
+            logger.info("Creating care plan for patient %s, user %s", patient_id, user_id)
             
             response = self.client.table("care_plans").insert(care_plan_data).execute()
             
             if not response.data:
                 raise DatabaseServiceError("Failed to create care plan: No data returned")
             
-            logger.info(f"Successfully created care plan with ID: {response.data[0].get('id')}")
+            logger.info("Successfully created care plan with ID: %s", response.data[0].get("id"))
+            _invalidate_care_plan_cache(user_id)
             return response.data[0]
             
         except Exception as e:
@@ -502,14 +691,19 @@ class CarePlanService(BaseDatabaseService):
         user_id: str,
         patient_id: str,
         status: Optional[str] = None,
-    ) -> list[Dict[str, Any]]:
-        """Fetch all care plans for a specific patient."""
+    ) -> list[Mapping[str, Any]]:
+        """Fetch all care plans for a specific patient (rows are read-only)."""
+        cache_key = (user_id, patient_id, status)
+        cached = _care_plan_list_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+        
         try:
-            logger.info(f"Fetching care plans for patient {patient_id}, user {user_id}, status={status}")
+            logger.info("Fetching care plans for patient %s, user %s, status=%s", patient_id, user_id, status)
             
             query = (
                 self.client.table("care_plans")
-                .select("*")
+                .select(_CARE_PLAN_SELECT)
                 .eq("user_id", user_id)
                 .eq("patient_id", patient_id)
             )
@@ -519,17 +713,108 @@ class CarePlanService(BaseDatabaseService):
             
             response = (
                 query
-                .order("start_date", desc=True, nulls_last=True)
+                .order("start_date", desc=True, nullsfirst=False)
                 .order("created_at", desc=True)
                 .execute()
             )
             
             if not response.data:
-                logger.info(f"No care plans found for patient {patient_id}")
+                logger.info("No care plans found for patient %s", patient_id)
                 return []
             
-            logger.info(f"Successfully fetched {len(response.data)} care plans for patient {patient_id}")
-            return response.data
+            logger.info("Successfully fetched %s care plans for patient %s", len(response.data), patient_id)
+            care_plans = _read_only_rows(response.data)
+            _care_plan_list_cache.set(cache_key, care_plans)
+            return list(care_plans)
+            
+        except Exception as e:
+            self._handle_error("fetch care plans", e)
+    
+    def iter_by_patient(
+        self,
+        user_id: str,
+        patient_id: str,
+        status: Optional[str] = None,
+        batch_size: int = 100,
+    ) -> Iterator[list[Dict[str, Any]]]:
+        """
+        Fetch the care plans of a patient in batches of at most batch_size rows.
+        
+        Each batch is a separate ranged request and bypasses the list cache,
+        so memory stays bounded by the batch size however many plans exist.
+        """
+        start = 0
+        while True:
+            try:
+                query = (
+                    self.client.table("care_plans")
+                    .select(_CARE_PLAN_SELECT)
+                    .eq("user_id", user_id)
+                    .eq("patient_id", patient_id)
+                )
+                if status:
+                    query = query.eq("status", status)
+                response = (
+                    query
+                    .order("start_date", desc=True, nullsfirst=False)
+                    .order("created_at", desc=True)
+                    .order("id")  # tie-breaker so ranges do not overlap
+                    .range(start, start + batch_size - 1)
+                    .execute()
+                )
+            except Exception as e:
+                self._handle_error("fetch care plans", e)
+            
+            rows = response.data or []
+            logger.info("Fetched %s care plans for patient %s (offset %s)", len(rows), patient_id, start)
+            yield rows
+            
+            if len(rows) < batch_size:
+                return
+            start += batch_size
+    
+    def get_by_patients(
+        self,
+        user_id: str,
+        patient_ids: list[str],
+        status: Optional[str] = None,
+    ) -> Dict[str, list[Dict[str, Any]]]:
+        """
+        Fetch the care plans of several patients in one query.
+        
+        Returns:
+            Care plans grouped by patient_id, in the order of patient_ids
+            (patients without care plans map to an empty list).
+        """
+        grouped: Dict[str, list[Dict[str, Any]]] = {patient_id: [] for patient_id in patient_ids}
+        if not grouped:
+            return grouped
+        
+        try:
+            logger.info("Fetching care plans for %s patients, user %s, status=%s", len(grouped), user_id, status)
+            
+            query = (
+                self.client.table("care_plans")
+                .select(_CARE_PLAN_SELECT)
+                .eq("user_id", user_id)
+                .in_("patient_id", list(grouped))
+            )
+            
+            if status:
+                query = query.eq("status", status)
+            
+            response = (
+                query
+                .order("start_date", desc=True, nullsfirst=False)
+                .order("created_at", desc=True)
+                .execute()
+            )
+            
+            for care_plan in response.data or []:
+                grouped.setdefault(care_plan["patient_id"], []).append(care_plan)
+            
+            logger.info("Successfully fetched %s care plans for %s patients", len(response.data or []), len(grouped))
+            return grouped
             
         except Exception as e:
             self._handle_error("fetch care plans", e)
@@ -539,9 +824,39 @@ class CarePlanService(BaseDatabaseService):
 # SOAP Record Service
 # ============================================================================
 
+# Read-through cache for record list queries and single records, keyed by user
+# first. Writes through SOAPRecordService invalidate the user's entries.
+_soap_records_cache = TTLCache(ttl=settings.SOAP_RECORDS_CACHE_TTL_SECONDS)
+
+
+def _invalidate_soap_records_cache(user_id: str) -> None:
+    """Drop cached record lists for a user after a write."""
+    _soap_records_cache.invalidate_where(lambda key: key[0] == user_id)
+
+
+# Embed the owning patient so list rows carry patient fields without follow-up lookups
+_SOAP_RECORD_WITH_PATIENT_SELECT = "*, patients(name, primary_diagnosis)"
+# Only the SOAPRecordResponse columns; leaves out soap_output, s_text, o_text, etc.
+_SOAP_RECORD_LIST_SELECT = (
+    "id, patient_id, patient_name, diagnosis, visit_date, start_time, end_time, "
+    "chief_complaint, plan_output, status, created_at, patients(name, primary_diagnosis)"
+)
+
+
+def _with_patient_fields(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill missing patient_name/diagnosis from the embedded patients row."""
+    patient = record.pop("patients", None)
+    if patient:
+        record["patient_name"] = record.get("patient_name") or patient.get("name")
+        record["diagnosis"] = record.get("diagnosis") or patient.get("primary_diagnosis")
+    return record
+
+
 class SOAPRecordService(BaseDatabaseService):
     """Service for SOAP record operations."""
     
+    resource = "soap_record"
+    
     def save(
         self,
         user_id: str,
@@ -569,7 +884,7 @@ class SOAPRecordService(BaseDatabaseService):
             # Default visit_date to today if not provided
             if not visit_date or not visit_date.strip():
                 visit_date = date.today().isoformat()
-                logger.info(f"visit_date not provided, defaulting to today: {visit_date}")
+                logger.info("visit_date not provided, defaulting to today: %s", visit_date)
             
             record_data = {
                 "user_id": user_id.strip(),
@@ -582,42 +897,39 @@ class SOAPRecordService(BaseDatabaseService):
                 "o_text": o_text,
             }
             
-            # Use patient_id if provided, otherwise fall back to patient_name/diagnosis
-            if patient_id:
-                record_data["patient_id"] = patient_id
-                # Fetch patient data to include in response
-                try:
-                    patient_service = PatientService()
-                    patient = patient_service.get_by_id(patient_id, user_id)
-                    record_data["patient_name"] = patient["name"]
-                    record_data["diagnosis"] = patient.get("primary_diagnosis")
-                except DatabaseServiceError:
-                    logger.warning(f"Patient {patient_id} not found, using provided patient_name/diagnosis")
-                    if patient_name:
-                        record_data["patient_name"] = patient_name
-                    if diagnosis:
-                        record_data["diagnosis"] = diagnosis
-            else:
-                # Backward compatibility: use patient_name and diagnosis directly
-                if patient_name:
-                    record_data["patient_name"] = patient_name
-                if diagnosis:
-                    record_data["diagnosis"] = diagnosis
+            # Client-supplied values; the RPC replaces them with the patient's when found
+            if patient_name:
+                record_data["patient_name"] = patient_name
+            if diagnosis:
+                record_data["diagnosis"] = diagnosis
             
             if soap_output:
                 record_data["soap_output"] = soap_output
             if plan_output:
                 record_data["plan_output"] = plan_output
             
-            logger.info(f"Saving SOAP record for user {user_id}, patient_id={patient_id}, patient_name={patient_name}")
+            logger.info("Saving SOAP record for user %s, patient_id=%s", user_id, patient_id)
             
-            response = self.client.table("soap_records").insert(record_data).execute()
+            if patient_id:
+                record_data["patient_id"] = patient_id
+                # Patient lookup and insert happen in one statement (see
+                # create_soap_record_for_patient migration) instead of two round trips
+                response = self.client.rpc(
+                    "create_soap_record_for_patient", {"p_record": record_data}
+                ).execute()
+                # A composite-returning function comes back as a single object
+                rows = [response.data] if isinstance(response.data, dict) else response.data
+            else:
+                # Backward compatibility: use patient_name and diagnosis directly
+                response = self.client.table("soap_records").insert(record_data).execute()
+                rows = response.data
             
-            if not response.data:
+            if not rows:
                 raise DatabaseServiceError("Failed to save record: No data returned")
             
-            logger.info(f"Successfully saved SOAP record with ID: {response.data[0].get('id')}")
-            return response.data[0]
+            logger.info("Successfully saved SOAP record with ID: %s", rows[0].get("id"))
+            _invalidate_soap_records_cache(user_id.strip())
+            return rows[0]
             
         except Exception as e:
             self._handle_error("save SOAP record", e)
@@ -625,41 +937,30 @@ class SOAPRecordService(BaseDatabaseService):
     def get_all(
         self,
         user_id: str,
+        filters: Optional[RecordFilters] = None,
         limit: Optional[int] = 100,
-        date_from: Optional[str] = None,
-        date_to: Optional[str] = None,
-        nurse_name: Optional[str] = None,
-        patient_id: Optional[str] = None,
         page: Optional[int] = None,
         page_size: Optional[int] = None,
     ) -> list[Dict[str, Any]]:
         """Fetch SOAP records for a specific user."""
+        filters = filters or RecordFilters()
+        cache_key = (user_id, filters, limit, page, page_size)
+        cached = _soap_records_cache.get(cache_key)
+        if cached is not None:
+            return [dict(record) for record in cached]
+        
         try:
-            logger.info(f"Fetching SOAP records for user_id={user_id} with filters: date_from={date_from}, date_to={date_to}, nurse_name={nurse_name}, patient_id={patient_id}, page={page}, page_size={page_size}")
+            logger.info("Fetching SOAP records for user_id=%s with filters: %s, page=%s, page_size=%s", user_id, filters, page, page_size)
             
             if not user_id:
                 raise DatabaseServiceError("user_id is required to fetch SOAP records")
             
-            query = (
+            query = filters.apply(
                 self.client.table("soap_records")
-                .select("*")
+                .select(_SOAP_RECORD_WITH_PATIENT_SELECT)
                 .eq("user_id", user_id)
             )
             
-            # Apply patient filter
-            if patient_id:
-                query = query.eq("patient_id", patient_id)
-            
-            # Apply date range filters
-            if date_from:
-                query = query.gte("visit_date", date_from)
-            if date_to:
-                query = query.lte("visit_date", date_to)
-            
-            # Apply nurse filter
-            if nurse_name:
-                query = query.contains("nurses", [nurse_name])
-            
             # Apply pagination if provided
             if page is not None and page_size is not None:
                 offset = (page - 1) * page_size
@@ -675,19 +976,120 @@ class SOAPRecordService(BaseDatabaseService):
             )
             
             if not response.data:
-                logger.info(f"No records found for user {user_id}")
+                logger.info("No records found for user %s", user_id)
                 return []
             
-            logger.info(f"Successfully fetched {len(response.data)} records for user {user_id}")
-            return response.data
+            records = [_with_patient_fields(record) for record in response.data]
+            
+            logger.info("Successfully fetched %s records for user %s", len(records), user_id)
+            _soap_records_cache.set(cache_key, [dict(record) for record in records])
+            return records
             
         except Exception as e:
             self._handle_error("fetch SOAP records", e)
     
+    def get_page(
+        self,
+        user_id: str,
+        filters: Optional[RecordFilters] = None,
+        page: int = 1,
+        page_size: int = 10,
+        fingerprint: Optional[tuple[int, Optional[str]]] = None,
+    ) -> tuple[list[Dict[str, Any]], int]:
+        """
+        Fetch one page of the records list plus the total number of matches.
+        
+        Only the list-view columns are selected, and the total comes back with
+        the same request (count="exact") instead of loading every matching
+        record just to count it. Pass the get_fingerprint() result used for
+        the list's ETag as fingerprint: it is part of the cache key, so a page
+        cached before a write this process did not see is never served under
+        the newer ETag.
+        """
+        filters = filters or RecordFilters()
+        cache_key = (user_id, "page", filters, page, page_size, fingerprint)
+        cached = _soap_records_cache.get(cache_key)
+        if cached is not None:
+            records, total = cached
+            return [dict(record) for record in records], total
+        
+        offset = (page - 1) * page_size
+        try:
+            logger.info("Fetching SOAP records page for user_id=%s with filters: %s, page=%s, page_size=%s", user_id, filters, page, page_size)
+            
+            response = (
+                filters.apply(
+                    self.client.table("soap_records")
+                    .select(_SOAP_RECORD_LIST_SELECT, count="exact")
+                    .eq("user_id", user_id)
+                )
+                .order("visit_date", desc=True)
+                .order("created_at", desc=True)
+                .range(offset, offset + page_size - 1)
+                .execute()
+            )
+            records = [_with_patient_fields(record) for record in response.data or []]
+            total = response.count or 0
+            
+        except Exception as e:
+            if getattr(e, "code", None) != "PGRST103":
+                self._handle_error("fetch SOAP records", e)
+            # Page past the end: PostgREST rejects the range, so count on its own
+            records, total = [], self._count(user_id, filters)
+        
+        logger.info("Fetched %s of %s records for user %s", len(records), total, user_id)
+        _soap_records_cache.set(cache_key, ([dict(record) for record in records], total))
+        return records, total
+    
+    def _count(self, user_id: str, filters: RecordFilters) -> int:
+        """Count a user's records matching filters without fetching any rows."""
+        try:
+            response = filters.apply(
+                self.client.table("soap_records")
+                .select("id", count="exact", head=True)
+                .eq("user_id", user_id)
+            ).execute()
+            return response.count or 0
+        except Exception as e:
+            self._handle_error("count SOAP records", e)
+    
+    def get_fingerprint(self, user_id: str) -> tuple[int, Optional[str]]:
+        """
+        Return (record count, newest updated_at) for a user's SOAP records.
+        
+        Any insert, update or delete changes at least one of the two values,
+        so it can stand in for the whole record set when building ETags.
+        Deliberately not cached: it must reflect the database.
+        """
+        try:
+            response = (
+                self.client.table("soap_records")
+                .select("updated_at", count="exact")
+                .eq("user_id", user_id)
+                .order("updated_at", desc=True)
+                .limit(1)
+                .execute()
+            )
+            newest = response.data[0].get("updated_at") if response.data else None
+            return response.count or 0, newest
+            
+        except Exception as e:
+            self._handle_error("fetch SOAP records fingerprint", e)
+    
     def get_by_id(self, record_id: str, user_id: str) -> Dict[str, Any]:
-        """Fetch a single SOAP record by ID for a specific user."""
+        """
+        Fetch a single SOAP record by ID for a specific user.
+        
+        Cached briefly alongside the user's record lists, so viewing a record
+        and then downloading its PDF reads the row once.
+        """
+        cache_key = (user_id, "record", record_id)
+        cached = _soap_records_cache.get(cache_key)
+        if cached is not None:
+            return dict(cached)
+        
         try:
-            logger.info(f"Fetching SOAP record {record_id} for user {user_id}")
+            logger.info("Fetching SOAP record %s for user %s", record_id, user_id)
             
             response = (
                 self.client.table("soap_records")
@@ -699,9 +1101,10 @@ class SOAPRecordService(BaseDatabaseService):
             )
             
             if not response.data:
-                raise DatabaseServiceError(f"Record {record_id} not found")
+                raise self._not_found(f"Record {record_id} not found")
             
-            logger.info(f"Successfully fetched SOAP record {record_id}")
+            logger.info("Successfully fetched SOAP record %s", record_id)
+            _soap_records_cache.set(cache_key, dict(response.data))
             return response.data
             
         except Exception as e:
@@ -715,7 +1118,12 @@ class SOAPRecordService(BaseDatabaseService):
         year: int = 0,
         month: int = 0,
     ) -> list[Dict[str, Any]]:
-        """Fetch SOAP records for a specific patient in a specific month."""
+        """
+        Fetch SOAP records for a specific patient in a specific month.
+        
+        The owning patient is embedded in the same query, so rows saved
+        without patient_name/diagnosis still carry them without a lookup.
+        """
         try:
             from datetime import datetime
             
@@ -726,11 +1134,11 @@ class SOAPRecordService(BaseDatabaseService):
             else:
                 end_date = datetime(year, month + 1, 1).strftime('%Y-%m-%d')
             
-            logger.info(f"Fetching visits for patient_id={patient_id}, patient_name={patient_name} in {year}-{month:02d}")
+            logger.info("Fetching visits for patient_id=%s in %s-%02d", patient_id, year, month)
             
             query = (
                 self.client.table("soap_records")
-                .select("*")
+                .select(_SOAP_RECORD_WITH_PATIENT_SELECT)
                 .eq("user_id", user_id)
                 .gte("visit_date", start_date)
                 .lt("visit_date", end_date)
@@ -752,11 +1160,11 @@ class SOAPRecordService(BaseDatabaseService):
             )
             
             if not response.data:
-                logger.info(f"No visits found for patient_id={patient_id}, patient_name={patient_name} in {year}-{month:02d}")
+                logger.info("No visits found for patient_id=%s in %s-%02d", patient_id, year, month)
                 return []
             
-            logger.info(f"Successfully fetched {len(response.data)} visits for patient_id={patient_id}, patient_name={patient_name} in {year}-{month:02d}")
-            return response.data
+            logger.info("Successfully fetched %s visits for patient_id=%s in %s-%02d", len(response.data), patient_id, year, month)
+            return [_with_patient_fields(record) for record in response.data]
             
         except Exception as e:
             self._handle_error("fetch visits by patient and month", e)
@@ -779,13 +1187,13 @@ class SOAPRecordService(BaseDatabaseService):
                 update_data["plan_output"] = plan_output
             if status is not None:
                 if status not in ["draft", "confirmed"]:
-                    raise DatabaseServiceError(f"Invalid status: {status}. Must be 'draft' or 'confirmed'.")
+                    raise InvalidStatusError(f"Invalid status: {status}. Must be 'draft' or 'confirmed'.")
                 update_data["status"] = status
             
             if not update_data:
                 raise DatabaseServiceError("No update data provided")
             
-            logger.info(f"Updating SOAP record {record_id} for user {user_id}")
+            logger.info("Updating SOAP record %s for user %s", record_id, user_id)
             
             response = (
                 self.client.table("soap_records")
@@ -796,9 +1204,10 @@ class SOAPRecordService(BaseDatabaseService):
             )
             
             if not response.data:
-                raise DatabaseServiceError(f"Record {record_id} not found or update failed")
+                raise self._not_found(f"Record {record_id} not found or update failed")
             
-            logger.info(f"Successfully updated SOAP record {record_id}")
+            logger.info("Successfully updated SOAP record %s", record_id)
+            _invalidate_soap_records_cache(user_id)
             return response.data[0]
             
         except DatabaseServiceError:
@@ -809,7 +1218,7 @@ class SOAPRecordService(BaseDatabaseService):
     def get_latest_for_patient(self, patient_id: str, user_id: str) -> Optional[Dict[str, Any]]:
         """Fetch the latest SOAP record for a specific patient."""
         try:
-            logger.info(f"Fetching latest SOAP record for patient {patient_id}, user {user_id}")
+            logger.info("Fetching latest SOAP record for patient %s, user %s", patient_id, user_id)
             
             response = (
                 self.client.table("soap_records")
@@ -823,10 +1232,10 @@ class SOAPRecordService(BaseDatabaseService):
             )
             
             if not response.data or len(response.data) == 0:
-                logger.info(f"No SOAP records found for patient {patient_id}")
+                logger.info("No SOAP records found for patient %s", patient_id)
                 return None
             
-            logger.info(f"Successfully fetched latest SOAP record for patient {patient_id}")
+            logger.info("Successfully fetched latest SOAP record for patient %s", patient_id)
             return response.data[0]
             
         except Exception as e:
@@ -840,6 +1249,8 @@ class SOAPRecordService(BaseDatabaseService):
 class PlanService(BaseDatabaseService):
     """Service for plan operations."""
     
+    resource = "plan"
+    
     def create(
         self,
         user_id: str,
@@ -870,7 +1281,7 @@ class PlanService(BaseDatabaseService):
                     patient = patient_service.get_by_id(patient_id, user_id)
                     patient_family_wish = patient.get("individual_notes")
                 except DatabaseServiceError:
-                    logger.warning(f"Could not fetch patient {patient_id} for prefilling wish")
+                    logger.warning("Could not fetch patient %s for prefilling wish", patient_id)
             
             # Fetch latest SOAP record once for both plan fields and plan_items
             latest_record = None
@@ -881,7 +1292,7 @@ class PlanService(BaseDatabaseService):
                     if latest_record and latest_record.get("plan_output"):
                         plan_output = latest_record.get("plan_output", {})
                 except Exception as e:
-                    logger.warning(f"Could not fetch plan_output from latest SOAP record: {e}")
+                    logger.warning("Could not fetch plan_output from latest SOAP record: %s", e)
             
             # Prefill long_term_goal, short_term_goal, nursing_policy from latest SOAP record's plan_output if empty
             if plan_output:
@@ -894,7 +1305,7 @@ class PlanService(BaseDatabaseService):
                     nursing_policy = plan_output.get("看護援助の方針", "").strip() or None
                 
                 if long_term_goal or short_term_goal or nursing_policy:
-                    logger.info(f"Prefilled plan fields from latest SOAP record plan_output")
+                    logger.info("Prefilled plan fields from latest SOAP record plan_output")
             
             # Validate required dates
             if not start_date or not start_date.strip():
@@ -938,7 +1349,7 @@ class PlanService(BaseDatabaseService):
                     else:
                         plan_data[field] = value
             
-            logger.info(f"Creating plan for user {user_id}, patient {patient_id}")
+            logger.info("Creating plan for user %s, patient %s", user_id, patient_id)
             
             # Create plan
             response = self.client.table("plans").insert(plan_data).execute()
@@ -984,7 +1395,7 @@ class PlanService(BaseDatabaseService):
                         })
                     
                     if items:
-                        logger.info(f"Populated {len(items)} plan items from latest SOAP record plan_output")
+                        logger.info("Populated %s plan items from latest SOAP record plan_output", len(items))
                 
                 # If no items were populated from SOAP record, use defaults
                 if not items:
@@ -1029,7 +1440,7 @@ class PlanService(BaseDatabaseService):
                     ]
                 except (ValueError, TypeError) as e:
                     # This should not happen since we validated start_date above, but handle it gracefully
-                    logger.error(f"Unexpected error parsing validated start_date '{start_date}': {e}")
+                    logger.error("Unexpected error parsing validated start_date '%s': %s", start_date, e)
                     raise DatabaseServiceError(f"Invalid start_date format after validation: {start_date}") from e
             
             # Insert evaluations
@@ -1048,7 +1459,7 @@ class PlanService(BaseDatabaseService):
             if plan_evaluations_data:
                 self.client.table("plan_evaluations").insert(plan_evaluations_data).execute()
             
-            logger.info(f"Successfully created plan with ID: {plan_id}")
+            logger.info("Successfully created plan with ID: %s", plan_id)
             
             # Fetch complete plan with items and evaluations
             return self.get_by_id(plan_id, user_id)
@@ -1061,7 +1472,7 @@ class PlanService(BaseDatabaseService):
     def get_by_patient(self, patient_id: str, user_id: str, status: Optional[str] = None) -> list[Dict[str, Any]]:
         """Fetch all plans for a specific patient."""
         try:
-            logger.info(f"Fetching plans for patient {patient_id}, user {user_id}, status={status}")
+            logger.info("Fetching plans for patient %s, user %s, status=%s", patient_id, user_id, status)
             
             query = (
                 self.client.table("plans")
@@ -1080,7 +1491,7 @@ class PlanService(BaseDatabaseService):
             )
             
             if not response.data:
-                logger.info(f"No plans found for patient {patient_id}")
+                logger.info("No plans found for patient %s", patient_id)
                 return []
             
             # Fetch items and evaluations for each plan
@@ -1123,7 +1534,7 @@ class PlanService(BaseDatabaseService):
                 
                 plans.append(plan)
             
-            logger.info(f"Successfully fetched {len(plans)} plans for patient {patient_id}")
+            logger.info("Successfully fetched %s plans for patient %s", len(plans), patient_id)
             return plans
             
         except Exception as e:
@@ -1132,7 +1543,7 @@ class PlanService(BaseDatabaseService):
     def get_by_id(self, plan_id: str, user_id: str) -> Dict[str, Any]:
         """Fetch a single plan by ID with items and evaluations."""
         try:
-            logger.info(f"Fetching plan {plan_id} for user {user_id}")
+            logger.info("Fetching plan %s for user %s", plan_id, user_id)
             
             response = (
                 self.client.table("plans")
@@ -1144,7 +1555,7 @@ class PlanService(BaseDatabaseService):
             )
             
             if not response.data:
-                raise DatabaseServiceError(f"Plan {plan_id} not found")
+                raise self._not_found(f"Plan {plan_id} not found")
             
             plan = response.data
             
@@ -1181,7 +1592,7 @@ class PlanService(BaseDatabaseService):
             )
             plan["hospitalizations"] = hospitalizations_response.data if hospitalizations_response.data else []
             
-            logger.info(f"Successfully fetched plan {plan_id}")
+            logger.info("Successfully fetched plan %s", plan_id)
             return plan
             
         except Exception as e:
@@ -1256,7 +1667,7 @@ class PlanService(BaseDatabaseService):
                     
                     # Skip items without item_key (required field)
                     if not item_key:
-                        logger.warning(f"Skipping item without item_key: {item}")
+                        logger.warning("Skipping item without item_key: %s", item)
                         continue
                     
                     item_data = {
@@ -1290,7 +1701,7 @@ class PlanService(BaseDatabaseService):
                                 self.client.table("plan_items").insert(item_data).execute()
                         except Exception as e:
                             # If lookup fails, try to insert (might be a new item)
-                            logger.warning(f"Error finding existing item by item_key {item_key}: {e}. Attempting insert.")
+                            logger.warning("Error finding existing item by item_key %s: %s. Attempting insert.", item_key, e)
                             self.client.table("plan_items").insert(item_data).execute()
             
             # Upsert evaluations if provided
@@ -1302,12 +1713,12 @@ class PlanService(BaseDatabaseService):
                     
                     # Skip evaluations without required fields
                     if eval_slot is None:
-                        logger.warning(f"Skipping evaluation without evaluation_slot: {eval_item}")
+                        logger.warning("Skipping evaluation without evaluation_slot: %s", eval_item)
                         continue
                     
                     # Skip if evaluation_date is empty string (NOT NULL constraint)
                     if not eval_date:
-                        logger.warning(f"Skipping evaluation without evaluation_date: {eval_item}")
+                        logger.warning("Skipping evaluation without evaluation_date: %s", eval_item)
                         continue
                     
                     eval_data = {
@@ -1340,10 +1751,10 @@ class PlanService(BaseDatabaseService):
                                 self.client.table("plan_evaluations").insert(eval_data).execute()
                         except Exception as e:
                             # If lookup fails, try to insert (might be a new evaluation)
-                            logger.warning(f"Error finding existing evaluation by slot {eval_slot}: {e}. Attempting insert.")
+                            logger.warning("Error finding existing evaluation by slot %s: %s. Attempting insert.", eval_slot, e)
                             self.client.table("plan_evaluations").insert(eval_data).execute()
             
-            logger.info(f"Successfully updated plan {plan_id}")
+            logger.info("Successfully updated plan %s", plan_id)
             
             # Return updated plan
             return self.get_by_id(plan_id, user_id)
@@ -1356,7 +1767,7 @@ class PlanService(BaseDatabaseService):
     def delete(self, plan_id: str, user_id: str) -> None:
         """Delete a plan record."""
         try:
-            logger.info(f"Deleting plan {plan_id} for user {user_id}")
+            logger.info("Deleting plan %s for user %s", plan_id, user_id)
             
             # Verify plan exists and belongs to user
             self.get_by_id(plan_id, user_id)
@@ -1370,7 +1781,7 @@ class PlanService(BaseDatabaseService):
                 .execute()
             )
             
-            logger.info(f"Successfully deleted plan {plan_id}")
+            logger.info("Successfully deleted plan %s", plan_id)
             
         except DatabaseServiceError:
             raise
@@ -1410,7 +1821,7 @@ class PlanService(BaseDatabaseService):
                 "closed_reason": "HOSPITALIZATION",
             }).eq("id", plan_id).eq("user_id", user_id).execute()
             
-            logger.info(f"Successfully created hospitalization for plan {plan_id}")
+            logger.info("Successfully created hospitalization for plan %s", plan_id)
             return response.data[0]
             
         except DatabaseServiceError:
@@ -1431,9 +1842,7 @@ class PlanService(BaseDatabaseService):
             soap_service = SOAPRecordService()
             return soap_service.get_all(
                 user_id=user_id,
-                patient_id=patient_id,
-                date_from=start_date,
-                date_to=end_date,
+                filters=RecordFilters(date_from=start_date, date_to=end_date, patient_id=patient_id),
                 limit=None,
             )
             
@@ -1447,9 +1856,21 @@ class PlanService(BaseDatabaseService):
 # Report Service
 # ============================================================================
 
+# Reports with their visit marks embedded via the report_id foreign key
+_REPORT_WITH_MARKS_SELECT = "*, report_visit_marks(*)"
+
+
+def _with_visit_marks(report: Dict[str, Any]) -> Dict[str, Any]:
+    """Move embedded report_visit_marks rows to the visit_marks key used by callers."""
+    report["visit_marks"] = report.pop("report_visit_marks", None) or []
+    return report
+
+
 class ReportService(BaseDatabaseService):
     """Service for report operations."""
     
+    resource = "report"
+    
     def create(
         self,
         user_id: str,
@@ -1473,7 +1894,7 @@ class ReportService(BaseDatabaseService):
                     # Get last day of month
                     last_day = monthrange(year, month)[1]
                     period_end = f"{year}-{month:02d}-{last_day}"
-                    logger.info(f"Calculated period from year_month {year_month}: {period_start} to {period_end}")
+                    logger.info("Calculated period from year_month %s: %s to %s", year_month, period_start, period_end)
                 except (ValueError, IndexError) as e:
                     raise DatabaseServiceError(f"Invalid year_month format '{year_month}'. Expected YYYY-MM.") from e
             elif period_start and period_end:
@@ -1502,7 +1923,7 @@ class ReportService(BaseDatabaseService):
             )
             
             if existing and hasattr(existing, 'data') and existing.data:
-                raise DatabaseServiceError(f"Report for {year_month} already exists for this patient")
+                raise AlreadyExistsError(f"Report for {year_month} already exists for this patient")
             
             # Create report with empty text fields
             report_data = {
@@ -1514,8 +1935,8 @@ class ReportService(BaseDatabaseService):
                 "status": "DRAFT",
             }
             
-            logger.info(f"Creating report for user {user_id}, patient {patient_id}, period {year_month} ({period_start} to {period_end})")
-            logger.debug(f"Report data to insert: {report_data}")
+            logger.info("Creating report for user %s, patient %s, period %s (%s to %s)", user_id, patient_id, year_month, period_start, period_end)
+            logger.debug("Report data to insert: %s", report_data)
             
             # Validate that client is available
             if self.client is None:
@@ -1524,7 +1945,7 @@ class ReportService(BaseDatabaseService):
             try:
                 # Execute insert
                 insert_query = self.client.table("reports").insert(report_data)
-                logger.debug(f"Executing Supabase insert query for reports table")
+                logger.debug("Executing Supabase insert query for reports table")
                 
                 response = insert_query.execute()
                 
@@ -1535,21 +1956,21 @@ class ReportService(BaseDatabaseService):
                 
                 # Check if response has data attribute
                 if not hasattr(response, 'data'):
-                    logger.error(f"Supabase insert response missing data attribute. Response type: {type(response)}, Response: {response}")
+                    logger.error("Supabase insert response missing data attribute. Response type: %s, Response: %s", type(response), response)
                     # Check if response has error information
                     if hasattr(response, 'error') and response.error:
                         error_msg = str(response.error)
-                        logger.error(f"Supabase error in response: {error_msg}")
+                        logger.error("Supabase error in response: %s", error_msg)
                         raise DatabaseServiceError(f"Failed to create report: {error_msg}")
                     raise DatabaseServiceError("Failed to create report: Invalid response from database insert")
                 
                 # Check if data is empty
                 if not response.data:
-                    logger.error(f"Supabase insert returned empty data. Response: {response}")
+                    logger.error("Supabase insert returned empty data. Response: %s", response)
                     # Check for error in response
                     if hasattr(response, 'error') and response.error:
                         error_msg = str(response.error)
-                        logger.error(f"Supabase error: {error_msg}")
+                        logger.error("Supabase error: %s", error_msg)
                         raise DatabaseServiceError(f"Failed to create report: {error_msg}")
                     raise DatabaseServiceError("Failed to create report: No data returned from database insert")
                     
@@ -1560,11 +1981,11 @@ class ReportService(BaseDatabaseService):
                 # Catch all other exceptions (Supabase API errors, network errors, etc.)
                 error_type = type(insert_error).__name__
                 error_msg = str(insert_error)
-                logger.error(f"Failed to insert report into database: {error_type}: {error_msg}", exc_info=True)
+                logger.error("Failed to insert report into database: %s: %s", error_type, error_msg, exc_info=True)
                 
                 # Check for common Supabase error patterns
                 if "duplicate key" in error_msg.lower() or "unique constraint" in error_msg.lower():
-                    raise DatabaseServiceError(f"Report for {year_month} already exists for this patient")
+                    raise AlreadyExistsError(f"Report for {year_month} already exists for this patient")
                 elif "permission denied" in error_msg.lower() or "row-level security" in error_msg.lower():
                     raise DatabaseServiceError(f"Permission denied: Check RLS policies. Error: {error_msg}")
                 elif "foreign key" in error_msg.lower():
@@ -1577,27 +1998,25 @@ class ReportService(BaseDatabaseService):
                 report = response.data[0]
                 report_id = report["id"]
             except (IndexError, KeyError, TypeError) as e:
-                logger.error(f"Failed to extract report data from response: {e}. Response: {response}")
+                logger.error("Failed to extract report data from response: %s. Response: %s", e, response)
                 raise DatabaseServiceError(f"Failed to extract report data from database response: {str(e)}") from e
             
             # Auto-generate visit marks from soap_records
             try:
                 from services.report_service import generate_visit_marks, ReportServiceError
                 generate_visit_marks(report_id, user_id, patient_id, period_start, period_end)
-                logger.info(f"Successfully generated visit marks for report {report_id}")
+                logger.info("Successfully generated visit marks for report %s", report_id)
             except ReportServiceError as e:
-                logger.warning(f"Failed to auto-generate visit marks (ReportServiceError): {e}. Report created but marks not generated.")
+                logger.warning("Failed to auto-generate visit marks (ReportServiceError): %s. Report created but marks not generated.", e)
             except Exception as e:
-                logger.warning(f"Failed to auto-generate visit marks (unexpected error): {type(e).__name__}: {e}. Report created but marks not generated.", exc_info=True)
+                logger.warning("Failed to auto-generate visit marks (unexpected error): %s: %s. Report created but marks not generated.", type(e).__name__, e, exc_info=True)
             
             # Optionally prefill disease_progress_text from last N soap_records
             try:
                 soap_service = SOAPRecordService()
                 soap_records = soap_service.get_all(
                     user_id=user_id,
-                    patient_id=patient_id,
-                    date_from=period_start,
-                    date_to=period_end,
+                    filters=RecordFilters(date_from=period_start, date_to=period_end, patient_id=patient_id),
                     limit=10,  # Last 10 records
                 )
                 
@@ -1629,16 +2048,16 @@ class ReportService(BaseDatabaseService):
                             "disease_progress_text": progress_text
                         }).eq("id", report_id).execute()
             except Exception as e:
-                logger.warning(f"Failed to prefill disease_progress_text: {e}")
+                logger.warning("Failed to prefill disease_progress_text: %s", e)
             
-            logger.info(f"Successfully created report with ID: {report_id}")
+            logger.info("Successfully created report with ID: %s", report_id)
             
             # Return complete report with visit marks
             # If get_by_id fails, return the basic report data we already have
             try:
                 return self.get_by_id(report_id, user_id)
             except Exception as e:
-                logger.warning(f"Failed to fetch complete report after creation: {e}. Returning basic report data.")
+                logger.warning("Failed to fetch complete report after creation: %s. Returning basic report data.", e)
                 # Return basic report data with empty visit marks
                 report["visit_marks"] = []
                 return report
@@ -1646,7 +2065,7 @@ class ReportService(BaseDatabaseService):
         except DatabaseServiceError:
             raise
         except Exception as e:
-            logger.error(f"Error in create report: {type(e).__name__}: {str(e)}", exc_info=True)
+            logger.error("Error in create report: %s: %s", type(e).__name__, e, exc_info=True)
             self._handle_error("create report", e)
     
     def get_by_patient(
@@ -1657,11 +2076,12 @@ class ReportService(BaseDatabaseService):
     ) -> list[Dict[str, Any]]:
         """Fetch all reports for a specific patient."""
         try:
-            logger.info(f"Fetching reports for patient {patient_id}, user {user_id}, year_month={year_month}")
+            logger.info("Fetching reports for patient %s, user %s, year_month=%s", patient_id, user_id, year_month)
             
+            # Visit marks are embedded so the list costs one round-trip, not 1 + N
             query = (
                 self.client.table("reports")
-                .select("*")
+                .select(_REPORT_WITH_MARKS_SELECT)
                 .eq("patient_id", patient_id)
                 .eq("user_id", user_id)
             )
@@ -1672,31 +2092,17 @@ class ReportService(BaseDatabaseService):
             response = (
                 query
                 .order("year_month", desc=True)
+                .order("visit_date", foreign_table="report_visit_marks")
                 .execute()
             )
             
             if not response.data:
-                logger.info(f"No reports found for patient {patient_id}")
+                logger.info("No reports found for patient %s", patient_id)
                 return []
             
-            # Fetch visit marks for each report
-            reports = []
-            for report in response.data:
-                report_id = report["id"]
-                
-                marks_response = (
-                    self.client.table("report_visit_marks")
-                    .select("*")
-                    .eq("report_id", report_id)
-                    .eq("user_id", user_id)
-                    .order("visit_date")
-                    .execute()
-                )
-                report["visit_marks"] = marks_response.data if marks_response.data else []
-                
-                reports.append(report)
+            reports = [_with_visit_marks(report) for report in response.data]
             
-            logger.info(f"Successfully fetched {len(reports)} reports for patient {patient_id}")
+            logger.info("Successfully fetched %s reports for patient %s", len(reports), patient_id)
             return reports
             
         except Exception as e:
@@ -1708,47 +2114,68 @@ class ReportService(BaseDatabaseService):
     ) -> list[Dict[str, Any]]:
         """Fetch all reports for a user."""
         try:
-            logger.info(f"Fetching all reports for user {user_id}")
+            logger.info("Fetching all reports for user %s", user_id)
             
             response = (
                 self.client.table("reports")
-                .select("*")
+                .select(_REPORT_WITH_MARKS_SELECT)
                 .eq("user_id", user_id)
                 .order("year_month", desc=True)
+                .order("visit_date", foreign_table="report_visit_marks")
                 .execute()
             )
             
             if not response.data:
-                logger.info(f"No reports found for user {user_id}")
+                logger.info("No reports found for user %s", user_id)
                 return []
             
-            # Fetch visit marks for each report
-            reports = []
-            for report in response.data:
-                report_id = report["id"]
-                
-                marks_response = (
-                    self.client.table("report_visit_marks")
-                    .select("*")
-                    .eq("report_id", report_id)
-                    .eq("user_id", user_id)
-                    .order("visit_date")
-                    .execute()
-                )
-                report["visit_marks"] = marks_response.data if marks_response.data else []
-                
-                reports.append(report)
+            reports = [_with_visit_marks(report) for report in response.data]
             
-            logger.info(f"Successfully fetched {len(reports)} reports for user {user_id}")
+            logger.info("Successfully fetched %s reports for user %s", len(reports), user_id)
             return reports
             
         except Exception as e:
             self._handle_error("fetch all reports", e)
     
+    def iter_all(
+        self,
+        user_id: str,
+        batch_size: int = 100,
+    ) -> Iterator[list[Dict[str, Any]]]:
+        """
+        Fetch all reports for a user in batches of at most batch_size rows.
+        
+        Each batch is a separate ranged request, so callers can start using
+        the first rows before the rest have been fetched.
+        """
+        start = 0
+        while True:
+            try:
+                response = (
+                    self.client.table("reports")
+                    .select(_REPORT_WITH_MARKS_SELECT)
+                    .eq("user_id", user_id)
+                    .order("year_month", desc=True)
+                    .order("id")  # tie-breaker so ranges do not overlap
+                    .order("visit_date", foreign_table="report_visit_marks")
+                    .range(start, start + batch_size - 1)
+                    .execute()
+                )
+            except Exception as e:
+                self._handle_error("fetch all reports", e)
+            
+            rows = response.data or []
+            logger.info("Fetched %s reports for user %s (offset %s)", len(rows), user_id, start)
+            yield [_with_visit_marks(report) for report in rows]
+            
+            if len(rows) < batch_size:
+                return
+            start += batch_size
+    
     def get_by_id(self, report_id: str, user_id: str) -> Dict[str, Any]:
         """Fetch a single report by ID with visit marks."""
         try:
-            logger.info(f"Fetching report {report_id} for user {user_id}")
+            logger.info("Fetching report %s for user %s", report_id, user_id)
             
             response = (
                 self.client.table("reports")
@@ -1760,7 +2187,7 @@ class ReportService(BaseDatabaseService):
             )
             
             if not response.data:
-                raise DatabaseServiceError(f"Report {report_id} not found")
+                raise self._not_found(f"Report {report_id} not found")
             
             report = response.data
             
@@ -1776,10 +2203,10 @@ class ReportService(BaseDatabaseService):
                 )
                 report["visit_marks"] = marks_response.data if marks_response.data else []
             except Exception as e:
-                logger.warning(f"Failed to fetch visit marks for report {report_id}: {e}. Returning report without marks.")
+                logger.warning("Failed to fetch visit marks for report %s: %s. Returning report without marks.", report_id, e)
                 report["visit_marks"] = []
             
-            logger.info(f"Successfully fetched report {report_id}")
+            logger.info("Successfully fetched report %s", report_id)
             return report
             
         except Exception as e:
@@ -1846,7 +2273,7 @@ class ReportService(BaseDatabaseService):
             # Validate status
             if "status" in update_data and update_data["status"]:
                 if update_data["status"] not in ["DRAFT", "FINAL"]:
-                    raise DatabaseServiceError(f"Invalid status '{update_data['status']}'. Must be DRAFT or FINAL.")
+                    raise InvalidStatusError(f"Invalid status '{update_data['status']}'. Must be DRAFT or FINAL.")
             
             if update_data:
                 self.client.table("reports").update(update_data).eq("id", report_id).eq("user_id", user_id).execute()
@@ -1871,7 +2298,7 @@ class ReportService(BaseDatabaseService):
                             continue
                         
                         if mark_type not in ["CIRCLE", "TRIANGLE", "DOUBLE_CIRCLE", "SQUARE", "CHECK"]:
-                            logger.warning(f"Invalid mark type '{mark_type}', skipping")
+                            logger.warning("Invalid mark type '%s', skipping", mark_type)
                             continue
                         
                         marks_data.append({
@@ -1884,7 +2311,7 @@ class ReportService(BaseDatabaseService):
                     if marks_data:
                         self.client.table("report_visit_marks").insert(marks_data).execute()
             
-            logger.info(f"Successfully updated report {report_id}")
+            logger.info("Successfully updated report %s", report_id)
             
             # Return updated report
             return self.get_by_id(report_id, user_id)
@@ -1897,7 +2324,7 @@ class ReportService(BaseDatabaseService):
     def delete(self, report_id: str, user_id: str) -> None:
         """Delete a report record (visit marks are CASCADE deleted)."""
         try:
-            logger.info(f"Deleting report {report_id} for user {user_id}")
+            logger.info("Deleting report %s for user %s", report_id, user_id)
             
             # Verify report exists and belongs to user
             self.get_by_id(report_id, user_id)
@@ -1911,7 +2338,7 @@ class ReportService(BaseDatabaseService):
                 .execute()
             )
             
-            logger.info(f"Successfully deleted report {report_id}")
+            logger.info("Successfully deleted report %s", report_id)
             
         except DatabaseServiceError:
             raise
@@ -1919,6 +2346,37 @@ class ReportService(BaseDatabaseService):
             self._handle_error("delete report", e)
 
 
+# ============================================================================
+# Org Settings Service
+# ============================================================================
+
+class OrgSettingsService(BaseDatabaseService):
+    """Service for per-user organization settings used on PDFs."""
+    
+    resource = "org_settings"
+    
+    def get(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetch org settings for a user.
+        
+        Org settings are optional, so a missing row or a failed lookup returns
+        None and callers fall back to template defaults.
+        """
+        try:
+            response = (
+                self.client.table("org_settings")
+                .select("*")
+                .eq("user_id", user_id)
+                .maybe_single()
+                .execute()
+            )
+            if response and response.data:
+                return response.data
+        except Exception as e:
+            logger.warning("Failed to fetch org settings for user %s: %s. Using defaults.", user_id, e)
+        return None
+
+
 # ============================================================================
 # Service Instances (Singleton pattern)
 # ============================================================================
@@ -1928,6 +2386,7 @@ _care_plan_service: Optional[CarePlanService] = None
 _soap_record_service: Optional[SOAPRecordService] = None
 _plan_service: Optional[PlanService] = None
 _report_service: Optional[ReportService] = None
+_org_settings_service: Optional[OrgSettingsService] = None
 
 
 def _get_patient_service() -> PatientService:
@@ -1970,6 +2429,14 @@ def _get_report_service() -> ReportService:
     return _report_service
 
 
+def _get_org_settings_service() -> OrgSettingsService:
+    """Get singleton OrgSettingsService instance."""
+    global _org_settings_service
+    if _org_settings_service is None:
+        _org_settings_service = OrgSettingsService()
+    return _org_settings_service
+
+
 # ============================================================================
 # Backward Compatibility: Module-level Functions
 # ============================================================================
@@ -1981,7 +2448,12 @@ def create_patient(*args, **kwargs) -> Dict[str, Any]:
     return _get_patient_service().create(*args, **kwargs)
 
 
-def get_patients(*args, **kwargs) -> list[Dict[str, Any]]:
+def bulk_create_patients(*args, **kwargs) -> list[Dict[str, Any]]:
+    """Create several patient records with multi-row inserts."""
+    return _get_patient_service().bulk_create(*args, **kwargs)
+
+
+def get_patients(*args, **kwargs) -> list[Mapping[str, Any]]:
     """Fetch all patients for a specific user."""
     return _get_patient_service().get_all(*args, **kwargs)
 
@@ -2007,11 +2479,21 @@ def create_care_plan(*args, **kwargs) -> Dict[str, Any]:
     return _get_care_plan_service().create(*args, **kwargs)
 
 
-def get_care_plans_by_patient(*args, **kwargs) -> list[Dict[str, Any]]:
+def get_care_plans_by_patient(*args, **kwargs) -> list[Mapping[str, Any]]:
     """Fetch all care plans for a specific patient."""
     return _get_care_plan_service().get_by_patient(*args, **kwargs)
 
 
+def iter_care_plans_by_patient(*args, **kwargs) -> Iterator[list[Dict[str, Any]]]:
+    """Fetch the care plans of a patient in batches."""
+    return _get_care_plan_service().iter_by_patient(*args, **kwargs)
+
+
+def get_care_plans_by_patients(*args, **kwargs) -> Dict[str, list[Dict[str, Any]]]:
+    """Fetch the care plans of several patients in one query, grouped by patient_id."""
+    return _get_care_plan_service().get_by_patients(*args, **kwargs)
+
+
 # SOAP Record Operations
 def save_soap_record(*args, **kwargs) -> Dict[str, Any]:
     """Save SOAP record to Supabase database."""
@@ -2023,6 +2505,16 @@ def get_soap_records(*args, **kwargs) -> list[Dict[str, Any]]:
     return _get_soap_record_service().get_all(*args, **kwargs)
 
 
+def get_soap_records_page(*args, **kwargs) -> tuple[list[Dict[str, Any]], int]:
+    """Fetch one page of a user's SOAP records plus the total match count."""
+    return _get_soap_record_service().get_page(*args, **kwargs)
+
+
+def get_soap_records_fingerprint(*args, **kwargs) -> tuple[int, Optional[str]]:
+    """Return (record count, newest updated_at) for a user's SOAP records."""
+    return _get_soap_record_service().get_fingerprint(*args, **kwargs)
+
+
 def get_soap_record_by_id(*args, **kwargs) -> Dict[str, Any]:
     """Fetch a single SOAP record by ID."""
     return _get_soap_record_service().get_by_id(*args, **kwargs)
@@ -2095,6 +2587,11 @@ def get_all_reports(*args, **kwargs) -> list[Dict[str, Any]]:
     return _get_report_service().get_all(*args, **kwargs)
 
 
+def iter_all_reports(*args, **kwargs) -> Iterator[list[Dict[str, Any]]]:
+    """Fetch all reports for a user in batches."""
+    return _get_report_service().iter_all(*args, **kwargs)
+
+
 def get_report_by_id(*args, **kwargs) -> Dict[str, Any]:
     """Fetch a single report by ID with visit marks."""
     return _get_report_service().get_by_id(*args, **kwargs)
@@ -2108,3 +2605,9 @@ def update_report(*args, **kwargs) -> Dict[str, Any]:
 def delete_report(*args, **kwargs) -> None:
     """Delete a report record."""
     return _get_report_service().delete(*args, **kwargs)
+
+
+# Org Settings Operations
+def get_org_settings(*args, **kwargs) -> Optional[Dict[str, Any]]:
+    """Fetch org settings for a user, or None if not configured."""
+    return _get_org_settings_service().get(*args, **kwargs)
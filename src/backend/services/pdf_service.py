@@ -1,10 +1,11 @@
 """PDF generation service for medical reports."""
 
+import io
 import logging
 import os
 import re
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+from typing import Any, BinaryIO, Dict, Optional
 
 from jinja2 import Environment, FileSystemLoader, TemplateNotFound
 from weasyprint import HTML, CSS
@@ -27,7 +28,7 @@ def get_template_env() -> Environment:
             loader=FileSystemLoader(template_dir),
             autoescape=True,
         )
-        logger.info(f"Jinja2 template environment initialized with template dir: {template_dir}")
+        logger.info("Jinja2 template environment initialized with template dir: %s", template_dir)
     
     return _template_env
 
@@ -43,7 +44,7 @@ def get_css_path() -> str:
     css_path = os.path.join(template_dir, 'pdf.css')
     
     if not os.path.exists(css_path):
-        logger.warning(f"PDF CSS file not found at: {css_path}")
+        logger.warning("PDF CSS file not found at: %s", css_path)
     
     return os.path.abspath(css_path)
 
@@ -59,7 +60,7 @@ def get_plan_css_path() -> str:
     css_path = os.path.join(template_dir, 'plan.css')
     
     if not os.path.exists(css_path):
-        logger.warning(f"Plan CSS file not found at: {css_path}")
+        logger.warning("Plan CSS file not found at: %s", css_path)
     
     return os.path.abspath(css_path)
 
@@ -282,15 +283,31 @@ def generate_visit_report_pdf(record_data: Dict[str, Any]) -> bytes:
     """
     Generate visit report PDF (精神科訪問看護記録書Ⅱ).
     
-    This function uses WeasyPrint with embedded Japanese fonts to ensure
-    proper rendering of Japanese medical text in the PDF.
-    
     Args:
         record_data: Full SOAP record dictionary from database
         
     Returns:
         PDF file content as bytes with embedded Japanese fonts
         
+    Raises:
+        PDFServiceError: If PDF generation fails
+    """
+    buffer = io.BytesIO()
+    write_visit_report_pdf(record_data, buffer)
+    return buffer.getvalue()
+
+
+def write_visit_report_pdf(record_data: Dict[str, Any], target: BinaryIO) -> None:
+    """
+    Render visit report PDF (精神科訪問看護記録書Ⅱ) into a writable binary stream.
+    
+    This function uses WeasyPrint with embedded Japanese fonts to ensure
+    proper rendering of Japanese medical text in the PDF.
+    
+    Args:
+        record_data: Full SOAP record dictionary from database
+        target: Writable binary file object the PDF is written to
+        
     Raises:
         PDFServiceError: If PDF generation fails
     """
@@ -304,7 +321,7 @@ def generate_visit_report_pdf(record_data: Dict[str, Any]) -> bytes:
                 f"Please download IPAexGothic.ttf and place it in the fonts directory."
             )
         else:
-            logger.info(f"Japanese font verified at: {font_path}")
+            logger.info("Japanese font verified at: %s", font_path)
         
         template_env = get_template_env()
         
@@ -366,15 +383,15 @@ def generate_visit_report_pdf(record_data: Dict[str, Any]) -> bytes:
         
         # Generate PDF with CSS (contains @font-face for Japanese fonts)
         # Use CSS(string=...) with dynamically generated CSS content
-        pdf_bytes = html_obj.write_pdf(
+        html_obj.write_pdf(
+            target,
             stylesheets=[CSS(string=css_content)]
         )
         
-        logger.info(f"Successfully generated visit report PDF ({len(pdf_bytes)} bytes)")
-        return pdf_bytes
+        logger.info("Successfully generated visit report PDF (%s bytes)", target.tell())
         
     except Exception as e:
-        logger.error(f"Error generating visit report PDF: {e}")
+        logger.error("Error generating visit report PDF: %s", e)
         raise PDFServiceError(f"Failed to generate visit report PDF: {str(e)}") from e
 
 
@@ -408,7 +425,7 @@ def generate_monthly_report_pdf(patient_id: str, patient_name: str, month: str,
                 f"Please download IPAexGothic.ttf and place it in the fonts directory."
             )
         else:
-            logger.info(f"Japanese font verified at: {font_path}")
+            logger.info("Japanese font verified at: %s", font_path)
         
         template_env = get_template_env()
         
@@ -498,11 +515,11 @@ def generate_monthly_report_pdf(patient_id: str, patient_name: str, month: str,
             stylesheets=[CSS(filename=css_path)]
         )
         
-        logger.info(f"Successfully generated monthly report PDF ({len(pdf_bytes)} bytes)")
+        logger.info("Successfully generated monthly report PDF (%s bytes)", len(pdf_bytes))
         return pdf_bytes
         
     except Exception as e:
-        logger.error(f"Error generating monthly report PDF: {e}")
+        logger.error("Error generating monthly report PDF: %s", e)
         raise PDFServiceError(f"Failed to generate monthly report PDF: {str(e)}") from e
 
 
@@ -639,7 +656,7 @@ def generate_patient_record_pdf(patient_data: Dict[str, Any]) -> bytes:
                 f"Please download IPAexGothic.ttf and place it in the fonts directory."
             )
         else:
-            logger.info(f"Japanese font verified at: {font_path}")
+            logger.info("Japanese font verified at: %s", font_path)
         
         template_env = get_template_env()
         
@@ -667,11 +684,11 @@ def generate_patient_record_pdf(patient_data: Dict[str, Any]) -> bytes:
             stylesheets=[CSS(filename=css_path)]
         )
         
-        logger.info(f"Successfully generated patient record PDF ({len(pdf_bytes)} bytes)")
+        logger.info("Successfully generated patient record PDF (%s bytes)", len(pdf_bytes))
         return pdf_bytes
         
     except Exception as e:
-        logger.error(f"Error generating patient record PDF: {e}")
+        logger.error("Error generating patient record PDF: %s", e)
         raise PDFServiceError(f"Failed to generate patient record PDF: {str(e)}") from e
 
 
@@ -819,7 +836,7 @@ def generate_plan_pdf(plan_data: Dict[str, Any], patient_data: Dict[str, Any], o
                 f"Please download IPAexGothic.ttf and place it in the fonts directory."
             )
         else:
-            logger.info(f"Japanese font verified at: {font_path}")
+            logger.info("Japanese font verified at: %s", font_path)
         
         template_env = get_template_env()
         
@@ -847,11 +864,11 @@ def generate_plan_pdf(plan_data: Dict[str, Any], patient_data: Dict[str, Any], o
             stylesheets=[CSS(filename=css_path)]
         )
         
-        logger.info(f"Successfully generated plan PDF ({len(pdf_bytes)} bytes)")
+        logger.info("Successfully generated plan PDF (%s bytes)", len(pdf_bytes))
         return pdf_bytes
         
     except Exception as e:
-        logger.error(f"Error generating plan PDF: {e}")
+        logger.error("Error generating plan PDF: %s", e)
         raise PDFServiceError(f"Failed to generate plan PDF: {str(e)}") from e
 
 
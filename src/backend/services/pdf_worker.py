@@ -0,0 +1,68 @@
+"""Process pool that renders PDFs outside the API worker's interpreter."""
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Global render pool, created on first use
+_pdf_pool: Optional[ProcessPoolExecutor] = None
+_pdf_pool_lock = threading.Lock()
+
+
+def get_pdf_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Get or create the PDF render pool (thread-safe singleton).
+
+    Returns None when PDF_RENDER_PROCESSES is 0, in which case renders run
+    on the default thread executor instead.
+    """
+    global _pdf_pool
+
+    if settings.PDF_RENDER_PROCESSES <= 0:
+        return None
+    if _pdf_pool is None:
+        with _pdf_pool_lock:
+            if _pdf_pool is None:
+                # spawn, not fork: the API process has live threads and sockets
+                _pdf_pool = ProcessPoolExecutor(
+                    max_workers=settings.PDF_RENDER_PROCESSES,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                logger.info("PDF render pool started with %d processes", settings.PDF_RENDER_PROCESSES)
+    return _pdf_pool
+
+
+async def run_pdf_job(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a PDF render function in the render pool and await its result.
+
+    WeasyPrint layout is pure-Python CPU work that holds the GIL, so a thread
+    offload still slows every other request on the same worker. In a separate
+    process it does not. ``fn`` must be a module-level function and its
+    arguments and result must be picklable (plain dicts, str, bytes).
+    """
+    pool = get_pdf_pool()
+    if pool is None:
+        return await asyncio.to_thread(fn, *args, **kwargs)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(pool, functools.partial(fn, *args, **kwargs))
+
+
+def shutdown_pdf_pool() -> None:
+    """Stop the render pool's processes, if it was started."""
+    global _pdf_pool
+
+    with _pdf_pool_lock:
+        if _pdf_pool is not None:
+            _pdf_pool.shutdown(wait=False, cancel_futures=True)
+            _pdf_pool = None
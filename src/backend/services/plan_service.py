@@ -59,7 +59,7 @@ def calculate_visit_duration_minutes(start_time: Optional[str], end_time: Option
         return duration
         
     except (ValueError, IndexError) as e:
-        logger.warning(f"Error parsing visit times: start_time={start_time}, end_time={end_time}, error={e}")
+        logger.warning("Error parsing visit times: start_time=%s, end_time=%s, error=%s", start_time, end_time, e)
         return None
 
 
@@ -111,14 +111,14 @@ def auto_evaluate_plan(plan_id: str, user_id: str) -> Dict[str, Any]:
         plan = get_plan_by_id(plan_id, user_id)
         
         if not plan.get("evaluations"):
-            logger.warning(f"Plan {plan_id} has no evaluations to update")
+            logger.warning("Plan %s has no evaluations to update", plan_id)
             return plan
         
         # Get SOAP records for this plan
         soap_records = get_soap_records_for_plan(plan_id, user_id)
         
         if not soap_records:
-            logger.info(f"No SOAP records found for plan {plan_id}")
+            logger.info("No SOAP records found for plan %s", plan_id)
             return plan
         
         # Calculate durations and determine results
@@ -191,14 +191,14 @@ def auto_evaluate_plan(plan_id: str, user_id: str) -> Dict[str, Any]:
                 evaluations=updated_evaluations,
             )
             
-            logger.info(f"Auto-evaluated plan {plan_id}: updated {len(updated_evaluations)} evaluations")
+            logger.info("Auto-evaluated plan %s: updated %s evaluations", plan_id, len(updated_evaluations))
         else:
-            logger.info(f"No evaluations updated for plan {plan_id}")
+            logger.info("No evaluations updated for plan %s", plan_id)
         
         return plan
         
     except DatabaseServiceError:
         raise
     except Exception as e:
-        logger.error(f"Error auto-evaluating plan: {e}")
+        logger.error("Error auto-evaluating plan: %s", e)
         raise PlanServiceError(f"Failed to auto-evaluate plan: {str(e)}") from e
@@ -24,7 +24,7 @@ def get_template_env() -> Environment:
             loader=FileSystemLoader(template_dir),
             autoescape=True,
         )
-        logger.info(f"Jinja2 template environment initialized with template dir: {template_dir}")
+        logger.info("Jinja2 template environment initialized with template dir: %s", template_dir)
     
     return _template_env
 
@@ -40,7 +40,7 @@ def get_report_css_path() -> str:
     css_path = os.path.join(template_dir, 'report.css')
     
     if not os.path.exists(css_path):
-        logger.warning(f"Report CSS file not found at: {css_path}")
+        logger.warning("Report CSS file not found at: %s", css_path)
     
     return os.path.abspath(css_path)
 
@@ -322,7 +322,7 @@ def generate_report_pdf(
                 f"Please download IPAexGothic.ttf and place it in the fonts directory."
             )
         else:
-            logger.info(f"Japanese font verified at: {font_path}")
+            logger.info("Japanese font verified at: %s", font_path)
         
         template_env = get_template_env()
         
@@ -350,7 +350,7 @@ def generate_report_pdf(
                 f"url('file:///{font_path.replace(os.sep, '/')}')"
             )
         except Exception as e:
-            logger.warning(f"Could not read CSS file, using default: {e}")
+            logger.warning("Could not read CSS file, using default: %s", e)
             css_content = None
         
         # Convert HTML to PDF using WeasyPrint with embedded fonts
@@ -368,11 +368,11 @@ def generate_report_pdf(
         # Generate PDF
         pdf_bytes = html_obj.write_pdf(stylesheets=[css_obj])
         
-        logger.info(f"Successfully generated report PDF ({len(pdf_bytes)} bytes)")
+        logger.info("Successfully generated report PDF (%s bytes)", len(pdf_bytes))
         return pdf_bytes
         
     except ReportPDFServiceError:
         raise
     except Exception as e:
-        logger.error(f"Error generating report PDF: {e}", exc_info=True)
+        logger.error("Error generating report PDF: %s", e, exc_info=True)
         raise ReportPDFServiceError(f"Failed to generate report PDF: {str(e)}") from e
@@ -56,7 +56,7 @@ def generate_visit_marks(
         )
         
         if not soap_response or not hasattr(soap_response, 'data') or not soap_response.data:
-            logger.info(f"No SOAP records found for patient {patient_id} in period {period_start} to {period_end}")
+            logger.info("No SOAP records found for patient %s in period %s to %s", patient_id, period_start, period_end)
             return
         
         # Group visits by date and calculate marks
@@ -124,25 +124,25 @@ def generate_visit_marks(
                         ).eq("user_id", user_id).execute()
                     except Exception as e:
                         # Log but continue - mark might not exist
-                        logger.debug(f"Could not delete mark {mark_type} for date {date}: {e}")
+                        logger.debug("Could not delete mark %s for date %s: %s", mark_type, date, e)
             
             # Insert new marks
             if marks_to_insert:
                 try:
                     supabase.table("report_visit_marks").insert(marks_to_insert).execute()
-                    logger.info(f"Generated {len(marks_to_insert)} visit marks for report {report_id}")
+                    logger.info("Generated %s visit marks for report %s", len(marks_to_insert), report_id)
                 except Exception as insert_error:
-                    logger.error(f"Failed to insert visit marks: {insert_error}")
+                    logger.error("Failed to insert visit marks: %s", insert_error)
                     # Don't raise - marks generation failure shouldn't break report creation
                     raise ReportServiceError(f"Failed to insert visit marks: {str(insert_error)}") from insert_error
         else:
-            logger.info(f"No marks to generate for report {report_id}")
+            logger.info("No marks to generate for report %s", report_id)
             
     except ReportServiceError:
         # Re-raise ReportServiceError as-is
         raise
     except Exception as e:
-        logger.error(f"Error generating visit marks: {e}", exc_info=True)
+        logger.error("Error generating visit marks: %s", e, exc_info=True)
         raise ReportServiceError(f"Failed to generate visit marks: {str(e)}") from e
 
 
@@ -164,7 +164,7 @@ def regenerate_report_marks(
     """
     try:
         # Import here to avoid circular dependency
-        from services.database_service import get_supabase_client, DatabaseServiceError
+        from services.database_service import get_supabase_client, NotFoundError
         
         # Fetch report directly to avoid circular import
         supabase = get_supabase_client()
@@ -178,7 +178,7 @@ def regenerate_report_marks(
         )
         
         if not report_response or not hasattr(report_response, 'data') or not report_response.data:
-            raise DatabaseServiceError(f"Report {report_id} not found")
+            raise NotFoundError(f"Report {report_id} not found", resource="report")
         
         report = report_response.data
         
@@ -205,7 +205,7 @@ def regenerate_report_marks(
             ])
             
             if has_content:
-                logger.info(f"Report {report_id} has content, skipping mark regeneration (use force=True to override)")
+                logger.info("Report %s has content, skipping mark regeneration (use force=True to override)", report_id)
                 return report
         
         # Regenerate marks
@@ -260,7 +260,7 @@ def regenerate_report_marks(
                             "disease_progress_text": progress_text
                         }).eq("id", report_id).eq("user_id", user_id).execute()
             except Exception as e:
-                logger.warning(f"Failed to regenerate disease_progress_text: {e}")
+                logger.warning("Failed to regenerate disease_progress_text: %s", e)
         
         # Return updated report by fetching it again
         report_response = (
@@ -273,7 +273,7 @@ def regenerate_report_marks(
         )
         
         if not report_response or not hasattr(report_response, 'data') or not report_response.data:
-            raise DatabaseServiceError(f"Report {report_id} not found")
+            raise NotFoundError(f"Report {report_id} not found", resource="report")
         
         report = report_response.data
         
@@ -291,7 +291,7 @@ def regenerate_report_marks(
         return report
         
     except Exception as e:
-        if isinstance(e, ReportServiceError):
+        if isinstance(e, (ReportServiceError, NotFoundError)):
             raise
-        logger.error(f"Error regenerating report marks: {e}")
+        logger.error("Error regenerating report marks: %s", e)
         raise ReportServiceError(f"Failed to regenerate report marks: {str(e)}") from e
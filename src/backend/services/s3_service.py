@@ -1,23 +1,34 @@
 """S3 service for PDF storage and presigned URL generation."""
 
 import logging
-from typing import Optional
+import threading
+from typing import Dict, Optional
 
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 from config import settings
+from utils.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
 # Global S3 client instance
 _s3_client: Optional[boto3.client] = None
+_s3_client_lock = threading.Lock()
+
+# Default-lifetime presigned URLs by S3 key. An entry is reused for at most half the
+# URL's lifetime, so a cached URL always has at least that much validity left.
+_presigned_url_cache = TTLCache(ttl=settings.AWS_S3_PRESIGNED_URL_EXPIRATION // 2, maxsize=1024)
 
 
 def get_s3_client() -> boto3.client:
     """
     Get or create S3 client instance.
     
+    The client is shared by the worker threads that run S3 calls (endpoints
+    use asyncio.to_thread), so its connection pool is sized to match.
+    
     Returns:
         Boto3 S3 client instance.
         
@@ -26,21 +37,29 @@ def get_s3_client() -> boto3.client:
     """
     global _s3_client
     
-    if _s3_client is None:
-        if not settings.AWS_ACCESS_KEY_ID:
-            raise ValueError("AWS_ACCESS_KEY_ID environment variable is required.")
-        if not settings.AWS_SECRET_ACCESS_KEY:
-            raise ValueError("AWS_SECRET_ACCESS_KEY environment variable is required.")
-        if not settings.AWS_S3_BUCKET_NAME:
-            raise ValueError("AWS_S3_BUCKET_NAME environment variable is required.")
-        
-        _s3_client = boto3.client(
-            's3',
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_REGION,
-        )
-        logger.info("S3 client initialized")
+    if _s3_client is not None:
+        return _s3_client
+    
+    with _s3_client_lock:
+        if _s3_client is None:
+            if not settings.AWS_ACCESS_KEY_ID:
+                raise ValueError("AWS_ACCESS_KEY_ID environment variable is required.")
+            if not settings.AWS_SECRET_ACCESS_KEY:
+                raise ValueError("AWS_SECRET_ACCESS_KEY environment variable is required.")
+            if not settings.AWS_S3_BUCKET_NAME:
+                raise ValueError("AWS_S3_BUCKET_NAME environment variable is required.")
+            
+            _s3_client = boto3.client(
+                's3',
+                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+                region_name=settings.AWS_REGION,
+                config=Config(
+                    max_pool_connections=settings.AWS_S3_MAX_POOL_CONNECTIONS,
+                    retries={"mode": "standard"},
+                ),
+            )
+            logger.info("S3 client initialized")
     
     return _s3_client
 
@@ -50,13 +69,14 @@ class S3ServiceError(Exception):
     pass
 
 
-def upload_pdf_to_s3(file_content: bytes, s3_key: str) -> str:
+def upload_pdf_to_s3(file_content: bytes, s3_key: str, metadata: Optional[Dict[str, str]] = None) -> str:
     """
     Upload PDF file to S3.
     
     Args:
         file_content: PDF file content as bytes
         s3_key: S3 object key (path) where the file will be stored
+        metadata: Optional user metadata stored with the object (ASCII values)
         
     Returns:
         S3 object key (path) where the file was stored.
@@ -67,30 +87,79 @@ def upload_pdf_to_s3(file_content: bytes, s3_key: str) -> str:
     try:
         s3_client = get_s3_client()
         
-        logger.info(f"Uploading PDF to S3: {s3_key}")
+        logger.info("Uploading PDF to S3: %s", s3_key)
         
         s3_client.put_object(
             Bucket=settings.AWS_S3_BUCKET_NAME,
             Key=s3_key,
             Body=file_content,
             ContentType='application/pdf',
+            Metadata=metadata or {},
         )
         
-        logger.info(f"Successfully uploaded PDF to S3: {s3_key}")
+        logger.info("Successfully uploaded PDF to S3: %s", s3_key)
         return s3_key
         
     except ClientError as e:
-        logger.error(f"S3 client error uploading PDF: {e}")
+        logger.error("S3 client error uploading PDF: %s", e)
         raise S3ServiceError(f"Failed to upload PDF to S3: {str(e)}") from e
     except Exception as e:
-        logger.error(f"Unexpected error uploading PDF to S3: {e}")
+        logger.error("Unexpected error uploading PDF to S3: %s", e)
         raise S3ServiceError(f"Failed to upload PDF to S3: {str(e)}") from e
 
 
+def get_object_metadata(s3_key: str) -> Optional[Dict[str, str]]:
+    """
+    Fetch the user metadata of an object in the PDF bucket without downloading it.
+    
+    Args:
+        s3_key: S3 object key (path) of the file
+        
+    Returns:
+        The object's user metadata, or None if the object does not exist.
+        
+    Raises:
+        S3ServiceError: If the lookup fails for a reason other than a missing object.
+    """
+    try:
+        s3_client = get_s3_client()
+        response = s3_client.head_object(Bucket=settings.AWS_S3_BUCKET_NAME, Key=s3_key)
+        return response.get("Metadata", {})
+        
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+            return None
+        logger.error("S3 client error checking object: %s", e)
+        raise S3ServiceError(f"Failed to check S3 object: {str(e)}") from e
+    except Exception as e:
+        logger.error("Unexpected error checking S3 object: %s", e)
+        raise S3ServiceError(f"Failed to check S3 object: {str(e)}") from e
+
+
+def object_exists(s3_key: str) -> bool:
+    """
+    Check whether an object already exists in the PDF bucket.
+    
+    Args:
+        s3_key: S3 object key (path) of the file
+        
+    Returns:
+        True if the object exists, False otherwise.
+        
+    Raises:
+        S3ServiceError: If the check fails for a reason other than a missing object.
+    """
+    return get_object_metadata(s3_key) is not None
+
+
 def generate_presigned_url(s3_key: str, expiration: Optional[int] = None) -> str:
     """
     Generate a presigned URL for downloading a PDF from S3.
     
+    Signing is local (no request to S3), so this is safe to call directly
+    from async endpoints. URLs are cached for half their lifetime, so repeated
+    downloads of the same PDF skip re-signing.
+    
     Args:
         s3_key: S3 object key (path) of the file
         expiration: URL expiration time in seconds (default: from settings)
@@ -101,12 +170,18 @@ def generate_presigned_url(s3_key: str, expiration: Optional[int] = None) -> str
     Raises:
         S3ServiceError: If presigned URL generation fails.
     """
+    expiration_time = expiration or settings.AWS_S3_PRESIGNED_URL_EXPIRATION
+    # Only default-lifetime URLs are cached; the cache TTL is derived from it
+    cacheable = expiration_time == settings.AWS_S3_PRESIGNED_URL_EXPIRATION
+    if cacheable:
+        cached = _presigned_url_cache.get(s3_key)
+        if cached is not None:
+            return cached
+    
     try:
         s3_client = get_s3_client()
         
-        expiration_time = expiration or settings.AWS_S3_PRESIGNED_URL_EXPIRATION
-        
-        logger.info(f"Generating presigned URL for S3 key: {s3_key}, expiration: {expiration_time}s")
+        logger.info("Generating presigned URL for S3 key: %s, expiration: %ss", s3_key, expiration_time)
         
         presigned_url = s3_client.generate_presigned_url(
             'get_object',
@@ -117,14 +192,16 @@ def generate_presigned_url(s3_key: str, expiration: Optional[int] = None) -> str
             ExpiresIn=expiration_time,
         )
         
-        logger.info(f"Successfully generated presigned URL for {s3_key}")
+        logger.info("Successfully generated presigned URL for %s", s3_key)
+        if cacheable:
+            _presigned_url_cache.set(s3_key, presigned_url)
         return presigned_url
         
     except ClientError as e:
-        logger.error(f"S3 client error generating presigned URL: {e}")
+        logger.error("S3 client error generating presigned URL: %s", e)
         raise S3ServiceError(f"Failed to generate presigned URL: {str(e)}") from e
     except Exception as e:
-        logger.error(f"Unexpected error generating presigned URL: {e}")
+        logger.error("Unexpected error generating presigned URL: %s", e)
         raise S3ServiceError(f"Failed to generate presigned URL: {str(e)}") from e
 
 
@@ -0,0 +1,80 @@
+"""Tests for write admission control."""
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from middleware.admission import OVERLOADED_DETAIL, AdmissionControlMiddleware
+
+
+def make_app(release: asyncio.Event, queue_timeout: float = 0.05) -> FastAPI:
+    """App whose patient create blocks until release is set."""
+    app = FastAPI()
+    app.add_middleware(AdmissionControlMiddleware, limit=1, queue_timeout=queue_timeout)
+
+    @app.post("/patients")
+    async def create_patient():
+        await release.wait()
+        return {"ok": True}
+
+    @app.get("/patients")
+    async def list_patients():
+        return {"patients": []}
+
+    return app
+
+
+async def send_while_slot_taken(method: str, path: str, queue_timeout: float = 0.05):
+    """Send a request while another POST /patients holds the only slot."""
+    release = asyncio.Event()
+    transport = httpx.ASGITransport(app=make_app(release, queue_timeout))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        first = asyncio.create_task(client.post("/patients"))
+        await asyncio.sleep(0.01)
+        response = await client.request(method, path)
+        release.set()
+        assert (await first).status_code == 200
+    return response
+
+
+class TestAdmissionControl:
+    """Tests for AdmissionControlMiddleware."""
+
+    def test_write_past_limit_gets_503_with_retry_after(self):
+        """Test that a queued write times out with 503 and Retry-After."""
+        response = asyncio.run(send_while_slot_taken("POST", "/patients"))
+        assert response.status_code == 503
+        assert response.json() == {"detail": OVERLOADED_DETAIL}
+        assert response.headers["retry-after"] == "1"
+
+    def test_retry_after_follows_queue_timeout(self):
+        """Test that Retry-After is the queue timeout rounded to whole seconds."""
+        response = asyncio.run(send_while_slot_taken("PATCH", "/patients/p-1", queue_timeout=1.6))
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "2"
+
+    def test_reads_are_not_limited(self):
+        """Test that GET requests pass while the write slot is taken."""
+        response = asyncio.run(send_while_slot_taken("GET", "/patients"))
+        assert response.status_code == 200
+
+    def test_queued_write_runs_when_slot_frees(self):
+        """Test that a write waiting within the timeout is served."""
+        async def run():
+            release = asyncio.Event()
+            transport = httpx.ASGITransport(app=make_app(release, queue_timeout=5))
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                first = asyncio.create_task(client.post("/patients"))
+                await asyncio.sleep(0.01)
+                second = asyncio.create_task(client.post("/patients"))
+                await asyncio.sleep(0.01)
+                release.set()
+                return (await first).status_code, (await second).status_code
+
+        assert asyncio.run(run()) == (200, 200)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
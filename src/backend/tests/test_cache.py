@@ -0,0 +1,82 @@
+"""Tests for the in-process TTL cache."""
+
+import pytest
+
+from utils import cache as cache_module
+from utils.cache import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable replacement for time.monotonic inside utils.cache."""
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+class TestTTLCache:
+    """Tests for TTLCache expiry, eviction and invalidation."""
+
+    def test_get_returns_stored_value(self, clock):
+        """Test that a stored value is returned before the TTL passes."""
+        cache = TTLCache(ttl=30)
+        cache.set("a", 1)
+        clock[0] += 29
+        assert cache.get("a") == 1
+
+    def test_entry_expires_after_ttl(self, clock):
+        """Test that an entry is gone once its TTL has passed."""
+        cache = TTLCache(ttl=30)
+        cache.set("a", 1)
+        clock[0] += 30
+        assert cache.get("a") is None
+
+    def test_zero_ttl_disables_cache(self, clock):
+        """Test that a TTL of 0 stores nothing."""
+        cache = TTLCache(ttl=0)
+        cache.set("a", 1)
+        assert cache.enabled is False
+        assert cache.get("a") is None
+
+    def test_least_recently_used_entry_is_evicted(self, clock):
+        """Test that maxsize evicts the least recently read entry."""
+        cache = TTLCache(ttl=30, maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_invalidate_drops_single_key(self, clock):
+        """Test that invalidate removes only the given key."""
+        cache = TTLCache(ttl=30)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.invalidate("a")
+        cache.invalidate("missing")
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+
+    def test_invalidate_where_drops_matching_keys(self, clock):
+        """Test that invalidate_where removes every key matching the predicate."""
+        cache = TTLCache(ttl=30)
+        cache.set(("user-1", None), [1])
+        cache.set(("user-1", "active"), [2])
+        cache.set(("user-2", None), [3])
+        cache.invalidate_where(lambda key: key[0] == "user-1")
+        assert cache.get(("user-1", None)) is None
+        assert cache.get(("user-1", "active")) is None
+        assert cache.get(("user-2", None)) == [3]
+
+    def test_clear_drops_everything(self, clock):
+        """Test that clear empties the cache."""
+        cache = TTLCache(ttl=30)
+        cache.set("a", 1)
+        cache.clear()
+        assert cache.get("a") is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
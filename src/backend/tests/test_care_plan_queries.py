@@ -0,0 +1,90 @@
+"""Tests for the care plan queries sent to PostgREST."""
+
+import httpx
+import pytest
+from postgrest import SyncPostgrestClient
+
+from services import database_service
+from services.database_service import CarePlanService
+
+ORDER = "start_date.desc.nullslast,created_at.desc"
+
+
+class PostgrestClient:
+    """Supabase client double backed by a real PostgREST client.
+
+    Queries are built by postgrest's own request builders and sent through
+    an httpx mock transport that records them and answers with canned rows.
+    """
+
+    def __init__(self, *pages):
+        self.pages = list(pages)
+        self.requests = []
+        http_client = httpx.Client(
+            base_url="http://postgrest.test/rest/v1",
+            transport=httpx.MockTransport(self.handle),
+        )
+        self.postgrest = SyncPostgrestClient("http://postgrest.test/rest/v1", http_client=http_client)
+
+    def handle(self, request):
+        self.requests.append(request)
+        return httpx.Response(200, json=self.pages.pop(0) if self.pages else [])
+
+    def table(self, name):
+        return self.postgrest.from_(name)
+
+
+def make_service(*pages):
+    """CarePlanService whose queries go through a recorded PostgREST client."""
+    service = CarePlanService()
+    service._client = PostgrestClient(*pages)
+    return service
+
+
+@pytest.fixture(autouse=True)
+def care_plan_cache():
+    """Start every test with an empty care plan list cache."""
+    database_service._care_plan_list_cache.clear()
+    yield
+    database_service._care_plan_list_cache.clear()
+
+
+class TestCarePlanQueries:
+    """Tests for CarePlanService list queries."""
+
+    def test_get_by_patient_orders_undated_plans_last(self):
+        """Test that the per-patient list sorts start_date DESC with NULLs last."""
+        service = make_service([{"id": "cp-1", "patient_id": "p-1"}])
+        assert service.get_by_patient("user-1", "p-1", status="active") == [{"id": "cp-1", "patient_id": "p-1"}]
+        params = service.client.requests[0].url.params
+        assert params["order"] == ORDER
+        assert params["user_id"] == "eq.user-1"
+        assert params["patient_id"] == "eq.p-1"
+        assert params["status"] == "eq.active"
+
+    def test_iter_by_patient_pages_in_stable_order(self):
+        """Test that each batch is a ranged request with an id tie-breaker."""
+        service = make_service([{"id": "cp-1"}, {"id": "cp-2"}], [{"id": "cp-3"}])
+        batches = list(service.iter_by_patient("user-1", "p-1", batch_size=2))
+        assert batches == [[{"id": "cp-1"}, {"id": "cp-2"}], [{"id": "cp-3"}]]
+        first, second = service.client.requests
+        assert first.url.params["order"] == ORDER + ",id.asc"
+        assert (first.url.params["offset"], first.url.params["limit"]) == ("0", "2")
+        assert (second.url.params["offset"], second.url.params["limit"]) == ("2", "2")
+
+    def test_get_by_patients_groups_rows_by_patient(self):
+        """Test that the batch query filters on all patients and groups the rows."""
+        rows = [
+            {"id": "cp-1", "patient_id": "p-2"},
+            {"id": "cp-2", "patient_id": "p-1"},
+        ]
+        service = make_service(rows)
+        grouped = service.get_by_patients("user-1", ["p-1", "p-2", "p-3"])
+        assert grouped == {"p-1": [rows[1]], "p-2": [rows[0]], "p-3": []}
+        params = service.client.requests[0].url.params
+        assert params["order"] == ORDER
+        assert params["patient_id"] == "in.(p-1,p-2,p-3)"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,106 @@
+"""Tests for the translate_errors decorator."""
+
+import asyncio
+import inspect
+
+import pytest
+from fastapi import HTTPException
+
+from api.error_mapping import translate_errors
+from services.database_service import DatabaseServiceError, InvalidStatusError, NotFoundError
+
+ERRORS = {
+    NotFoundError: (404, "見つかりません"),
+    InvalidStatusError: (400, None),
+    DatabaseServiceError: (503, "DB"),
+    Exception: (500, "エラー"),
+}
+
+
+def raising(exc):
+    """Build a sync endpoint that raises exc."""
+    @translate_errors(ERRORS)
+    def endpoint(record_id: str):
+        raise exc
+
+    return endpoint
+
+
+class TestTranslateErrors:
+    """Tests for exception-to-HTTPException mapping."""
+
+    def test_most_specific_class_wins(self):
+        """Test that a subclass entry is used over its base classes."""
+        with pytest.raises(HTTPException) as info:
+            raising(NotFoundError("missing", "patient"))("1")
+        assert (info.value.status_code, info.value.detail) == (404, "見つかりません")
+
+    def test_base_class_entry_catches_subclass(self):
+        """Test that an unmapped subclass falls back to its nearest mapped base."""
+        class OtherDatabaseError(DatabaseServiceError):
+            pass
+
+        with pytest.raises(HTTPException) as info:
+            raising(OtherDatabaseError("boom"))("1")
+        assert (info.value.status_code, info.value.detail) == (503, "DB")
+
+    def test_catch_all_maps_unexpected_errors(self):
+        """Test that Exception in the mapping turns anything else into a 500."""
+        with pytest.raises(HTTPException) as info:
+            raising(KeyError("x"))("1")
+        assert (info.value.status_code, info.value.detail) == (500, "エラー")
+
+    def test_none_detail_sends_exception_message(self):
+        """Test that a None detail uses the exception's message."""
+        with pytest.raises(HTTPException) as info:
+            raising(InvalidStatusError("Invalid status"))("1")
+        assert (info.value.status_code, info.value.detail) == (400, "Invalid status")
+
+    def test_http_exception_passes_through(self):
+        """Test that HTTPExceptions raised by the endpoint are not remapped."""
+        with pytest.raises(HTTPException) as info:
+            raising(HTTPException(status_code=409, detail="conflict"))("1")
+        assert (info.value.status_code, info.value.detail) == (409, "conflict")
+
+    def test_unmapped_exception_propagates(self):
+        """Test that exceptions outside the mapping are left alone."""
+        @translate_errors({NotFoundError: (404, "見つかりません")})
+        def endpoint():
+            raise ValueError("bad")
+
+        with pytest.raises(ValueError):
+            endpoint()
+
+    def test_original_exception_is_chained(self):
+        """Test that the HTTPException keeps the service error as its cause."""
+        error = NotFoundError("missing", "patient")
+        with pytest.raises(HTTPException) as info:
+            raising(error)("1")
+        assert info.value.__cause__ is error
+
+    def test_async_endpoint_is_wrapped(self):
+        """Test that async endpoints stay coroutines and are translated."""
+        @translate_errors(ERRORS)
+        async def endpoint(record_id: str):
+            raise NotFoundError("missing", "report")
+
+        assert inspect.iscoroutinefunction(endpoint)
+        with pytest.raises(HTTPException) as info:
+            asyncio.run(endpoint("1"))
+        assert info.value.status_code == 404
+
+    def test_signature_is_preserved(self):
+        """Test that FastAPI still sees the endpoint's own parameters."""
+        assert list(inspect.signature(raising(KeyError())).parameters) == ["record_id"]
+
+    def test_return_value_passes_through(self):
+        """Test that a successful call returns the endpoint's result."""
+        @translate_errors(ERRORS)
+        def endpoint():
+            return {"ok": True}
+
+        assert endpoint() == {"ok": True}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,113 @@
+"""Tests for ETag helpers and conditional GET handling."""
+
+import pytest
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+
+from api.etag import compute_etag, not_modified, row_etag, rows_etag
+
+
+def make_request(if_none_match=None):
+    """Build a bare Request with an optional If-None-Match header."""
+    headers = [] if if_none_match is None else [(b"if-none-match", if_none_match.encode())]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+class TestComputeEtag:
+    """Tests for ETag construction."""
+
+    def test_etag_is_weak_and_stable(self):
+        """Test that the same parts always give the same weak ETag."""
+        etag = compute_etag("id-1", "2024-01-01T00:00:00+00:00")
+        assert etag.startswith('W/"')
+        assert etag == compute_etag("id-1", "2024-01-01T00:00:00+00:00")
+
+    def test_etag_changes_with_parts(self):
+        """Test that changing or moving a part changes the ETag."""
+        assert compute_etag("a", "b") != compute_etag("a", "c")
+        assert compute_etag("ab", "c") != compute_etag("a", "bc")
+
+    def test_row_etag_uses_updated_at_then_created_at(self):
+        """Test that row_etag follows updated_at and falls back to created_at."""
+        row = {"id": "1", "created_at": "c", "updated_at": "u1"}
+        assert row_etag(row) != row_etag({**row, "updated_at": "u2"})
+        assert row_etag({"id": "1", "created_at": "c"}) == compute_etag("1", "c")
+
+    def test_rows_etag_includes_extra_parts(self):
+        """Test that query parts such as filters change the list ETag."""
+        rows = [{"id": "1", "updated_at": "u"}]
+        assert rows_etag(rows, "active") != rows_etag(rows, "inactive")
+
+
+class TestNotModified:
+    """Tests for If-None-Match matching."""
+
+    def test_no_header_sends_payload(self):
+        """Test that a request without If-None-Match is not a 304."""
+        assert not_modified(make_request(), compute_etag("x")) is None
+
+    def test_matching_etag_returns_304(self):
+        """Test that a matching ETag gives a 304 carrying the ETag."""
+        etag = compute_etag("x")
+        response = not_modified(make_request(etag), etag)
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+
+    def test_weak_comparison_ignores_prefix(self):
+        """Test that W/ on either side does not prevent a match."""
+        etag = compute_etag("x")
+        strong = etag.removeprefix("W/")
+        assert not_modified(make_request(strong), etag) is not None
+
+    def test_any_of_several_tags_matches(self):
+        """Test that a comma-separated If-None-Match list is matched per tag."""
+        etag = compute_etag("x")
+        header = f'{compute_etag("old")}, {etag}'
+        assert not_modified(make_request(header), etag) is not None
+
+    def test_wildcard_matches(self):
+        """Test that If-None-Match: * matches any ETag."""
+        assert not_modified(make_request("*"), compute_etag("x")) is not None
+
+    def test_different_etag_sends_payload(self):
+        """Test that a stale ETag is not a 304."""
+        assert not_modified(make_request(compute_etag("old")), compute_etag("new")) is None
+
+
+class TestConditionalGetRoute:
+    """Tests for the 304 path through a route, as the routers use it."""
+
+    @pytest.fixture
+    def client(self):
+        app = FastAPI()
+
+        @app.get("/item")
+        def get_item(request: Request, response: Response):
+            row = {"id": "1", "updated_at": "u"}
+            etag = row_etag(row)
+            cached = not_modified(request, etag)
+            if cached is not None:
+                return cached
+            response.headers["ETag"] = etag
+            return row
+
+        return TestClient(app)
+
+    def test_first_request_sends_body_and_etag(self, client):
+        """Test that the first request gets 200 with an ETag header."""
+        response = client.get("/item")
+        assert response.status_code == 200
+        assert response.json() == {"id": "1", "updated_at": "u"}
+        assert response.headers["etag"]
+
+    def test_revalidation_gets_empty_304(self, client):
+        """Test that sending the ETag back gets a 304 with no body."""
+        etag = client.get("/item").headers["etag"]
+        response = client.get("/item", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,108 @@
+"""Tests for /generate request validation."""
+
+from datetime import date, time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from api.exception_handlers import register_exception_handlers
+from models import GenerateRequest
+
+VALID = {
+    "userName": "山田太郎",
+    "diagnosis": "統合失調症",
+    "nurses": ["佐藤"],
+    "visitDate": "2024-01-15",
+    "startTime": "10:00",
+    "endTime": "11:00",
+    "sText": "眠れない",
+}
+
+
+def validation_message(**overrides):
+    """Return the validator message for VALID with overrides applied."""
+    with pytest.raises(ValidationError) as info:
+        GenerateRequest(**{**VALID, **overrides})
+    return str(info.value.errors()[0]["ctx"]["error"])
+
+
+class TestGenerateRequest:
+    """Tests for GenerateRequest parsing and required-field checks."""
+
+    def test_valid_request_parses_dates_and_times(self):
+        """Test that visit date and times are parsed once into date/time."""
+        request = GenerateRequest(**VALID)
+        assert request.visitDate == date(2024, 1, 15)
+        assert request.startTime == time(10, 0)
+        assert request.endTime == time(11, 0)
+
+    def test_text_fields_are_stripped(self):
+        """Test that text fields arrive without surrounding whitespace."""
+        request = GenerateRequest(**{**VALID, "userName": "  山田太郎 ", "sText": " 眠れない\n"})
+        assert request.userName == "山田太郎"
+        assert request.sText == "眠れない"
+
+    def test_missing_fields_reported_together(self):
+        """Test that every missing field is reported in one message."""
+        with pytest.raises(ValidationError) as info:
+            GenerateRequest()
+        message = str(info.value.errors()[0]["ctx"]["error"])
+        assert "利用者名は必須です" in message
+        assert "主疾患は必須です" in message
+        assert "訪問日は必須です。" in message
+        assert "訪問時間（開始・終了）は必須です。" in message
+        assert "SまたはOのいずれか一方は必須です。" in message
+
+    def test_patient_id_makes_name_and_diagnosis_optional(self):
+        """Test that userName/diagnosis are not required with a patient_id."""
+        request = GenerateRequest(**{**VALID, "patient_id": "p-1", "userName": "", "diagnosis": ""})
+        assert request.patient_id == "p-1"
+
+    def test_blank_date_counts_as_missing(self):
+        """Test that a whitespace-only visitDate gets the required-field message."""
+        assert validation_message(visitDate="  ") == "訪問日は必須です。"
+
+    def test_one_missing_time_is_reported(self):
+        """Test that a missing end time alone is reported."""
+        assert validation_message(endTime="") == "訪問時間（開始・終了）は必須です。"
+
+    def test_s_or_o_is_enough(self):
+        """Test that O text alone satisfies the S/O requirement."""
+        assert GenerateRequest(**{**VALID, "sText": "", "oText": "表情乏しい"}).oText == "表情乏しい"
+
+    def test_whitespace_only_s_and_o_are_rejected(self):
+        """Test that S and O containing only whitespace are treated as empty."""
+        assert validation_message(sText="   ", oText="\n") == "SまたはOのいずれか一方は必須です。"
+
+
+class TestValidationErrorResponse:
+    """Tests for the request-validation handler's response shape."""
+
+    @pytest.fixture
+    def client(self):
+        app = FastAPI()
+        register_exception_handlers(app)
+
+        @app.post("/generate")
+        def generate(request: GenerateRequest):
+            return {"ok": True}
+
+        return TestClient(app)
+
+    def test_missing_fields_return_string_detail(self, client):
+        """Test that missing fields give 422 with the Japanese messages as a string."""
+        response = client.post("/generate", json={**VALID, "sText": ""})
+        assert response.status_code == 422
+        assert response.json() == {"detail": "SまたはOのいずれか一方は必須です。"}
+
+    def test_type_errors_name_the_field(self, client):
+        """Test that other validation errors are prefixed with the field name."""
+        response = client.post("/generate", json={**VALID, "visitDate": "bad"})
+        assert response.status_code == 422
+        assert response.json()["detail"].startswith("visitDate: ")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,99 @@
+"""Tests for creating several patients at once."""
+
+import pytest
+
+from services import database_service
+from services.database_service import DatabaseServiceError, PatientService
+from utils.cache import TTLCache
+
+
+class FakeInsert:
+    """Stand-in for the patients table insert builder."""
+
+    def __init__(self, client, rows, kwargs):
+        self.client = client
+        self.rows = rows
+        self.kwargs = kwargs
+
+    def execute(self):
+        self.client.inserts.append((self.rows, self.kwargs))
+        if self.client.error is not None:
+            raise self.client.error
+        data = [dict(row, id=f"id-{i}") for i, row in enumerate(self.rows)]
+        return type("Response", (), {"data": data[:self.client.returned]})()
+
+
+class FakeClient:
+    """Supabase client double recording patient inserts."""
+
+    def __init__(self, error=None, returned=None):
+        self.inserts = []
+        self.error = error
+        self.returned = returned
+
+    def table(self, name):
+        assert name == "patients"
+        return self
+
+    def insert(self, rows, **kwargs):
+        return FakeInsert(self, rows, kwargs)
+
+
+def make_service(client):
+    """PatientService using the given client instead of Supabase."""
+    service = PatientService()
+    service._client = client
+    return service
+
+
+@pytest.fixture(autouse=True)
+def patient_caches(monkeypatch):
+    """Give every test an empty, enabled patient list cache (off by default)."""
+    monkeypatch.setattr(database_service, "_patient_list_cache", TTLCache(ttl=30))
+
+
+class TestBulkCreate:
+    """Tests for PatientService.bulk_create."""
+
+    def test_all_rows_go_in_one_insert(self):
+        """Test that the whole batch is written with a single INSERT statement."""
+        client = FakeClient()
+        patients = [{"name": f"利用者{i}"} for i in range(2000)]
+        created = make_service(client).bulk_create("user-1", patients)
+        assert len(client.inserts) == 1
+        rows, kwargs = client.inserts[0]
+        assert len(rows) == 2000
+        assert kwargs == {"default_to_null": False}
+        assert [row["name"] for row in created[:2]] == ["利用者0", "利用者1"]
+
+    def test_rows_are_built_like_single_creates(self):
+        """Test that each row gets the user id, stripped text and status default."""
+        client = FakeClient()
+        make_service(client).bulk_create("user-1", [{"name": " 山田 ", "gender": " 女 ", "age": 50}])
+        rows, _ = client.inserts[0]
+        assert rows == [{"user_id": "user-1", "name": "山田", "status": "active", "gender": "女", "age": 50}]
+
+    def test_success_invalidates_patient_list_cache(self):
+        """Test that the user's cached patient lists are dropped after the insert."""
+        database_service._patient_list_cache.set(("user-1", None), ())
+        make_service(FakeClient()).bulk_create("user-1", [{"name": "山田"}])
+        assert database_service._patient_list_cache.get(("user-1", None)) is None
+
+    def test_failed_insert_raises_and_keeps_cache(self):
+        """Test that a failed insert is a DatabaseServiceError and nothing is invalidated."""
+        database_service._patient_list_cache.set(("user-1", None), ())
+        client = FakeClient(error=RuntimeError("connection reset"))
+        with pytest.raises(DatabaseServiceError):
+            make_service(client).bulk_create("user-1", [{"name": "山田"}, {"name": "佐藤"}])
+        assert len(client.inserts) == 1
+        assert database_service._patient_list_cache.get(("user-1", None)) == ()
+
+    def test_short_result_is_an_error(self):
+        """Test that a response missing rows is reported instead of returned."""
+        client = FakeClient(returned=1)
+        with pytest.raises(DatabaseServiceError):
+            make_service(client).bulk_create("user-1", [{"name": "山田"}, {"name": "佐藤"}])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,60 @@
+"""Tests for the generation prompt and the visit information section."""
+
+from datetime import date, time
+
+import pytest
+
+from prompt_builder import SYSTEM_PROMPT, build_prompt, build_visit_info
+
+
+class TestPromptBuilder:
+    """Tests for the static instructions and per-visit input."""
+
+    def test_system_prompt_has_no_visit_values(self):
+        """Test that the instructions no longer ask the model for 【訪問情報】."""
+        assert "【訪問情報】" not in SYSTEM_PROMPT
+
+    def test_input_carries_the_visit_fields(self):
+        """Test that the per-visit input formats date, time and nurses."""
+        prompt = build_prompt(
+            user_name=" 山田太郎 ",
+            diagnosis="統合失調症",
+            nurses=["佐藤", "鈴木"],
+            visit_date=date(2024, 1, 15),
+            start_time=time(10, 0),
+            end_time=time(11, 0),
+            chief_complaint="",
+            s_text="眠れない",
+            o_text="",
+        )
+        assert "利用者名：山田太郎" in prompt
+        assert "訪問日：2024/01/15（月）" in prompt
+        assert "訪問時間：10:00〜11:00" in prompt
+        assert "担当看護師：佐藤・鈴木" in prompt
+        assert "主訴：（特になし）" in prompt
+        assert "O（客観）：（記載なし）" in prompt
+
+
+class TestVisitInfo:
+    """Tests for the server-rendered 【訪問情報】 section."""
+
+    def test_visit_info_is_rendered_from_request_values(self):
+        """Test that visit date, time, nurses and diagnosis are filled in exactly."""
+        text = build_visit_info("統合失調症", ["佐藤", "鈴木"], date(2024, 1, 15), time(10, 0), time(11, 30))
+        assert text.startswith("\n\n")
+        assert text.strip().splitlines()[1:] == [
+            "【訪問情報】",
+            "訪問日：2024/01/15（月）",
+            "訪問時間：10:00〜11:30",
+            "担当看護師：佐藤・鈴木",
+            "主疾患：統合失調症",
+        ]
+
+    def test_missing_nurses_are_marked(self):
+        """Test that an empty nurse list is shown as unspecified."""
+        text = build_visit_info("うつ病", [], date(2024, 1, 15), time(10, 0), time(11, 0))
+        assert "担当看護師：（未指定）" in text
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,59 @@
+"""Tests for SOAP record list filters."""
+
+import pytest
+
+from services.database_service import RecordFilters
+
+
+class RecordingQuery:
+    """Stand-in for a PostgREST query builder that records filter calls."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, operator):
+        def method(column, value):
+            self.calls.append((operator, column, value))
+            return self
+
+        return method
+
+
+class TestRecordFilters:
+    """Tests for RecordFilters.apply."""
+
+    def test_no_filters_leaves_query_untouched(self):
+        """Test that an empty filter set adds no conditions."""
+        query = RecordingQuery()
+        assert RecordFilters().apply(query) is query
+        assert query.calls == []
+
+    def test_each_filter_maps_to_its_operator(self):
+        """Test that every set filter is applied with its PostgREST operator."""
+        filters = RecordFilters(
+            date_from="2024-01-01",
+            date_to="2024-01-31",
+            nurse_name="佐藤",
+            patient_id="p-1",
+        )
+        query = filters.apply(RecordingQuery())
+        assert query.calls == [
+            ("gte", "visit_date", "2024-01-01"),
+            ("lte", "visit_date", "2024-01-31"),
+            ("contains", "nurses", ["佐藤"]),
+            ("eq", "patient_id", "p-1"),
+        ]
+
+    def test_only_set_filters_are_applied(self):
+        """Test that None and empty strings are skipped."""
+        query = RecordFilters(date_from="", nurse_name=None, patient_id="p-1").apply(RecordingQuery())
+        assert query.calls == [("eq", "patient_id", "p-1")]
+
+    def test_filters_are_hashable_cache_keys(self):
+        """Test that equal filters hash equally, as the records cache relies on."""
+        assert hash(RecordFilters(patient_id="p-1")) == hash(RecordFilters(patient_id="p-1"))
+        assert RecordFilters(patient_id="p-1") != RecordFilters(patient_id="p-2")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
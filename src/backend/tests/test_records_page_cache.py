@@ -0,0 +1,63 @@
+"""Tests for the cached SOAP records list page."""
+
+import pytest
+
+from services import database_service
+from services.database_service import RecordFilters, SOAPRecordService
+
+
+class FakeQuery:
+    """Query builder double returning one page of list rows."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+
+    def execute(self):
+        self.client.executes += 1
+        row = {"id": "r-1", "patient_name": "山田", "patients": None}
+        return type("Response", (), {"data": [row], "count": 1})()
+
+
+class FakeClient:
+    """Supabase client double counting executed queries."""
+
+    def __init__(self):
+        self.executes = 0
+
+    def table(self, name):
+        return FakeQuery(self)
+
+
+@pytest.fixture
+def service():
+    """SOAPRecordService on a fake client with an empty records cache."""
+    database_service._soap_records_cache.clear()
+    record_service = SOAPRecordService()
+    record_service._client = FakeClient()
+    yield record_service
+    database_service._soap_records_cache.clear()
+
+
+class TestRecordsPageCache:
+    """Tests for get_page caching keyed by the list fingerprint."""
+
+    def test_same_fingerprint_reuses_cached_page(self, service):
+        """Test that a repeat request under the same fingerprint skips the query."""
+        fingerprint = (1, "2024-01-01T00:00:00+00:00")
+        service.get_page("user-1", RecordFilters(), 1, 10, fingerprint=fingerprint)
+        records, total = service.get_page("user-1", RecordFilters(), 1, 10, fingerprint=fingerprint)
+        assert service.client.executes == 1
+        assert (len(records), total) == (1, 1)
+
+    def test_new_fingerprint_refetches_page(self, service):
+        """Test that a changed fingerprint (a write elsewhere) bypasses the cached page."""
+        service.get_page("user-1", RecordFilters(), 1, 10, fingerprint=(1, "2024-01-01T00:00:00+00:00"))
+        service.get_page("user-1", RecordFilters(), 1, 10, fingerprint=(1, "2024-01-02T00:00:00+00:00"))
+        assert service.client.executes == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
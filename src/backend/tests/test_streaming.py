@@ -0,0 +1,54 @@
+"""Tests for streaming row batches as one response body."""
+
+import asyncio
+
+import pytest
+
+from api.streaming import stream_batches
+
+
+def encode(batch):
+    """Encode a batch as its ids joined by spaces."""
+    return " ".join(row["id"] for row in batch).encode()
+
+
+def read_body(response):
+    """Collect a StreamingResponse body into bytes."""
+    async def collect():
+        return b"".join([chunk async for chunk in response.body_iterator])
+
+    return asyncio.run(collect())
+
+
+class TestStreamBatches:
+    """Tests for stream_batches."""
+
+    def test_batches_are_wrapped_and_separated(self):
+        """Test that prefix, separator and suffix surround the non-empty batches."""
+        batches = iter([[{"id": "a"}, {"id": "b"}], [], [{"id": "c"}]])
+        response = stream_batches(batches, encode, "text/plain", what="rows", prefix=b"[", separator=b"|", suffix=b"]")
+        assert response.media_type == "text/plain"
+        assert read_body(response) == b"[a b|c]"
+
+    def test_first_batch_error_is_raised_before_response(self):
+        """Test that a failing first query propagates out of the endpoint."""
+        def batches():
+            raise RuntimeError("connection reset")
+            yield []
+
+        with pytest.raises(RuntimeError):
+            stream_batches(batches(), encode, "text/plain", what="rows")
+
+    def test_later_batch_error_cuts_body_short(self):
+        """Test that an error after the first batch ends the stream with the error."""
+        def batches():
+            yield [{"id": "a"}]
+            raise RuntimeError("connection reset")
+
+        response = stream_batches(batches(), encode, "text/plain", what="rows", suffix=b"]")
+        with pytest.raises(RuntimeError):
+            read_body(response)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
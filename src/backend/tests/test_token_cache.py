@@ -0,0 +1,98 @@
+"""Tests for the verified JWT payload cache."""
+
+import time
+
+import jwt
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from api import dependencies
+from api.dependencies import verify_supabase_token
+
+SECRET = "test-secret-with-enough-length-for-hs256"
+
+
+@pytest.fixture(autouse=True)
+def jwt_settings(monkeypatch):
+    """Configure a JWT secret and start every test with an empty cache."""
+    monkeypatch.setattr(dependencies.settings, "SUPABASE_JWT_SECRET", SECRET)
+    dependencies._verified_token_cache.clear()
+    yield
+    dependencies._verified_token_cache.clear()
+
+
+@pytest.fixture
+def decode_calls(monkeypatch):
+    """Count calls to jwt.decode made by the dependency."""
+    calls = []
+    real_decode = jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(args[0])
+        return real_decode(*args, **kwargs)
+
+    monkeypatch.setattr(dependencies.jwt, "decode", counting_decode)
+    return calls
+
+
+def bearer(payload):
+    """Encode payload and wrap it as bearer credentials."""
+    token = jwt.encode(payload, SECRET, algorithm="HS256")
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+class TestVerifiedTokenCache:
+    """Tests for caching verified payloads per access token."""
+
+    def test_repeat_token_skips_verification(self, decode_calls):
+        """Test that the second request with a token is served from the cache."""
+        credentials = bearer({"sub": "user-1", "exp": int(time.time()) + 3600})
+        assert verify_supabase_token(credentials)["sub"] == "user-1"
+        assert verify_supabase_token(credentials)["sub"] == "user-1"
+        assert len(decode_calls) == 1
+
+    def test_cached_payload_expires_with_token(self, decode_calls, monkeypatch):
+        """Test that a cached payload is re-verified once the token's exp has passed."""
+        exp = int(time.time()) + 60
+        credentials = bearer({"sub": "user-1", "exp": exp})
+        verify_supabase_token(credentials)
+
+        # Past exp the dependency ignores the cached payload and verifies again
+        monkeypatch.setattr(dependencies.time, "time", lambda: exp + 1)
+        verify_supabase_token(credentials)
+        assert len(decode_calls) == 2
+
+    def test_expired_token_is_rejected(self):
+        """Test that an already expired token gets 401."""
+        with pytest.raises(HTTPException) as info:
+            verify_supabase_token(bearer({"sub": "user-1", "exp": int(time.time()) - 10}))
+        assert info.value.status_code == 401
+        assert info.value.detail == "Token has expired."
+
+    def test_token_without_exp_is_not_cached(self, decode_calls):
+        """Test that payloads without exp are verified on every request."""
+        credentials = bearer({"sub": "user-1"})
+        verify_supabase_token(credentials)
+        verify_supabase_token(credentials)
+        assert len(decode_calls) == 2
+
+    def test_invalid_token_is_rejected_and_not_cached(self, decode_calls):
+        """Test that a token signed with another secret gets 401 every time."""
+        token = jwt.encode({"sub": "user-1", "exp": int(time.time()) + 3600}, "other-secret-of-sufficient-length", algorithm="HS256")
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+        for _ in range(2):
+            with pytest.raises(HTTPException) as info:
+                verify_supabase_token(credentials)
+            assert info.value.status_code == 401
+        assert len(decode_calls) == 2
+
+    def test_different_tokens_are_cached_separately(self):
+        """Test that each access token gets its own payload."""
+        exp = int(time.time()) + 3600
+        assert verify_supabase_token(bearer({"sub": "user-1", "exp": exp}))["sub"] == "user-1"
+        assert verify_supabase_token(bearer({"sub": "user-2", "exp": exp}))["sub"] == "user-2"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -1,14 +1,27 @@
 """Utils package for NurseNote AI backend."""
 
-from datetime import datetime
+from datetime import date, datetime, time
 
+# date.weekday() index -> Japanese weekday
+WEEKDAYS_JA = ("月", "火", "水", "木", "金", "土", "日")
 
-def convert_date_to_weekday(date_str: str) -> str:
+
+def _parse_date(value: date | str) -> date:
+    """Return value as a date, parsing YYYY-MM-DD strings."""
+    if isinstance(value, date):
+        return value
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError as exc:
+        raise ValueError(f"Invalid date format: {value}. Expected YYYY-MM-DD") from exc
+
+
+def convert_date_to_weekday(value: date | str) -> str:
     """
-    Convert date string (YYYY-MM-DD) to Japanese weekday format.
+    Convert a date (or YYYY-MM-DD string) to Japanese weekday format.
     
     Args:
-        date_str: Date string in YYYY-MM-DD format
+        value: Date, or date string in YYYY-MM-DD format
         
     Returns:
         Japanese weekday string (月, 火, 水, 木, 金, 土, 日)
@@ -16,52 +29,38 @@ def convert_date_to_weekday(date_str: str) -> str:
     Raises:
         ValueError: If date string format is invalid
     """
-    try:
-        date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-        weekday_map = {
-            0: "月",
-            1: "火",
-            2: "水",
-            3: "木",
-            4: "金",
-            5: "土",
-            6: "日",
-        }
-        return weekday_map[date_obj.weekday()]
-    except ValueError as exc:
-        raise ValueError(f"Invalid date format: {date_str}. Expected YYYY-MM-DD") from exc
+    return WEEKDAYS_JA[_parse_date(value).weekday()]
 
 
-def format_date_with_weekday(date_str: str) -> str:
+def format_date_with_weekday(value: date | str) -> str:
     """
-    Format date string to YYYY/MM/DD（曜） format.
+    Format a date (or YYYY-MM-DD string) to YYYY/MM/DD（曜） format.
     
     Args:
-        date_str: Date string in YYYY-MM-DD format
+        value: Date, or date string in YYYY-MM-DD format
         
     Returns:
         Formatted date string like "2024/01/15（月）"
     """
-    try:
-        date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-        weekday = convert_date_to_weekday(date_str)
-        return f"{date_obj.strftime('%Y/%m/%d')}（{weekday}）"
-    except ValueError as exc:
-        raise ValueError(f"Invalid date format: {date_str}. Expected YYYY-MM-DD") from exc
+    date_obj = _parse_date(value)
+    return f"{date_obj.strftime('%Y/%m/%d')}（{WEEKDAYS_JA[date_obj.weekday()]}）"
 
 
-def format_time_range(start_time: str, end_time: str) -> str:
+def format_time_range(start_time: time | str, end_time: time | str) -> str:
     """
     Format time range to HH:MM〜HH:MM format.
     
     Args:
-        start_time: Start time in HH:MM format
-        end_time: End time in HH:MM format
+        start_time: Start time, or string in HH:MM format
+        end_time: End time, or string in HH:MM format
         
     Returns:
         Formatted time range string like "14:00〜16:00"
     """
-    return f"{start_time}〜{end_time}"
+    def fmt(value: time | str) -> str:
+        return value.strftime("%H:%M") if isinstance(value, time) else value
+    
+    return f"{fmt(start_time)}〜{fmt(end_time)}"
 
 
 def format_nurses_list(nurses: list[str]) -> str:
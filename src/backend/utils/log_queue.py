@@ -0,0 +1,51 @@
+"""Queue-based logging so log I/O does not run on request threads."""
+
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from config import settings
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+_queue_handler: Optional[QueueHandler] = None
+_listener: Optional[QueueListener] = None
+
+
+def start_log_queue() -> None:
+    """
+    Send application log records through a queue to a background writer thread.
+
+    Logging calls on the event loop and in worker threads only enqueue the
+    record; formatting and the stderr write happen on the listener thread.
+    Does nothing if the root logger already has handlers (e.g. configured by
+    the process manager).
+    """
+    global _queue_handler, _listener
+
+    root = logging.getLogger()
+    if _listener is not None or root.handlers:
+        return
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    _queue_handler = QueueHandler(log_queue)
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    root.addHandler(_queue_handler)
+    root.setLevel(settings.LOG_LEVEL)
+    _listener.start()
+
+
+def stop_log_queue() -> None:
+    """Flush queued records and stop the writer thread."""
+    global _queue_handler, _listener
+
+    if _listener is None:
+        return
+    logging.getLogger().removeHandler(_queue_handler)
+    _listener.stop()
+    _queue_handler = None
+    _listener = None
@@ -246,7 +246,11 @@ export default function SOAPTab() {
 
       if (!response.ok) {
         const errorData = await response.json().catch(() => ({ error: 'エラーが発生しました' }));
-        throw new Error(errorData.error || errorData.detail || `APIエラー: ${response.status}`);
+        // detail is a string; older backends sent validation errors as a list
+        const detail = Array.isArray(errorData.detail)
+          ? errorData.detail.map((item) => item.msg).join(' ')
+          : errorData.detail;
+        throw new Error(errorData.error || detail || `APIエラー: ${response.status}`);
       }
 
       const contentType = response.headers.get('content-type') || '';
@@ -0,0 +1,50 @@
+-- Migration: Create SOAP record together with its patient lookup in one call
+-- The backend used to fetch the patient (name / primary_diagnosis) and then insert
+-- the soap_record in a second round trip. This function does both in a single
+-- statement so the denormalized patient fields are read and written atomically.
+
+CREATE OR REPLACE FUNCTION public.create_soap_record_for_patient(p_record JSONB)
+RETURNS public.soap_records
+LANGUAGE sql
+AS $$
+  INSERT INTO public.soap_records (
+    user_id,
+    patient_id,
+    patient_name,
+    diagnosis,
+    visit_date,
+    start_time,
+    end_time,
+    nurses,
+    chief_complaint,
+    s_text,
+    o_text,
+    soap_output,
+    plan_output
+  )
+  SELECT
+    (p_record->>'user_id')::UUID,
+    (p_record->>'patient_id')::UUID,
+    -- Prefer the patient's current values; fall back to the ones sent by the client
+    CASE WHEN p.id IS NOT NULL THEN p.name ELSE p_record->>'patient_name' END,
+    CASE WHEN p.id IS NOT NULL THEN p.primary_diagnosis ELSE p_record->>'diagnosis' END,
+    (p_record->>'visit_date')::DATE,
+    NULLIF(p_record->>'start_time', '')::TIME,
+    NULLIF(p_record->>'end_time', '')::TIME,
+    ARRAY(SELECT jsonb_array_elements_text(COALESCE(p_record->'nurses', '[]'::JSONB))),
+    p_record->>'chief_complaint',
+    p_record->>'s_text',
+    p_record->>'o_text',
+    p_record->'soap_output',
+    p_record->'plan_output'
+  FROM (SELECT 1) AS one
+  LEFT JOIN public.patients p
+    ON p.id = (p_record->>'patient_id')::UUID
+   AND p.user_id = (p_record->>'user_id')::UUID
+  RETURNING *;
+$$;
+
+-- Runs as the caller (SECURITY INVOKER), so soap_records / patients RLS still applies
+GRANT EXECUTE ON FUNCTION public.create_soap_record_for_patient(JSONB) TO authenticated, service_role;
+
+COMMENT ON FUNCTION public.create_soap_record_for_patient(JSONB) IS 'Insert a soap_record, copying patient_name/diagnosis from the owning patient in the same statement';
@@ -0,0 +1,11 @@
+-- Migration: Composite index for the SOAP records list query
+-- GET /records filters by user_id and orders by visit_date DESC, created_at DESC.
+-- A single composite index serves both the filter and the sort, instead of
+-- combining idx_soap_records_user_id with a separate sort step.
+
+CREATE INDEX IF NOT EXISTS idx_soap_records_user_visit
+ON public.soap_records(user_id, visit_date DESC, created_at DESC);
+
+-- patients(id) is the primary key, so the patients embed join is already indexed
+
+COMMENT ON INDEX public.idx_soap_records_user_visit IS 'Serves per-user record lists ordered by visit date';
@@ -0,0 +1,14 @@
+-- Migration: Composite indexes for the monthly report visit query
+-- The monthly report PDF fetches one patient's visits in a month with
+-- visit_date >= first-of-month AND visit_date < first-of-next-month, filtered
+-- by user_id and either patient_id or (legacy) patient_name. These indexes turn
+-- that into a single range scan over the month's rows, already in visit_date order.
+
+CREATE INDEX IF NOT EXISTS idx_soap_records_user_patient_visit
+ON public.soap_records(user_id, patient_id, visit_date);
+
+CREATE INDEX IF NOT EXISTS idx_soap_records_user_patient_name_visit
+ON public.soap_records(user_id, patient_name, visit_date);
+
+COMMENT ON INDEX public.idx_soap_records_user_patient_visit IS 'Serves per-patient visit lookups by date range (monthly reports)';
+COMMENT ON INDEX public.idx_soap_records_user_patient_name_visit IS 'Serves legacy per-patient-name visit lookups by date range (monthly reports)';